@@ -1,3 +1,8 @@
 from unties.units import *
 from unties.unit_helpers import *
 # from unties.class_helps import *
+from unties.tracing import traced
+from unties.lazy import lazy
+from unties.storage import save_units_array, load_units_array
+from unties.storage import save_table, load_table
+from unties.storage import format_csv, parse_csv, format_json, parse_json
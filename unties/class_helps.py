@@ -1,5 +1,5 @@
 from unties import *
-from scipy.optimize import fsolve
+from unties.utilities.utilities import OutOfRangeTest
 from scipy.interpolate import UnivariateSpline
 import numpy as np
 
@@ -23,6 +23,106 @@ def kc_t(T, Kc, T_ref, del_H_rxn):
     return Kc * np.exp(expgroup)
 
 
+class ReactionSet:
+    """Rate and equilibrium constants of many reactions at many temperatures.
+
+    Like kr and kc_t, but the units are checked once, when the set is
+    made, and calls evaluate the whole (reactions x temperatures)
+    matrix with one numpy expression.
+
+    Each argument is a list with one entry per reaction, or a
+    units_group with an array as its magnitude (see units_array). The
+    rate constants can have different units (first and second order
+    reactions, etc). Kc and del_H_rxn are optional, but Kc needs both.
+
+    Examples:
+
+    >>> rxns = ReactionSet([0.1 / s, 2 * m**3 / (mol * s)], [300 * K, 350 * K],
+    ...                    units_array(np.array([50., 80]), kJ / mol))
+    >>> rxns.k(units_array(np.array([300., 350]), K))
+    [[0.1        1.75250007] / s, [0.02047279 2.        ] * m**3.0 / (mol * s)]
+
+    The underscore versions take temperatures in K and return a float
+    matrix, in the units of each reaction's reference constant:
+
+    >>> rxns._k([300, 350])
+    array([[0.1       , 1.75250007],
+           [0.02047279, 2.        ]])
+    """
+    def __init__(self, k_ref, T_ref, Ea, del_H_rxn=None, Kc_ref=None):
+        self._k_units, self._k_ref = self._per_reaction(k_ref)
+        n = len(self._k_ref)
+        self._T_ref = self._column(T_ref, K, n)
+        self._Ea_R = self._column(Ea, J / mol, n) / Rc.value
+        self._Kc_units = None
+        if Kc_ref is not None:
+            if del_H_rxn is None:
+                raise ValueError('Kc_ref needs del_H_rxn')
+            self._Kc_units, self._Kc_ref = self._per_reaction(Kc_ref)
+            if len(self._Kc_ref) != n:
+                raise ValueError('Expected %d equilibrium constants' % n)
+            self._H_R = self._column(del_H_rxn, J / mol, n) / Rc.value
+
+    def __len__(self):
+        return len(self._k_ref)
+
+    @staticmethod
+    def _per_reaction(quantities):
+        """Units of each reaction, and magnitudes in those units"""
+        if hasattr(quantities, 'units'):
+            magnitudes = np.array(quantities.magnitude, dtype=float)
+            return [quantities.normalized()] * len(magnitudes), magnitudes
+        units = [q.normalized() if hasattr(q, 'units') else None
+                 for q in quantities]
+        magnitudes = np.array([q.magnitude if hasattr(q, 'units') else q
+                               for q in quantities], dtype=float)
+        return units, magnitudes
+
+    @staticmethod
+    def _column(quantities, units, n):
+        """SI magnitudes, as a column with one row per reaction"""
+        if (hasattr(quantities, 'units') or
+                type(quantities).__module__ == 'numpy'):
+            values = magnitudes_of(quantities, units)
+        else:
+            values = [magnitudes_of(q, units) for q in quantities]
+        values = np.array(values, dtype=float) * units.normalized().value
+        values = np.broadcast_to(values, (n,))
+        return values[:, np.newaxis]
+
+    @staticmethod
+    def _kelvins(T):
+        if hasattr(T, 'value') or getattr(T, 'dtype', None) == object:
+            return np.ravel(magnitudes_of(T, K))
+        return np.ravel(np.asarray(T, dtype=float))
+
+    def _with_units(self, matrix, units):
+        return [row if u is None else units_array(row, u)
+                for row, u in zip(matrix, units)]
+
+    def _k(self, T):
+        """k of each reaction (rows) at each temperature in K (columns)"""
+        inv_T = 1 / np.ravel(np.asarray(T, dtype=float))
+        return self._k_ref[:, np.newaxis] * np.exp(
+            -self._Ea_R * (inv_T - 1 / self._T_ref))
+
+    def _Kc(self, T):
+        """Kc of each reaction (rows) at each temperature in K (columns)"""
+        if self._Kc_units is None:
+            raise ValueError('This ReactionSet has no equilibrium constants')
+        inv_T = 1 / np.ravel(np.asarray(T, dtype=float))
+        return self._Kc_ref[:, np.newaxis] * np.exp(
+            -self._H_R * (inv_T - 1 / self._T_ref))
+
+    def k(self, T):
+        """List of k at each temperature, one quantity array per reaction"""
+        return self._with_units(self._k(self._kelvins(T)), self._k_units)
+
+    def Kc(self, T):
+        """List of Kc at each temperature, one quantity array per reaction"""
+        return self._with_units(self._Kc(self._kelvins(T)), self._Kc_units)
+
+
 #__________________________________________________________________________#
 ################################## Thermo ##################################
 #^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^#
@@ -36,21 +136,105 @@ def dli(x,y,x1,x2,y1,y2,m11,m12,m21,m22):
     second_xs = ((x-x1)/(x2-x1))
     first_ys = ((y2-y)/(y2-y1))
     second_ys = ((y-y1)/(y2-y1))
-    m11 *= first_xs
-    m12 *= second_xs
-    m21 *= first_xs
-    m22 *= second_xs
-    return (m11 + m12)*first_ys + (m21 + m22)*second_ys
+    return ((m11*first_xs + m12*second_xs)*first_ys +
+            (m21*first_xs + m22*second_xs)*second_ys)
+
+
+class GridInterpolator:
+    """Linear interpolation of values tabulated on a 1, 2 or 3-D grid.
+
+    Like sli and dli, but for many points at once, and it finds the
+    grid cells itself. The cell spacing is computed once, and cells
+    are located with searchsorted.
+
+    The axes and the values can be numbers, numpy arrays, or
+    units_groups with arrays as magnitudes (see units_array). Query
+    points must have the same units as their axes, and are returned
+    in the units of the values. Nothing given to it is changed.
+
+    Points outside the grid raise an OutOfRangeError, unless
+    `ranged=False`, in which case they are extrapolated from the
+    nearest cell.
+
+    Examples:
+
+    >>> T = units_array(np.array([300., 400, 500]), K)
+    >>> P = units_array(np.array([1., 2]), bar)
+    >>> H = units_array(np.array([[1., 2], [3, 4], [5, 6]]), kJ / kg)
+    >>> table = GridInterpolator((T, P), H)
+    >>> table(units_array(np.array([350, 450]), K), 1.5 * bar)
+    [2.5 4.5] * kJ / kg
+    """
+    def __init__(self, axes, values):
+        if not isinstance(axes, tuple):
+            axes = (axes,)
+        if not 1 <= len(axes) <= 3:
+            raise ValueError('GridInterpolator takes 1, 2 or 3 axes')
+        self._axis_units = [self._units(axis) for axis in axes]
+        self._axes = [np.asarray(self._magnitude(axis), dtype=float)
+                      for axis in axes]
+        self._spacing = [np.diff(axis) for axis in self._axes]
+        self._value_units = self._units(values)
+        self._values = np.array(self._magnitude(values), dtype=float)
+        shape = tuple(len(axis) for axis in self._axes)
+        if self._values.shape[:len(shape)] != shape:
+            raise ValueError('values must have shape ' + str(shape))
+
+    @staticmethod
+    def _units(quantity):
+        return quantity.normalized() if hasattr(quantity, 'units') else None
+
+    @staticmethod
+    def _magnitude(quantity):
+        return quantity.magnitude if hasattr(quantity, 'units') else quantity
+
+    def _locate(self, dim, point, ranged):
+        """Cell index and fraction of the way across it, for each point"""
+        axis = self._axes[dim]
+        units = self._axis_units[dim]
+        point = magnitudes_of(point, units) if units else point
+        point = np.asarray(point, dtype=float)
+        OutOfRangeTest(point, axis[0], axis[-1], ranged)
+        i = np.clip(np.searchsorted(axis, point) - 1, 0, len(axis) - 2)
+        return i, (point - axis[i]) / self._spacing[dim][i]
+
+    def _interpolate(self, points, ranged=True):
+        if len(points) != len(self._axes):
+            raise ValueError('Expected %d coordinates' % len(self._axes))
+        cells = [self._locate(dim, point, ranged)
+                 for dim, point in enumerate(points)]
+        result = 0
+        for corner in np.ndindex(*(2,) * len(cells)):
+            weight = 1
+            index = []
+            for (i, t), c in zip(cells, corner):
+                weight = weight * (t if c else 1 - t)
+                index.append(i + c)
+            weight = np.asarray(weight)
+            weight = weight.reshape(weight.shape +
+                                    (1,) * (self._values.ndim - len(cells)))
+            result = result + weight * self._values[tuple(index)]
+        return result
+
+    def __call__(self, *points, ranged=True):
+        result = self._interpolate(points, ranged)
+        if self._value_units is None:
+            return result
+        return units_array(result, self._value_units)
 
 
 class Fluid:
     """Peng-Robinson EOS model of a fluid.
 
     The underscore methods are not to be used directly. They
-    are used by other methods that use python solvers and
-    only take and return normal numbers.
+    are used by other methods and only take and return normal
+    numbers (or numpy arrays of them).
+
+    Volumes come from the roots of the PR cubic in the
+    compressibility factor Z, which are found analytically, so
+    arrays of T and P are solved all at once.
 
-    Public methods: P_pr, V_pr
+    Public methods: P_pr, V_pr, saturation_curve
 
     Examples:
 
@@ -62,7 +246,7 @@ class Fluid:
     >>> methane = Fluid(Tc, Pc, omega)
     >>> vols = methane.V_pr(T, P)
     >>> print(vols)
-    {'vapor': 0.0023131229712340944 * m**3 / mol, 'liquid': 0.00011402510635426865 * m**3 / mol}
+    {'vapor': 0.002313122971234093 * m**3.0 / mol, 'liquid': 0.00011402510635426871 * m**3.0 / mol}
     """
     def __init__(self, Tc, Pc, omega):
         self.Tc = Tc        # Critical Temperature
@@ -71,48 +255,183 @@ class Fluid:
         self._Tc = Tc.value
         self._Pc = Pc.value
 
+        # The parts of a and b that don't depend on T
+        self._kappa = 0.37464 + 1.54226*omega - 0.26992*omega**2
+        self._ac = 0.45724 * (Rc.value*self._Tc)**2/self._Pc
+        self._bc = 0.0778*Rc.value*self._Tc/self._Pc
+
     def P_pr(self, V, T, units=Pa):
-        """Find P of fluid given T and P"""
-        return self._P_pr(V.value, T.value) * Pa(units)
+        """Find P of fluid given V and T"""
+        P = self._P_pr(V.value, T.value)
+        if np.ndim(P):
+            return units_array(P, Pa)(units)
+        return P * Pa(units)
 
     def V_pr(self, T, P, units=(m**3/mol)):
         """Find Vs of fluid given T and P.
 
-        Returns both vapor and liquid volumes.
+        Returns both vapor and liquid volumes. T and P may have
+        arrays as magnitudes, in which case so will the volumes.
         """
         T, P = T.value, P.value
         vols = self._V_pr(T,P)
         for key in list(vols):
-            vols[key] *= (m**3/mol)(units)
+            if np.ndim(vols[key]):
+                vols[key] = units_array(vols[key], m**3/mol)(units)
+            else:
+                vols[key] = float(vols[key]) * (m**3/mol)(units)
         return vols
 
+    def saturation_curve(self, T, Tr_max=0.999, units=Pa,
+                         vol_units=(m**3/mol)):
+        """Trace the vapor pressure curve over an array of temperatures.
+
+        Each point solves the PR fugacity equality starting from the
+        previous one, which is much cheaper than solving every point cold.
+        The curve stops at the first temperature above Tr_max * Tc (or the
+        first point that fails to converge), so the returned arrays can be
+        shorter than T.
+
+        Returns a dict of 'T', 'P', 'vapor' and 'liquid' (molar volumes).
+        """
+        curve = self._saturation_curve(np.atleast_1d(T.value).astype(float),
+                                       Tr_max)
+        return {
+            'T': units_array(curve['T'], K),
+            'P': units_array(curve['P'], Pa)(units),
+            'vapor': units_array(curve['vapor'], m**3/mol)(vol_units),
+            'liquid': units_array(curve['liquid'], m**3/mol)(vol_units),
+        }
+
     def _k(self):
-        return 0.37464 + 1.54226*self.omega - 0.26992*self.omega**2
+        return self._kappa
 
     def _a(self, T):
-        const = 0.45724
-        squared = (1 + self._k()*(1-(T/self._Tc)**0.5))**2
-        fraction = (Rc.value*self._Tc)**2/self._Pc
-        return const * squared * fraction
+        return self._ac * (1 + self._kappa*(1-(T/self._Tc)**0.5))**2
 
     def _b(self):
-        return 0.0778*Rc.value*self._Tc/self._Pc
+        return self._bc
 
     def _P_pr(self, V, T):
-        first = Rc.value * T / (V - self._b())
-        second = self._a(T) / (V**2 + 2*V*self._b() - self._b()**2)
+        b = self._bc
+        first = Rc.value * T / (V - b)
+        second = self._a(T) / (V**2 + 2*V*b - b**2)
         return first - second
 
-    def _V_pr(self, T, P):
-        vapor_guess = Rc.value*T/P
-        liquid_guess = 1.1 * self._b()
+    def _Z_roots(self, T, P):
+        """Largest and smallest physical roots of the PR cubic in Z.
+
+        Z**3 - (1 - B)*Z**2 + (A - 3*B**2 - 2*B)*Z - (A*B - B**2 - B**3) = 0
+
+        When the cubic has only one real root, both are the same.
+        """
+        T, P = np.asarray(T, dtype=float), np.asarray(P, dtype=float)
+        RT = Rc.value * T
+        A = self._a(T) * P / RT**2
+        B = self._bc * P / RT
+
+        # Depressed cubic: t**3 + p*t + q = 0, with Z = t - c2/3
+        c2 = B - 1
+        c1 = A - 3*B**2 - 2*B
+        c0 = B**3 + B**2 - A*B
+        shift = -c2 / 3
+        p = c1 - c2**2 / 3
+        q = 2*c2**3/27 - c2*c1/3 + c0
+        disc = (q/2)**2 + (p/3)**3
+
+        # One real root (Cardano)
+        root_disc = np.sqrt(np.maximum(disc, 0))
+        single = np.cbrt(-q/2 + root_disc) + np.cbrt(-q/2 - root_disc) + shift
+
+        # Three real roots (trigonometric). The largest is k=0, the middle
+        # is k=1 and the smallest is k=2.
+        three = disc <= 0
+        p_neg = np.where(p < 0, p, -1.0)
+        radius = 2 * np.sqrt(-p_neg / 3)
+        arg = np.clip(3*q / (p_neg*radius), -1, 1)
+        angle = np.arccos(arg) / 3
+        largest = radius * np.cos(angle) + shift
+        middle = radius * np.cos(angle - 2*np.pi/3) + shift
+        smallest = radius * np.cos(angle - 4*np.pi/3) + shift
+        # The smallest root can be below B, where V < b isn't physical
+        smallest = np.where(smallest > B, smallest, middle)
+
+        vapor = np.where(three, largest, single)
+        liquid = np.where(three, smallest, single)
+
+        def polish(Z):
+            """One Newton step to clean up round-off in the closed forms"""
+            f = ((Z + c2)*Z + c1)*Z + c0
+            df = (3*Z + 2*c2)*Z + c1
+            safe = np.abs(df) > 1e-8
+            return np.where(safe, Z - f / np.where(safe, df, 1), Z)
+
+        return polish(vapor), polish(liquid)
 
-        def f(V):
-            return P - self._P_pr(V, T)
+    def _ln_phi(self, Z, T, P):
+        """Natural log of the fugacity coefficient of a root Z"""
+        RT = Rc.value * T
+        A = self._a(T) * P / RT**2
+        B = self._bc * P / RT
+        r2 = 2**0.5
+        ratio = (Z + (1 + r2)*B) / (Z + (1 - r2)*B)
+        return Z - 1 - np.log(Z - B) - A / (2*r2*B) * np.log(ratio)
 
-        vapor = fsolve(f, vapor_guess)[0]
-        liquid = fsolve(f, liquid_guess)[0]
-        return {'vapor': vapor, 'liquid': liquid}
+    def _P_sat(self, T, P, tol=1e-10, maxiter=50):
+        """Solve for the vapor pressure at T, starting from P.
+
+        Newton's method on ln(P), using d(ln(phi))/d(ln(P)) = Z - 1, so the
+        slope of ln(phi_l) - ln(phi_v) is just Z_l - Z_v.
+
+        Returns None if it doesn't converge.
+        """
+        ln_P = np.log(P)
+        for _ in range(maxiter):
+            P = np.exp(ln_P)
+            vapor, liquid = self._Z_roots(T, P)
+            if vapor - liquid < 1e-9:
+                # Only one root: push P back toward the two-phase region
+                ln_P += 0.5 if vapor > 0.3074 else -0.5
+                continue
+            diff = self._ln_phi(liquid, T, P) - self._ln_phi(vapor, T, P)
+            step = np.clip(diff / (vapor - liquid), -0.5, 0.5)
+            ln_P += step
+            if abs(step) < tol:
+                return np.exp(ln_P)
+        return None
+
+    def _saturation_curve(self, T, Tr_max=0.999):
+        Ts, Ps = [], []
+        for t in T:
+            if t > Tr_max * self._Tc:
+                break
+            if len(Ps) >= 2:
+                # ln(P) is nearly linear in 1/T (Clausius-Clapeyron)
+                slope = ((np.log(Ps[-1]) - np.log(Ps[-2])) /
+                         (1/Ts[-1] - 1/Ts[-2]))
+                guess = Ps[-1] * np.exp(slope * (1/t - 1/Ts[-1]))
+            elif Ps:
+                guess = Ps[-1] * self._wilson(t) / self._wilson(Ts[-1])
+            else:
+                guess = self._wilson(t)
+            P = self._P_sat(t, guess)
+            if P is None:
+                break
+            Ts.append(t)
+            Ps.append(P)
+        Ts, Ps = np.array(Ts), np.array(Ps)
+        vols = self._V_pr(Ts, Ps)
+        return {'T': Ts, 'P': Ps,
+                'vapor': vols['vapor'], 'liquid': vols['liquid']}
+
+    def _wilson(self, T):
+        """Wilson's estimate of the vapor pressure"""
+        return self._Pc * np.exp(5.373*(1 + self.omega)*(1 - self._Tc/T))
+
+    def _V_pr(self, T, P):
+        vapor, liquid = self._Z_roots(T, P)
+        RT_P = Rc.value * np.asarray(T) / np.asarray(P)
+        return {'vapor': vapor * RT_P, 'liquid': liquid * RT_P}
 
 
 #__________________________________________________________________________#
@@ -12,6 +12,15 @@ class Counter(dict):
     def __missing__(self, key):
         return 0
 
+    def copy(self):
+        """Return a copy, without going through __setitem__ for every key.
+        """
+        new = Counter()
+        dict.update(new, self)
+        new.positives = dict(self.positives)
+        new.negatives = dict(self.negatives)
+        return new
+
     def __setitem__(self, key, value):
         super().__setitem__(key, float(value))
         self.negatives.pop(key, None)
@@ -0,0 +1,323 @@
+"""Lazy arithmetic on quantity arrays
+
+Each step of an expression like `(0.037 * ReL**(4/5) - 871) * Pr**(1/3)` on
+arrays makes a new full-size temporary array. `lazy` wraps a quantity array so
+that arithmetic on it just builds up the expression instead. Units are checked
+as it's built (on a one-element stand-in for each step), and the numbers are
+only computed when they're needed:
+
+    >>> ReL = lazy(units_array(np.linspace(5e5, 1e7, 1000000), m / m))
+    >>> Nu = (0.037 * ReL**(4/5) - 871) * 0.7**(1/3)
+    >>> Nu
+    Lazy[((((0.037) * (x1 ** (0.8))) - (871.0)) * (0.8879040017426006))]
+    >>> Nu.evaluate()
+    [  417.17492744   417.19302362   417.21111973 ... 12305.41087939
+     12305.42081929 12305.43075919]
+
+Evaluating runs the whole expression in one pass, a cache-sized chunk of the
+arrays at a time (or with numexpr, if it's installed), so the only full-size
+array it makes is the answer. Reading anything that needs the numbers (like
+`.magnitude`, `.value` or comparisons) evaluates it too. The answer is kept,
+so it's only computed once. Printing one shows its expression (as above) until
+it's been evaluated, and the answer after.
+
+Converting a lazy quantity doesn't touch its numbers: it's a view of the same
+array with a scale factor waiting to be applied, so chains like
+`lazy(pressures)(Pa)(kPa)` cost nothing. The factor is folded into the next
+operation, or applied in one pass when evaluated. If it works out to 1, the
+evaluated magnitude is a read-only view of the original array, not a copy.
+
+Subexpressions used more than once are computed once per use.
+"""
+
+from math import isclose
+from unties.units_group import UnitsGroup
+
+_chunk_size = 2**14  # Elements per chunk, small enough to stay in cache
+
+# How each function is written in an expression. numexpr uses the same names.
+_functions = ['exp', 'expm1', 'log', 'log10', 'log1p', 'sin', 'cos', 'tan',
+              'arcsin', 'arccos', 'arctan', 'sinh', 'cosh', 'tanh', 'sqrt',
+              'abs']
+_ufuncs = {'add': '+', 'subtract': '-', 'multiply': '*', 'true_divide': '/',
+           'divide': '/', 'power': '**'}
+_count = [0]
+
+
+def _leaf_name():
+    _count[0] += 1
+    return 'x' + str(_count[0])
+
+
+def lazy(quantity):
+    """Wrap a units_group (usually with an array as its magnitude) lazily"""
+    if isinstance(quantity, LazyQuantity):
+        return quantity
+    name = _leaf_name()
+    if not isinstance(quantity, UnitsGroup):
+        return LazyQuantity(name, {name: quantity}, UnitsGroup())
+    # Keep the magnitude itself, and scale it to SI units when it's used
+    return LazyQuantity(name, {name: quantity.magnitude},
+                        quantity.normalized(), 1 / quantity.normal)
+
+
+def _template(value):
+    """A one-element stand-in with value's units, to check units with"""
+    if isinstance(value, LazyQuantity):
+        return value._template
+    if isinstance(value, UnitsGroup):
+        return value.normalized()
+    return UnitsGroup()
+
+
+def _number(value):
+    return value.value if isinstance(value, UnitsGroup) else value
+
+
+def _operand(value):
+    """Expression and leaves for any value in an expression"""
+    if isinstance(value, LazyQuantity):
+        return value._scaled(), value._leaves
+    number = _number(value)
+    if isinstance(number, (int, float)):
+        return '(' + repr(float(number)) + ')', {}
+    name = _leaf_name()
+    return name, {name: number}
+
+
+def _run(expression, leaves):
+    """Compute an expression of plain numbers in one pass"""
+    import numpy as np
+    shape = np.broadcast_shapes(*[np.shape(v) for v in leaves.values()])
+    try:
+        import numexpr
+        return numexpr.evaluate(expression, local_dict=leaves)[()]
+    except ImportError:
+        pass
+    namespace = {name: getattr(np, name) for name in _functions}
+    code = compile(expression, '<lazy>', 'eval')
+    if not shape:
+        return eval(code, namespace, leaves)
+    dtype = np.result_type(*leaves.values(), 1.0)
+    out = np.empty(shape, dtype=dtype)
+    leaves = {name: np.broadcast_to(value, shape)
+              for name, value in leaves.items()}
+    rows = max(1, _chunk_size // max(1, out[0].size))
+    for i in range(0, shape[0], rows):
+        chunk = {name: value[i:i + rows] for name, value in leaves.items()}
+        out[i:i + rows] = eval(code, namespace, chunk)
+    return out
+
+
+class LazyQuantity(UnitsGroup):
+    """A units_group whose magnitude is an expression that hasn't been run
+
+    Use `lazy` to make one. Being a UnitsGroup means its reflected operators
+    (like __radd__) go before UnitsGroup's, and that it works anywhere a
+    units_group does (by evaluating itself when it has to).
+    """
+    _is_tracer = True  # So UnitsGroup defers to it, like to tracers
+
+    def __init__(self, expression, leaves, template, scale=1.0):
+        self._expression = expression
+        self._leaves = leaves
+        self._template = template
+        self._scale = scale  # Times the expression, for the value in SI units
+        self._result = None
+        self.description = ''
+        self._manual_quantity = ''
+
+    def _scaled(self):
+        """The expression for the value in SI units"""
+        if self._scale == 1:
+            return self._expression
+        return '(' + self._expression + ' * ' + repr(self._scale) + ')'
+
+    def _combine(self, expression, others, template):
+        leaves = dict(self._leaves)
+        for other in others:
+            leaves.update(other)
+        return LazyQuantity(expression, leaves, template)
+
+    def _binary(self, symbol, other, reflected=False):
+        expression, leaves = _operand(other)
+        templates = [self._template, _template(other)]
+        names = [self._scaled(), expression]
+        exponent = self if reflected else other
+        if reflected:
+            templates.reverse()
+            names.reverse()
+        a, b = templates
+        if symbol == '**':
+            template = self._power(a, b, exponent)
+        else:
+            template = {'+': lambda: a + b, '-': lambda: a - b,
+                        '*': lambda: a * b, '/': lambda: a / b}[symbol]()
+        return self._combine('(' + names[0] + ' ' + symbol + ' ' + names[1] +
+                             ')', [leaves], template.normalized())
+
+    @staticmethod
+    def _power(base, power, exponent):
+        """The template for base ** exponent, where power is its template
+
+        The units depend on the exponent's number, which a lazy exponent
+        doesn't have yet, so only unitless bases can have lazy exponents.
+        """
+        if power.units:
+            raise TypeError('Exponent must be unitless')
+        if isinstance(exponent, LazyQuantity):
+            if base.units:
+                raise TypeError('Lazy exponents need unitless bases')
+            return UnitsGroup()
+        return base ** _number(exponent)
+
+    def _function(self, name):
+        template = self._template
+        if name == 'sqrt':
+            template = template**0.5
+        elif name != 'abs':
+            if template.units:
+                float(template)  # Raises the usual TypeError
+            template = UnitsGroup()
+        return self._combine(name + '(' + self._scaled() + ')', [],
+                             template.normalized())
+
+    def __add__(self, other):
+        return self._binary('+', other)
+
+    def __radd__(self, other):
+        return self._binary('+', other, True)
+
+    def __sub__(self, other):
+        return self._binary('-', other)
+
+    def __rsub__(self, other):
+        return self._binary('-', other, True)
+
+    def __mul__(self, other):
+        return self._binary('*', other)
+
+    def __rmul__(self, other):
+        return self._binary('*', other, True)
+
+    def __truediv__(self, other):
+        return self._binary('/', other)
+
+    def __rtruediv__(self, other):
+        return self._binary('/', other, True)
+
+    def __pow__(self, other):
+        return self._binary('**', other)
+
+    def __rpow__(self, other):
+        return self._binary('**', other, True)
+
+    def __neg__(self):
+        return LazyQuantity(self._expression, self._leaves, self._template,
+                            -self._scale)
+
+    def __abs__(self):
+        return self._function('abs')
+
+    def exp(self):
+        return self._function('exp')
+
+    def log(self):
+        return self._function('log')
+
+    def log10(self):
+        return self._function('log10')
+
+    def sin(self):
+        return self._function('sin')
+
+    def cos(self):
+        return self._function('cos')
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        name = ufunc.__name__
+        if method == '__call__' and not kwargs:
+            if len(inputs) == 1 and name in _functions + ['absolute']:
+                return self._function('abs' if name == 'absolute' else name)
+            if len(inputs) == 1 and name == 'negative':
+                return -self
+            if len(inputs) == 2 and name in _ufuncs:
+                reflected = inputs[0] is not self
+                return self._binary(_ufuncs[name],
+                                    inputs[0 if reflected else 1], reflected)
+        inputs = [i.evaluate() if isinstance(i, LazyQuantity) else i
+                  for i in inputs]
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    # Units come from the template, without evaluating
+    @property
+    def units(self):
+        return self._template.units
+
+    @property
+    def full_name(self):
+        return self._template.full_name
+
+    @property
+    def normal(self):
+        return self._template.normal
+
+    def normalized(self):
+        return self._template.normalized()
+
+    def units_of(self, units_group):
+        """Convert without touching the numbers, which stay where they are"""
+        return LazyQuantity(self._expression, self._leaves,
+                            self._template.units_of(units_group).normalized(),
+                            self._scale)
+
+    __call__ = units_of
+
+    def to_(self, units_group):
+        self._template = self._template.units_of(units_group).normalized()
+        self._result = None
+        return self
+
+    def standardized(self):
+        return LazyQuantity(self._expression, self._leaves,
+                            self._template.standardized(), self._scale)
+
+    # Numbers need evaluating
+    def evaluate(self):
+        """Compute the expression, and return it as a units_group"""
+        if self._result is None:
+            result = self._template.normalized()
+            scale = self._scale * self.normal
+            if (isclose(scale, 1, rel_tol=1e-15) and
+                    self._expression in self._leaves):
+                # Already in these units, so the data itself will do, as a
+                # read-only view so that to_ on the result can't change it
+                magnitude = self._leaves[self._expression]
+                if getattr(magnitude, 'ndim', 0):
+                    magnitude = magnitude.view()
+                    magnitude.flags.writeable = False
+                result.magnitude = magnitude
+            else:
+                expression = self._expression
+                if scale != 1:
+                    expression = '(' + expression + ') * ' + repr(scale)
+                result.magnitude = _run(expression, self._leaves)
+            self._result = result
+        return self._result
+
+    @property
+    def magnitude(self):
+        return self.evaluate().magnitude
+
+    @property
+    def value(self):
+        return self.evaluate().value
+
+    def copy(self):
+        return self.evaluate().copy()
+
+    def __str__(self):
+        if self._result is None:
+            return 'Lazy[' + self._scaled() + ']' + str(self.full_name)
+        return str(self._result)
+    __repr__ = __str__
@@ -40,6 +40,20 @@ override this safety range.
 
 Check the docstring of each function to find the units of the returned value.
 
+Most temperature-dependant functions have a `_dT` companion that returns the
+exact derivative with respect to temperature (in units of the function's units
+per Kelvin):
+
+    >>> print(air.liquid_density_dT(100 * K))
+    -201.26161573883647 * mol / (K * m**3.0)
+
+The heat capacities also have exact integrals between two temperatures, of Cp
+(`_integral`, for enthalpy changes) and of Cp / T (`_integral_over_T`, for
+entropy changes). Either temperature can be an array:
+
+    >>> print(air.ideal_gas_heat_capacity_integral(100 * K, 1000 * K))
+    27299.37786985215 * J / mol
+
 
 ## Data Lists
 
@@ -71,6 +85,7 @@ Available Temperature-Dependant Functions:
     _liquid_density
     _solid_vapor_pressure
     _vapor_pressure
+    _liquid_vapor_pressure = _vapor_pressure
     _heat_of_vaporization
     _solid_heat_capacity
     _liquid_heat_capacity
@@ -85,12 +100,28 @@ Available Temperature-Dependant Functions:
     _kinematic_viscocity_one_atm
     _alpha_one_atm
     _Pr_one_atm
+
+Available Pressure-Dependant Functions:
+    _sat_temp
+
+Available Heat Capacity Integrals (functions of T1 and T2):
+    _solid_heat_capacity_integral
+    _solid_heat_capacity_integral_over_T
+    _liquid_heat_capacity_integral
+    _liquid_heat_capacity_integral_over_T
+    _ideal_gas_heat_capacity_integral
+    _ideal_gas_heat_capacity_integral_over_T
 """
 
 # Imports ######################################################################
 from scipy.interpolate import UnivariateSpline
-from math import exp, log, sinh, cosh
+from numpy import exp, log, sinh, cosh
 from unties.utilities.utilities import OutOfRangeTest, function_strings
+from unties.properties.dippr import eq101_inverse, eq101_table
+from unties.properties.dippr import (eq100_dT, eq101_dT, eq102_dT, eq104_dT,
+                                     eq105_dT, eq107_dT)
+from unties.properties.dippr import (eq100_integral, eq100_integral_over_T,
+                                     eq107_integral, eq107_integral_over_T)
 from unties import *
 
 
@@ -155,10 +186,12 @@ dielectric_const = _dielectric_const * (m/m)
 
 
 # DIPPR's Functions Without Units ##############################################
+_liquid_density_coefs = 2.8963E+00, 2.6733E-01, 1.3245E+02, 2.7341E-01
+
 def _liquid_density(_T, ranged=True):
     """mol / m**3"""
     OutOfRangeTest(_T, 59.15, 132.45, ranged)
-    A, B, C, D = 2.8963E+00, 2.6733E-01, 1.3245E+02, 2.7341E-01
+    A, B, C, D = _liquid_density_coefs
     return A / (B**(1 + (1 - _T / C)**D)) * 1000
 
 def _solid_vapor_pressure(_T, ranged=True):
@@ -167,68 +200,210 @@ def _solid_vapor_pressure(_T, ranged=True):
     A = 5.6420E+03
     return A
 
+_vapor_pressure_coefs = 2.1662E+01, -6.9239E+02, -3.9208E-01, 4.7574E-03, 1.0000E+00
+
 def _vapor_pressure(_T, ranged=True):
     """Pa"""
     OutOfRangeTest(_T, 59.15, 132.45, ranged)
-    A, B, C, D, E = 2.1662E+01, -6.9239E+02, -3.9208E-01, 4.7574E-03, 1.0000E+00
+    A, B, C, D, E = _vapor_pressure_coefs
     return exp(A + B / _T + C * log(_T) + D * _T**E)
 
+# Same names as in the water and benzene modules
+_liquid_vapor_pressure = _vapor_pressure
+_liquid_vapor_pressure_coefs = _vapor_pressure_coefs
+
+_heat_of_vaporization_coefs = 7.4587E+06, 4.7571E-01, -7.1131E-01, 6.0517E-01
+
 def _heat_of_vaporization(_T, ranged=True):
     """J / mol"""
     OutOfRangeTest(_T, 59.15, 132.45, ranged)
-    A, B, C, D = 7.4587E+06, 4.7571E-01, -7.1131E-01, 6.0517E-01
+    A, B, C, D = _heat_of_vaporization_coefs
     Tr = _T / _Tc
     return A * (1 - Tr)**(B + C * _T + D * _T**2) / 1000
 
+_solid_heat_capacity_coefs = -6.6748E+02, 1.7834E+03, -7.6100E+02, 1.4284E+02, -1.0229E+01
+
 def _solid_heat_capacity(_T, ranged=True):
     """J / (mol * K)"""
     OutOfRangeTest(_T, 1.2, 4, ranged)
-    A, B, C, D, E = -6.6748E+02, 1.7834E+03, -7.6100E+02, 1.4284E+02, -1.0229E+01
+    A, B, C, D, E = _solid_heat_capacity_coefs
     return (A + B * _T + C * _T**2 + D * _T**3 + E * _T**4) / 1000
 
+_liquid_heat_capacity_coefs = -2.1446E+05, 9.1851E+03, -1.0612E+02, 4.1616E-01
+
 def _liquid_heat_capacity(_T, ranged=True):
     """J / (mol * K)"""
     OutOfRangeTest(_T, 75, 115, ranged)
-    A, B, C, D = -2.1446E+05, 9.1851E+03, -1.0612E+02, 4.1616E-01
+    A, B, C, D = _liquid_heat_capacity_coefs
     return (A + B * _T + C * _T**2 + D * _T**3) / 1000
 
+_ideal_gas_heat_capacity_coefs = 2.8958E+04, 9.3900E+03, 3.0120E+03, 7.5800E+03, 1.4840E+03
+
 def _ideal_gas_heat_capacity(_T, ranged=True):
     """J / (mol * K)"""
     OutOfRangeTest(_T, 50, 1500, ranged)
-    A, B, C, D, E = 2.8958E+04, 9.3900E+03, 3.0120E+03, 7.5800E+03, 1.4840E+03
+    A, B, C, D, E = _ideal_gas_heat_capacity_coefs
     return (A + B * (C/_T / sinh(C/_T))**2 + D * (E/_T / cosh(E/_T))**2) / 1000
 
+_second_virial_coef_coefs = 4.3045E-02, -1.7121E+01, 1.1731E+05, -3.4138E+15, 3.0380E+17
+
 def _second_virial_coef(_T, ranged=True):
     """m**3 / mol"""
     OutOfRangeTest(_T, 118.15, 248.15, ranged)
-    A, B, C, D, E = 4.3045E-02, -1.7121E+01, 1.1731E+05, -3.4138E+15, 3.0380E+17
+    A, B, C, D, E = _second_virial_coef_coefs
     return (A + B / _T + C / _T**3 + D / _T**8 + E / _T**9) / 1000
 
+_liquid_viscocity_coefs = -2.0077E+01, 2.8515E+02, 1.7840E+00, -6.2382E-22, 10.0
+
 def _liquid_viscocity(_T, ranged=True):
     """Pa * s"""
     OutOfRangeTest(_T, 59.15, 130, ranged)
-    A, B, C, D, E = -2.0077E+01, 2.8515E+02, 1.7840E+00, -6.2382E-22, 10.0
+    A, B, C, D, E = _liquid_viscocity_coefs
     return exp(A + B / _T + C * log(_T) + D * _T**E)
 
+_vapor_viscocity_coefs = 1.4250E-06, 5.0390E-01, 1.0830E+02
+
 def _vapor_viscocity(_T, ranged=True):
     """Pa * s"""
     OutOfRangeTest(_T, 80, 2000, ranged)
-    A, B, C = 1.4250E-06, 5.0390E-01, 1.0830E+02
+    A, B, C = _vapor_viscocity_coefs
     return (A * _T**B) / (1 + C / _T)
 
+_liquid_thermal_conductivity_coefs = 2.8472E-01, -1.7393E-03
+
 def _liquid_thermal_conductivity(_T, ranged=True):
     """W / (m * K)"""
     OutOfRangeTest(_T, 75, 125, ranged)
-    A, B = 2.8472E-01, -1.7393E-03
+    A, B = _liquid_thermal_conductivity_coefs
     return A + B * _T
 
+_vapor_thermal_conductivity_coefs = 3.1417E-04, 7.7860E-01, -7.1160E-01, 2.1217E+03
+
 def _vapor_thermal_conductivity(_T, ranged=True):
     """W / (m * K)"""
     OutOfRangeTest(_T, 70, 2000, ranged)
-    A, B, C, D = 3.1417E-04, 7.7860E-01, -7.1160E-01, 2.1217E+03
+    A, B, C, D = _vapor_thermal_conductivity_coefs
     return (A * _T**B) / (1 + C / _T + D / _T**2)
 
 
+# Derivatives Without Units ####################################################
+def _liquid_density_dT(_T, ranged=True):
+    """mol / (m**3 * K)"""
+    OutOfRangeTest(_T, 59.15, 132.45, ranged)
+    return eq105_dT(_T, _liquid_density_coefs) * 1000
+
+def _solid_vapor_pressure_dT(_T, ranged=True):
+    """Pa / K"""
+    OutOfRangeTest(_T, 59.15, 59.15, ranged)
+    return 0 * _T
+
+def _vapor_pressure_dT(_T, ranged=True):
+    """Pa / K"""
+    OutOfRangeTest(_T, 59.15, 132.45, ranged)
+    return eq101_dT(_T, _vapor_pressure_coefs)
+
+_liquid_vapor_pressure_dT = _vapor_pressure_dT
+
+def _heat_of_vaporization_dT(_T, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T, 59.15, 132.45, ranged)
+    A, B, C, D = _heat_of_vaporization_coefs
+    Tr = _T / _Tc
+    power = B + C * _T + D * _T**2
+    d_power = C + 2 * D * _T
+    return (_heat_of_vaporization(_T, False) *
+            (d_power * log(1 - Tr) - power / (_Tc - _T)))
+
+def _solid_heat_capacity_dT(_T, ranged=True):
+    """J / (mol * K**2)"""
+    OutOfRangeTest(_T, 1.2, 4, ranged)
+    return eq100_dT(_T, _solid_heat_capacity_coefs) / 1000
+
+def _liquid_heat_capacity_dT(_T, ranged=True):
+    """J / (mol * K**2)"""
+    OutOfRangeTest(_T, 75, 115, ranged)
+    return eq100_dT(_T, _liquid_heat_capacity_coefs) / 1000
+
+def _ideal_gas_heat_capacity_dT(_T, ranged=True):
+    """J / (mol * K**2)"""
+    OutOfRangeTest(_T, 50, 1500, ranged)
+    return eq107_dT(_T, _ideal_gas_heat_capacity_coefs) / 1000
+
+def _second_virial_coef_dT(_T, ranged=True):
+    """m**3 / (mol * K)"""
+    OutOfRangeTest(_T, 118.15, 248.15, ranged)
+    return eq104_dT(_T, _second_virial_coef_coefs) / 1000
+
+def _liquid_viscocity_dT(_T, ranged=True):
+    """Pa * s / K"""
+    OutOfRangeTest(_T, 59.15, 130, ranged)
+    return eq101_dT(_T, _liquid_viscocity_coefs)
+
+def _vapor_viscocity_dT(_T, ranged=True):
+    """Pa * s / K"""
+    OutOfRangeTest(_T, 80, 2000, ranged)
+    return eq102_dT(_T, _vapor_viscocity_coefs)
+
+def _liquid_thermal_conductivity_dT(_T, ranged=True):
+    """W / (m * K**2)"""
+    OutOfRangeTest(_T, 75, 125, ranged)
+    return eq100_dT(_T, _liquid_thermal_conductivity_coefs)
+
+def _vapor_thermal_conductivity_dT(_T, ranged=True):
+    """W / (m * K**2)"""
+    OutOfRangeTest(_T, 70, 2000, ranged)
+    return eq102_dT(_T, _vapor_thermal_conductivity_coefs)
+
+
+# Heat Capacity Integrals Without Units ########################################
+def _solid_heat_capacity_integral(_T1, _T2, ranged=True):
+    """J / mol"""
+    OutOfRangeTest(_T1, 1.2, 4, ranged)
+    OutOfRangeTest(_T2, 1.2, 4, ranged)
+    return eq100_integral(_T1, _T2, _solid_heat_capacity_coefs) / 1000
+
+def _solid_heat_capacity_integral_over_T(_T1, _T2, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T1, 1.2, 4, ranged)
+    OutOfRangeTest(_T2, 1.2, 4, ranged)
+    return eq100_integral_over_T(_T1, _T2, _solid_heat_capacity_coefs) / 1000
+
+def _liquid_heat_capacity_integral(_T1, _T2, ranged=True):
+    """J / mol"""
+    OutOfRangeTest(_T1, 75, 115, ranged)
+    OutOfRangeTest(_T2, 75, 115, ranged)
+    return eq100_integral(_T1, _T2, _liquid_heat_capacity_coefs) / 1000
+
+def _liquid_heat_capacity_integral_over_T(_T1, _T2, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T1, 75, 115, ranged)
+    OutOfRangeTest(_T2, 75, 115, ranged)
+    return eq100_integral_over_T(_T1, _T2, _liquid_heat_capacity_coefs) / 1000
+
+def _ideal_gas_heat_capacity_integral(_T1, _T2, ranged=True):
+    """J / mol"""
+    OutOfRangeTest(_T1, 50, 1500, ranged)
+    OutOfRangeTest(_T2, 50, 1500, ranged)
+    return eq107_integral(_T1, _T2, _ideal_gas_heat_capacity_coefs) / 1000
+
+def _ideal_gas_heat_capacity_integral_over_T(_T1, _T2, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T1, 50, 1500, ranged)
+    OutOfRangeTest(_T2, 50, 1500, ranged)
+    return eq107_integral_over_T(_T1, _T2, _ideal_gas_heat_capacity_coefs) / 1000
+
+
+# Inverse Functions Without Units ##############################################
+_sat_temp_range = _vapor_pressure(59.15), _vapor_pressure(132.45)
+_sat_temp_table = eq101_table(_vapor_pressure_coefs, 59.15, 132.45)
+
+def _sat_temp(_P, ranged=True):
+    """K"""
+    OutOfRangeTest(_P, *_sat_temp_range, ranged)
+    return eq101_inverse(_P, _vapor_pressure_coefs, 59.15, 132.45,
+                         _sat_temp_table)
+
+
 # Dr Knott's Functions Without Units ###########################################
 def _ro_one_atm(_T, ranged=True):
     """mol / m**3"""
@@ -282,13 +457,34 @@ functions = [
     _vapor_viscocity,
     _liquid_thermal_conductivity,
     _vapor_thermal_conductivity,
+    _sat_temp,
     _ro_one_atm,
     _volume_1_atm,
     _kinematic_viscocity_one_atm,
     _alpha_one_atm,
     _Pr_one_atm,
+    _liquid_density_dT,
+    _solid_vapor_pressure_dT,
+    _vapor_pressure_dT,
+    _heat_of_vaporization_dT,
+    _solid_heat_capacity_dT,
+    _liquid_heat_capacity_dT,
+    _ideal_gas_heat_capacity_dT,
+    _second_virial_coef_dT,
+    _liquid_viscocity_dT,
+    _vapor_viscocity_dT,
+    _liquid_thermal_conductivity_dT,
+    _vapor_thermal_conductivity_dT,
+    _solid_heat_capacity_integral,
+    _solid_heat_capacity_integral_over_T,
+    _liquid_heat_capacity_integral,
+    _liquid_heat_capacity_integral_over_T,
+    _ideal_gas_heat_capacity_integral,
+    _ideal_gas_heat_capacity_integral_over_T,
 ]
 
 exec(function_strings(functions))
 
 k_v = vapor_thermal_conductivity
+liquid_vapor_pressure = vapor_pressure
+liquid_vapor_pressure_dT = vapor_pressure_dT
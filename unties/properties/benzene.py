@@ -40,6 +40,20 @@ override this safety range.
 
 Check the docstring of each function to find the units of the returned value.
 
+Most temperature-dependant functions have a `_dT` companion that returns the
+exact derivative with respect to temperature (in units of the function's units
+per Kelvin):
+
+    >>> print(benzene.liquid_density_dT(300 * K))
+    -12.860973591569442 * mol / (K * m**3.0)
+
+The heat capacities also have exact integrals between two temperatures, of Cp
+(`_integral`, for enthalpy changes) and of Cp / T (`_integral_over_T`, for
+entropy changes). Either temperature can be an array:
+
+    >>> print(benzene.ideal_gas_heat_capacity_integral(300 * K, 400 * K))
+    9836.559200806878 * J / mol
+
 
 ## Data Lists
 
@@ -96,17 +110,32 @@ Available Temperature-Dependant Functions:
     _vapor_thermal_conductivity
     _surface_tension
     _sat_pressure
-    _sat_temp
     _kinematic_viscocity
     _Pr_liq
     _Pr_vap
+
+Available Pressure-Dependant Functions:
+    _sat_temp
+    _sublimation_temp
+
+Available Heat Capacity Integrals (functions of T1 and T2):
+    _solid_heat_capacity_integral
+    _solid_heat_capacity_integral_over_T
+    _liquid_heat_capacity_integral
+    _liquid_heat_capacity_integral_over_T
+    _ideal_gas_heat_capacity_integral
+    _ideal_gas_heat_capacity_integral_over_T
 """
 
 # Imports ######################################################################
 from unties import *
-from math import exp, log, sinh, cosh
-from scipy.optimize import fsolve
+from numpy import exp, log, sinh, cosh
 from unties.utilities.utilities import OutOfRangeTest, function_strings
+from unties.properties.dippr import eq101_inverse, eq101_table
+from unties.properties.dippr import (eq100_dT, eq101_dT, eq102_dT, eq104_dT,
+                                     eq105_dT, eq106_dT, eq127_dT)
+from unties.properties.dippr import (eq100_integral, eq100_integral_over_T,
+                                     eq127_integral, eq127_integral_over_T)
 
 
 # DIPPR's Constants Without Units ##############################################
@@ -195,124 +224,294 @@ del_h_sublimation = _del_h_sublimation * J / kmol
 dielectric_const = _dielectric_const * (m/m)
 
 # DIPPR's Functions Without Units ##############################################
+_solid_density_coefs = 1.3061E+01, -3.5714E-04
+
 def _solid_density(_T, ranged=True):
     """mol / m**3"""
     OutOfRangeTest(_T, 273.1, 278.68, ranged)
-    A, B = 1.3061E+01, -3.5714E-04
+    A, B = _solid_density_coefs
     return A + B * _T * 1000
 
+_liquid_density_coefs = 1.0259E+00, 2.6666E-01, 5.6205E+02, 2.8394E-01
+
 def _liquid_density(_T, ranged=True):
     """mol / m**3"""
     OutOfRangeTest(_T, 278.68, 562.05, ranged)
-    A, B, C, D = 1.0259E+00, 2.6666E-01, 5.6205E+02, 2.8394E-01
+    A, B, C, D = _liquid_density_coefs
     return (A / B**(1 + (1 - _T / C)**D)) * 1000
 
+_solid_vapor_pressure_coefs = 7.2829E+01, -7.0423E+03, -7.0610E+00, 8.6915E-06, 2.0000E+00
+
 def _solid_vapor_pressure(_T, ranged=True):
     """Pa"""
     OutOfRangeTest(_T, 178.25, 278.68, ranged)
-    A, B, C, D, E = 7.2829E+01, -7.0423E+03, -7.0610E+00, 8.6915E-06, 2.0000E+00
+    A, B, C, D, E = _solid_vapor_pressure_coefs
     return exp(A + B / _T + C * log(_T) + D * _T**E)
 
+_liquid_vapor_pressure_coefs = 8.3107E+01, -6.4862E+03, -9.2194E+00, 6.9844E-06, 2.0000E+00
+
 def _liquid_vapor_pressure(_T, ranged=True):
     """Pa"""
     OutOfRangeTest(_T, 278.68, 562.05, ranged)
-    A, B, C, D, E = 8.3107E+01, -6.4862E+03, -9.2194E+00, 6.9844E-06, 2.0000E+00
+    A, B, C, D, E = _liquid_vapor_pressure_coefs
     return exp(A + B / _T + C * log(_T) + D * _T**E)
 
+_heat_of_vaporization_coefs = 5.0007E+07, 6.5393E-01, -2.7698E-01, 2.9569E-02
+
 def _heat_of_vaporization(_T, ranged=True):
     """J / mol"""
     OutOfRangeTest(_T, 278.68, 562.05, ranged)
-    A, B, C, D = 5.0007E+07, 6.5393E-01, -2.7698E-01, 2.9569E-02
+    A, B, C, D = _heat_of_vaporization_coefs
     Tr = _T / _Tc
     return A * (1 - Tr)**(B + C * _T + D * _T**2) / 1000
 
+_solid_heat_capacity_coefs = 7.4000E+03, 6.2490E+02, -2.6874E+00, 7.3160E-03
+
 def _solid_heat_capacity(_T, ranged=True):
     """J / (mol * K)"""
     OutOfRangeTest(_T, 40, 278.68, ranged)
-    A, B, C, D = 7.4000E+03, 6.2490E+02, -2.6874E+00, 7.3160E-03
+    A, B, C, D = _solid_heat_capacity_coefs
     return (A + B * _T + C * _T**2 + D * _T**3) / 1000
 
+_liquid_heat_capacity_coefs = 1.6294E+05, -3.4494E+02, 8.5562E-01
+
 def _liquid_heat_capacity(_T, ranged=True):
     """J / (mol * K)"""
     OutOfRangeTest(_T, 278.68, 500, ranged)
-    A, B, C = 1.6294E+05, -3.4494E+02, 8.5562E-01
+    A, B, C = _liquid_heat_capacity_coefs
     return (A + B * _T + C * _T**2) / 1000
 
+_ideal_gas_heat_capacity_coefs = (3.3258E+04,
+                                  5.1445E+04,
+                                  -7.6109E+02,
+                                  1.3974E+05,
+                                  1.6169E+03,
+                                  5.6829E+04,
+                                  4.1114E+03)
+
 def _ideal_gas_heat_capacity(_T, ranged=True):
     """J / (mol * K)"""
     OutOfRangeTest(_T, 20, 1500, ranged)
-    A, B, C, D, E, F, G= (3.3258E+04,
-                          5.1445E+04,
-                          -7.6109E+02,
-                          1.3974E+05,
-                          1.6169E+03,
-                          5.6829E+04,
-                          4.1114E+03)
+    A, B, C, D, E, F, G = _ideal_gas_heat_capacity_coefs
     first = A + B * (C / _T)**2 * exp(C / _T) / (exp(C / _T) - 1)**2
     second = D * (E / _T)**2 * exp(E / _T) / (exp(E / _T) - 1)**2
     third = F * (G / _T)**2 * exp(G / _T) / (exp(G / _T) - 1)**2
     return (first + second + third) / 1000
 
+_second_virial_coef_coefs = (1.5059E-01,
+                            -1.8694E+02,
+                            -2.3146E+07,
+                            -7.0493E+18,
+                            -6.8786E+20)
+
 def _second_virial_coef(_T, ranged=True):
     """m**3 / mol"""
     OutOfRangeTest(_T, 281.02, 1500, ranged)
-    A, B, C, D, E = (1.5059E-01,
-                    -1.8694E+02,
-                    -2.3146E+07,
-                    -7.0493E+18,
-                    -6.8786E+20)
+    A, B, C, D, E = _second_virial_coef_coefs
     return (A + B / _T + C / _T**3 + D / _T**8 + E / _T**9) / 1000
 
+_liquid_viscocity_coefs = 7.5117E+00, 2.9468E+02, -2.7940E+00
+
 def _liquid_viscocity(_T, ranged=True):
     """Pa * s"""
     OutOfRangeTest(_T, 278.68, 545, ranged)
-    A, B, C = 7.5117E+00, 2.9468E+02, -2.7940E+00
+    A, B, C = _liquid_viscocity_coefs
     return exp(A + B / _T + C * log(_T))
 
+_vapor_viscocity_coefs = 3.1340E-08, 9.6760E-01, 7.9000E+00
+
 def _vapor_viscocity(_T, ranged=True):
     """Pa * s"""
     OutOfRangeTest(_T, 278.68, 1000, ranged)
-    A, B, C = 3.1340E-08, 9.6760E-01, 7.9000E+00
+    A, B, C = _vapor_viscocity_coefs
     return A * _T**B / (1 + C / _T)
 
+_solid_thermal_conductivity_coefs = 1.1610E+00, -5.9308E-03, 9.8300E-06
+
 def _solid_thermal_conductivity(_T, ranged=True):
     """W / (m * K)"""
     OutOfRangeTest(_T, 90, 273.4, ranged)
-    A, B, C = 1.1610E+00, -5.9308E-03, 9.8300E-06
+    A, B, C = _solid_thermal_conductivity_coefs
     return A + B * _T + C * _T**2
 
+_liquid_thermal_conductivity_coefs = 2.3444E-01, -3.0572E-04
+
 def _liquid_thermal_conductivity(_T, ranged=True):
     """W / (m * K)"""
     OutOfRangeTest(_T, 278.68, 413.1, ranged)
-    A, B = 2.3444E-01, -3.0572E-04
+    A, B = _liquid_thermal_conductivity_coefs
     return A + B * _T
 
+_vapor_thermal_conductivity_coefs = 1.6520E-05, 1.3117E+00, 4.9100E+02
+
 def _vapor_thermal_conductivity(_T, ranged=True):
     """W / (m * K)"""
     OutOfRangeTest(_T, 339.15, 1000, ranged)
-    A, B, C = 1.6520E-05, 1.3117E+00, 4.9100E+02
+    A, B, C = _vapor_thermal_conductivity_coefs
     return A * _T**B / (1 + C / _T)
 
+_surface_tension_coefs = 7.1815E-02, 1.2362E+00
+
 def _surface_tension(_T, ranged=True):
     """N / m"""
     OutOfRangeTest(_T, 278.68, 562.05, ranged)
-    A, B = 7.1815E-02, 1.2362E+00
+    A, B = _surface_tension_coefs
     Tr = _T / _Tc
     return A * (1 - Tr)**B
 
 
+# Derivatives Without Units ####################################################
+def _solid_density_dT(_T, ranged=True):
+    """mol / (m**3 * K)"""
+    OutOfRangeTest(_T, 273.1, 278.68, ranged)
+    A, B = _solid_density_coefs
+    return eq100_dT(_T, (A, B * 1000))
+
+def _liquid_density_dT(_T, ranged=True):
+    """mol / (m**3 * K)"""
+    OutOfRangeTest(_T, 278.68, 562.05, ranged)
+    return eq105_dT(_T, _liquid_density_coefs) * 1000
+
+def _solid_vapor_pressure_dT(_T, ranged=True):
+    """Pa / K"""
+    OutOfRangeTest(_T, 178.25, 278.68, ranged)
+    return eq101_dT(_T, _solid_vapor_pressure_coefs)
+
+def _liquid_vapor_pressure_dT(_T, ranged=True):
+    """Pa / K"""
+    OutOfRangeTest(_T, 278.68, 562.05, ranged)
+    return eq101_dT(_T, _liquid_vapor_pressure_coefs)
+
+def _heat_of_vaporization_dT(_T, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T, 278.68, 562.05, ranged)
+    A, B, C, D = _heat_of_vaporization_coefs
+    Tr = _T / _Tc
+    power = B + C * _T + D * _T**2
+    d_power = C + 2 * D * _T
+    return (_heat_of_vaporization(_T, False) *
+            (d_power * log(1 - Tr) - power / (_Tc - _T)))
+
+def _solid_heat_capacity_dT(_T, ranged=True):
+    """J / (mol * K**2)"""
+    OutOfRangeTest(_T, 40, 278.68, ranged)
+    return eq100_dT(_T, _solid_heat_capacity_coefs) / 1000
+
+def _liquid_heat_capacity_dT(_T, ranged=True):
+    """J / (mol * K**2)"""
+    OutOfRangeTest(_T, 278.68, 500, ranged)
+    return eq100_dT(_T, _liquid_heat_capacity_coefs) / 1000
+
+def _ideal_gas_heat_capacity_dT(_T, ranged=True):
+    """J / (mol * K**2)"""
+    OutOfRangeTest(_T, 20, 1500, ranged)
+    return eq127_dT(_T, _ideal_gas_heat_capacity_coefs) / 1000
+
+def _second_virial_coef_dT(_T, ranged=True):
+    """m**3 / (mol * K)"""
+    OutOfRangeTest(_T, 281.02, 1500, ranged)
+    return eq104_dT(_T, _second_virial_coef_coefs) / 1000
+
+def _liquid_viscocity_dT(_T, ranged=True):
+    """Pa * s / K"""
+    OutOfRangeTest(_T, 278.68, 545, ranged)
+    return eq101_dT(_T, _liquid_viscocity_coefs)
+
+def _vapor_viscocity_dT(_T, ranged=True):
+    """Pa * s / K"""
+    OutOfRangeTest(_T, 278.68, 1000, ranged)
+    return eq102_dT(_T, _vapor_viscocity_coefs)
+
+def _solid_thermal_conductivity_dT(_T, ranged=True):
+    """W / (m * K**2)"""
+    OutOfRangeTest(_T, 90, 273.4, ranged)
+    return eq100_dT(_T, _solid_thermal_conductivity_coefs)
+
+def _liquid_thermal_conductivity_dT(_T, ranged=True):
+    """W / (m * K**2)"""
+    OutOfRangeTest(_T, 278.68, 413.1, ranged)
+    return eq100_dT(_T, _liquid_thermal_conductivity_coefs)
+
+def _vapor_thermal_conductivity_dT(_T, ranged=True):
+    """W / (m * K**2)"""
+    OutOfRangeTest(_T, 339.15, 1000, ranged)
+    return eq102_dT(_T, _vapor_thermal_conductivity_coefs)
+
+def _surface_tension_dT(_T, ranged=True):
+    """N / (m * K)"""
+    OutOfRangeTest(_T, 278.68, 562.05, ranged)
+    return eq106_dT(_T, _surface_tension_coefs, _Tc)
+
+
 # Dr. Knotts Functions Without Units, saturated benzene ########################
+_sat_pressure_coefs = 83.107, -6486.2, -9.2194, 6.9844e-06, 2
+
 def _sat_pressure(_T, ranged=True):
     """Pa"""
-    A, B, C, D, E = 83.107, -6486.2, -9.2194, 6.9844e-06, 2
+    A, B, C, D, E = _sat_pressure_coefs
     return exp(A + B / _T + C * log(_T) + D * _T**E)
 
+_sat_temp_range = _sat_pressure(278.68), _sat_pressure(562.05)
+_sat_temp_table = eq101_table(_sat_pressure_coefs, 278.68, 562.05)
+
 def _sat_temp(_P, ranged=True):
     """K"""
-    OutOfRangeTest(_P, 82732, 3746684, ranged) # Solver breaks outside here
-    def solve(_T):
-        return _P - _sat_pressure(_T)
-    return fsolve(solve, _P * 0.0224 / Rc.value)[0]
+    OutOfRangeTest(_P, *_sat_temp_range, ranged)
+    return eq101_inverse(_P, _sat_pressure_coefs, 278.68, 562.05,
+                         _sat_temp_table)
+
+def _sat_pressure_dT(_T, ranged=True):
+    """Pa / K"""
+    return eq101_dT(_T, _sat_pressure_coefs)
+
+
+# Heat Capacity Integrals Without Units ########################################
+def _solid_heat_capacity_integral(_T1, _T2, ranged=True):
+    """J / mol"""
+    OutOfRangeTest(_T1, 40, 278.68, ranged)
+    OutOfRangeTest(_T2, 40, 278.68, ranged)
+    return eq100_integral(_T1, _T2, _solid_heat_capacity_coefs) / 1000
+
+def _solid_heat_capacity_integral_over_T(_T1, _T2, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T1, 40, 278.68, ranged)
+    OutOfRangeTest(_T2, 40, 278.68, ranged)
+    return eq100_integral_over_T(_T1, _T2, _solid_heat_capacity_coefs) / 1000
+
+def _liquid_heat_capacity_integral(_T1, _T2, ranged=True):
+    """J / mol"""
+    OutOfRangeTest(_T1, 278.68, 500, ranged)
+    OutOfRangeTest(_T2, 278.68, 500, ranged)
+    return eq100_integral(_T1, _T2, _liquid_heat_capacity_coefs) / 1000
+
+def _liquid_heat_capacity_integral_over_T(_T1, _T2, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T1, 278.68, 500, ranged)
+    OutOfRangeTest(_T2, 278.68, 500, ranged)
+    return eq100_integral_over_T(_T1, _T2, _liquid_heat_capacity_coefs) / 1000
+
+def _ideal_gas_heat_capacity_integral(_T1, _T2, ranged=True):
+    """J / mol"""
+    OutOfRangeTest(_T1, 20, 1500, ranged)
+    OutOfRangeTest(_T2, 20, 1500, ranged)
+    return eq127_integral(_T1, _T2, _ideal_gas_heat_capacity_coefs) / 1000
+
+def _ideal_gas_heat_capacity_integral_over_T(_T1, _T2, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T1, 20, 1500, ranged)
+    OutOfRangeTest(_T2, 20, 1500, ranged)
+    return eq127_integral_over_T(_T1, _T2, _ideal_gas_heat_capacity_coefs) / 1000
+
+
+# Inverse Functions Without Units ##############################################
+_sublimation_temp_range = _solid_vapor_pressure(178.25), _solid_vapor_pressure(278.68)
+_sublimation_temp_table = eq101_table(_solid_vapor_pressure_coefs, 178.25, 278.68)
+
+def _sublimation_temp(_P, ranged=True):
+    """K"""
+    OutOfRangeTest(_P, *_sublimation_temp_range, ranged)
+    return eq101_inverse(_P, _solid_vapor_pressure_coefs, 178.25, 278.68,
+                         _sublimation_temp_table)
 
 
 # Other Functions Without Units ################################################
@@ -348,9 +547,32 @@ functions = [
     _surface_tension,
     _sat_pressure,
     _sat_temp,
+    _sublimation_temp,
     _kinematic_viscocity,
     _Pr_liq,
     _Pr_vap,
+    _solid_density_dT,
+    _liquid_density_dT,
+    _solid_vapor_pressure_dT,
+    _liquid_vapor_pressure_dT,
+    _heat_of_vaporization_dT,
+    _solid_heat_capacity_dT,
+    _liquid_heat_capacity_dT,
+    _ideal_gas_heat_capacity_dT,
+    _second_virial_coef_dT,
+    _liquid_viscocity_dT,
+    _vapor_viscocity_dT,
+    _solid_thermal_conductivity_dT,
+    _liquid_thermal_conductivity_dT,
+    _vapor_thermal_conductivity_dT,
+    _surface_tension_dT,
+    _sat_pressure_dT,
+    _solid_heat_capacity_integral,
+    _solid_heat_capacity_integral_over_T,
+    _liquid_heat_capacity_integral,
+    _liquid_heat_capacity_integral_over_T,
+    _ideal_gas_heat_capacity_integral,
+    _ideal_gas_heat_capacity_integral_over_T,
 ]
 
 exec(function_strings(functions))
@@ -0,0 +1,193 @@
+"""Transient conduction series solutions for a plane wall, cylinder and sphere
+
+
+## Intro
+
+Each solid starts at a uniform temperature Ti, and at t = 0 its surface is
+exposed to a fluid at Tinf with a heat transfer coefficient h. The solutions
+are the full Fourier series (not just the first term), in terms of
+
+    theta = (T - Tinf) / (Ti - Tinf)
+    Q / Q0 = fraction of the most heat that can be transferred
+    Bi = h * L / k  (L is the half thickness of a wall, or the outer radius)
+
+To use, give the positions and times as units. Positions are measured from
+the center:
+
+    >>> from unties.properties import conduction
+    >>> x = units_array(np.linspace(0, 1, 3), cm)
+    >>> t = units_array(np.array([60, 600, 6000]), s)
+    >>> conduction.plane_wall_theta(x, t, 1 * cm, 1e-7 * m**2 / s, 2)
+    array([[9.98680743e-01, 5.87587853e-01, 1.12076861e-03],
+           [9.63955646e-01, 5.04541757e-01, 9.62192442e-04],
+           [6.20906454e-01, 2.78676481e-01, 5.31337423e-04]])
+
+The result has one row per position and one column per time. Positions and
+times can have any shape; the result's shape is x.shape + t.shape. Q / Q0 only
+depends on time:
+
+    >>> conduction.plane_wall_Q_ratio(t, 1 * cm, 1e-7 * m**2 / s, 2)
+    array([0.08684855, 0.51949486, 0.99908363])
+
+Or, to use dimensionless positions (x / L) and Fourier numbers
+(alpha * t / L**2), use an underline before the function name:
+
+    >>> conduction._plane_wall_theta(0, 0.6, 2)
+    0.587587853010055
+
+
+## Truncation
+
+Terms are added until they are smaller than `tol` everywhere on the grid
+(which depends on the smallest Fourier number), up to `N_max` terms. Close to
+t = 0 the series converges slowly, so it may stop at N_max there. The
+eigenvalues come from the cache in unties.properties.transcendentals, so
+repeated calls with the same Biot number don't solve for them again.
+"""
+
+# Imports ######################################################################
+import numpy as np
+from scipy.special import j0, j1
+from unties import *
+from unties.properties.transcendentals import _eigenvalues
+
+
+# Series terms #################################################################
+def _coefficients(shape, lam):
+    if shape == 'plane_wall':
+        return 4 * np.sin(lam) / (2 * lam + np.sin(2 * lam))
+    if shape == 'cylinder':
+        return 2 * j1(lam) / (lam * (j0(lam)**2 + j1(lam)**2))
+    return (4 * (np.sin(lam) - lam * np.cos(lam)) /
+            (2 * lam - np.sin(2 * lam)))
+
+
+def _profiles(shape, lam, x):
+    """Spatial part of each term, with a last axis for the terms"""
+    lam_x = lam * np.asarray(x, dtype=float)[..., np.newaxis]
+    if shape == 'plane_wall':
+        return np.cos(lam_x)
+    if shape == 'cylinder':
+        return j0(lam_x)
+    return np.sinc(lam_x / np.pi)
+
+
+def _Q_weights(shape, lam):
+    """The part of each term of Q / Q0 that isn't C_n or time"""
+    if shape == 'plane_wall':
+        return np.sin(lam) / lam
+    if shape == 'cylinder':
+        return 2 * j1(lam) / lam
+    return 3 * (np.sin(lam) - lam * np.cos(lam)) / lam**3
+
+
+def _terms(shape, Bi, Fo, tol, N_max):
+    """Eigenvalues and coefficients of the terms needed for Fourier numbers Fo
+
+    The bound on each term is |C_n| * exp(-lam_n**2 * min(Fo)), since the
+    spatial parts are never bigger than 1.
+    """
+    Fo_min = np.min(Fo)
+    N = min(16, N_max)
+    while True:
+        lam = _eigenvalues(shape, float(Bi), N)
+        C = _coefficients(shape, lam)
+        small = np.nonzero(np.abs(C) * np.exp(-lam**2 * Fo_min) < tol)[0]
+        if len(small):
+            return lam[:small[0] + 1], C[:small[0] + 1]
+        if N >= N_max:
+            return lam, C
+        N = min(2 * N, N_max)
+
+
+def _theta(shape, x, Fo, Bi, tol, N_max):
+    Fo = np.asarray(Fo, dtype=float)
+    lam, C = _terms(shape, Bi, Fo, tol, N_max)
+    decay = np.exp(-np.multiply.outer(lam**2, Fo))
+    profiles = _profiles(shape, lam, x)
+    return np.tensordot(profiles * C, decay, axes=1)[()]
+
+
+def _Q_ratio(shape, Fo, Bi, tol, N_max):
+    Fo = np.asarray(Fo, dtype=float)
+    lam, C = _terms(shape, Bi, Fo, tol, N_max)
+    decay = np.exp(-np.multiply.outer(lam**2, Fo))
+    return (1 - np.tensordot(C * _Q_weights(shape, lam), decay, axes=1))[()]
+
+
+# Functions Without Units ######################################################
+def _plane_wall_theta(x, Fo, Bi, tol=1e-8, N_max=1000):
+    """theta at positions x / L and Fourier numbers alpha * t / L**2"""
+    return _theta('plane_wall', x, Fo, Bi, tol, N_max)
+
+
+def _cylinder_theta(r, Fo, Bi, tol=1e-8, N_max=1000):
+    """theta at radii r / ro and Fourier numbers alpha * t / ro**2"""
+    return _theta('cylinder', r, Fo, Bi, tol, N_max)
+
+
+def _sphere_theta(r, Fo, Bi, tol=1e-8, N_max=1000):
+    """theta at radii r / ro and Fourier numbers alpha * t / ro**2"""
+    return _theta('sphere', r, Fo, Bi, tol, N_max)
+
+
+def _plane_wall_Q_ratio(Fo, Bi, tol=1e-8, N_max=1000):
+    """Q / Q0 at Fourier numbers alpha * t / L**2"""
+    return _Q_ratio('plane_wall', Fo, Bi, tol, N_max)
+
+
+def _cylinder_Q_ratio(Fo, Bi, tol=1e-8, N_max=1000):
+    """Q / Q0 at Fourier numbers alpha * t / ro**2"""
+    return _Q_ratio('cylinder', Fo, Bi, tol, N_max)
+
+
+def _sphere_Q_ratio(Fo, Bi, tol=1e-8, N_max=1000):
+    """Q / Q0 at Fourier numbers alpha * t / ro**2"""
+    return _Q_ratio('sphere', Fo, Bi, tol, N_max)
+
+
+# Functions With Units #########################################################
+def _dimensionless(quantity):
+    """Plain number(s) from a dimensionless units_group, or a plain number"""
+    if hasattr(quantity, 'value'):
+        return magnitudes_of(quantity, m / m)
+    return quantity
+
+
+def _Fo(t, L, alpha):
+    return magnitudes_of(alpha * t / L**2, m / m)
+
+
+def plane_wall_theta(x, t, L, alpha, Bi, tol=1e-8, N_max=1000):
+    """theta at distances x from the center of a wall of half thickness L"""
+    return _plane_wall_theta(magnitudes_of(x / L, m / m), _Fo(t, L, alpha),
+                             _dimensionless(Bi), tol, N_max)
+
+
+def cylinder_theta(r, t, ro, alpha, Bi, tol=1e-8, N_max=1000):
+    """theta at radii r of a cylinder with outer radius ro"""
+    return _cylinder_theta(magnitudes_of(r / ro, m / m), _Fo(t, ro, alpha),
+                           _dimensionless(Bi), tol, N_max)
+
+
+def sphere_theta(r, t, ro, alpha, Bi, tol=1e-8, N_max=1000):
+    """theta at radii r of a sphere with outer radius ro"""
+    return _sphere_theta(magnitudes_of(r / ro, m / m), _Fo(t, ro, alpha),
+                         _dimensionless(Bi), tol, N_max)
+
+
+def plane_wall_Q_ratio(t, L, alpha, Bi, tol=1e-8, N_max=1000):
+    """Q / Q0 of a wall of half thickness L"""
+    return _plane_wall_Q_ratio(_Fo(t, L, alpha), _dimensionless(Bi), tol,
+                               N_max)
+
+
+def cylinder_Q_ratio(t, ro, alpha, Bi, tol=1e-8, N_max=1000):
+    """Q / Q0 of a cylinder with outer radius ro"""
+    return _cylinder_Q_ratio(_Fo(t, ro, alpha), _dimensionless(Bi), tol,
+                             N_max)
+
+
+def sphere_Q_ratio(t, ro, alpha, Bi, tol=1e-8, N_max=1000):
+    """Q / Q0 of a sphere with outer radius ro"""
+    return _sphere_Q_ratio(_Fo(t, ro, alpha), _dimensionless(Bi), tol, N_max)
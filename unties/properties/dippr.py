@@ -0,0 +1,306 @@
+"""Forms of the DIPPR temperature correlations
+
+
+## Intro
+
+The fluid modules (water, benzene, air) type out their own coefficients. The
+pieces that only depend on the form of a correlation (and not on the fluid)
+live here. They all take plain numbers or numpy arrays, and a tuple of the
+correlation's coefficients:
+
+    >>> from unties.properties import dippr, water
+    >>> dippr.eq101(373.15, water._liquid_vapor_pressure_coefs)
+    101260.56298096626
+
+
+Coefficient tuples can be shorter than the form needs; the missing ones are
+zero.
+
+
+## Forms
+
+    eq100    A + B*T + C*T**2 + D*T**3 + ...                  polynomial
+    eq101    exp(A + B/T + C*ln(T) + D*T**E)                  vapor pressure
+    eq102    A*T**B / (1 + C/T + D/T**2)                      vapor viscosity
+    eq104    A + B/T + C/T**3 + D/T**8 + E/T**9               second virial
+    eq105    A / B**(1 + (1 - T/C)**D)                        liquid density
+    eq106    A*(1 - Tr)**(B + C*Tr + D*Tr**2 + E*Tr**3)       heat of vap.
+    eq107    A + B*(C/T/sinh(C/T))**2 + D*(E/T/cosh(E/T))**2  Aly-Lee Cp
+    eq119    A + B*t**(1/3) + C*t**(2/3) + ... + G*t**(110/3) water density
+    eq127    A + B*x**2*exp(x)/(exp(x) - 1)**2 + ..., x = C/T Planck-Einstein
+
+where Tr = T/Tc and t = 1 - T/Tc.
+
+Each form has a `_dT` companion with the exact derivative with respect to T.
+The heat capacity forms (eq100, eq107, eq127) also have exact integrals from T1
+to T2, of the form itself (`_integral`, for enthalpy changes) and of the form
+divided by T (`_integral_over_T`, for entropy changes):
+
+    >>> dippr.eq100_integral(300, 400, (1, 2))
+    70100.0
+"""
+
+# Imports ######################################################################
+import numpy as np
+
+
+def _padded(coefs, n):
+    """Fill in missing coefficients with zeros"""
+    return tuple(coefs) + (0,) * (n - len(coefs))
+
+
+# Equation 100 #################################################################
+def eq100(T, coefs):
+    """A + B*T + C*T**2 + D*T**3 + ..."""
+    return sum(c * T**i for i, c in enumerate(coefs))
+
+
+def eq100_dT(T, coefs):
+    return sum(i * c * T**(i - 1) for i, c in enumerate(coefs) if i)
+
+
+def eq100_integral(T1, T2, coefs):
+    return sum(c * (T2**(i + 1) - T1**(i + 1)) / (i + 1)
+               for i, c in enumerate(coefs))
+
+
+def eq100_integral_over_T(T1, T2, coefs):
+    A, *rest = coefs
+    return A * np.log(T2 / T1) + sum(c * (T2**i - T1**i) / i
+                                     for i, c in enumerate(rest, 1))
+
+
+# Equation 101 #################################################################
+def eq101(T, coefs):
+    """exp(A + B/T + C*ln(T) + D*T**E)"""
+    A, B, C, D, E = _padded(coefs, 5)
+    return np.exp(A + B / T + C * np.log(T) + D * T**E)
+
+
+def eq101_dlnT(T, coefs):
+    """d(ln(eq101))/dT"""
+    A, B, C, D, E = _padded(coefs, 5)
+    return -B / T**2 + C / T + D * E * T**(E - 1)
+
+
+def eq101_dT(T, coefs):
+    return eq101(T, coefs) * eq101_dlnT(T, coefs)
+
+
+def eq101_table(coefs, T_min, T_max, n=64):
+    """Tabulate T against ln(eq101), to seed eq101_inverse.
+
+    The points are evenly spaced in 1/T, where ln(eq101) is nearly linear.
+    """
+    T = 1 / np.linspace(1 / T_min, 1 / T_max, n)
+    return np.log(eq101(T, coefs)), T
+
+
+def eq101_inverse(P, coefs, T_min, T_max, table=None, tol=1e-12, maxiter=50):
+    """Solve eq101(T) = P for T, for a number or an array of P.
+
+    Uses Newton's method on ln(P), kept inside a bracket that starts as
+    [T_min, T_max] and shrinks every iteration, so it can't wander off where
+    the correlation isn't monotonic. Newton steps that leave the bracket are
+    replaced by bisection. Values of P outside the range of the correlation
+    give T_min or T_max.
+
+    The first guess comes from `table` (see eq101_table) if it is given,
+    otherwise from a straight line in ln(P) vs 1/T between the ends.
+    """
+    ln_P = np.log(np.asarray(P, dtype=float))
+    lo = np.full(ln_P.shape, float(T_min))
+    hi = np.full(ln_P.shape, float(T_max))
+    if table is None:
+        ln_P_min, ln_P_max = np.log(eq101(np.array([T_min, T_max]), coefs))
+        fraction = (ln_P - ln_P_min) / (ln_P_max - ln_P_min)
+        T = 1 / (1 / T_min + fraction * (1 / T_max - 1 / T_min))
+    else:
+        T = np.interp(ln_P, *table)
+    T = np.clip(T, lo, hi)
+
+    A, B, C, D, E = _padded(coefs, 5)
+    for _ in range(maxiter):
+        error = A + B / T + C * np.log(T) + D * T**E - ln_P
+        lo = np.where(error < 0, T, lo)
+        hi = np.where(error > 0, T, hi)
+        step = error / eq101_dlnT(T, coefs)
+        new_T = T - step
+        outside = ~((new_T > lo) & (new_T < hi))
+        new_T = np.where(outside, (lo + hi) / 2, new_T)
+        done = np.abs(new_T - T) <= tol * T
+        T = new_T
+        if np.all(done):
+            break
+    return T[()]
+
+
+# Equation 102 #################################################################
+def eq102(T, coefs):
+    """A*T**B / (1 + C/T + D/T**2)"""
+    A, B, C, D = _padded(coefs, 4)
+    return A * T**B / (1 + C / T + D / T**2)
+
+
+def eq102_dT(T, coefs):
+    A, B, C, D = _padded(coefs, 4)
+    denominator = 1 + C / T + D / T**2
+    d_denominator = -C / T**2 - 2 * D / T**3
+    return eq102(T, coefs) * (B / T - d_denominator / denominator)
+
+
+# Equation 104 #################################################################
+def eq104(T, coefs):
+    """A + B/T + C/T**3 + D/T**8 + E/T**9"""
+    A, B, C, D, E = _padded(coefs, 5)
+    return A + B / T + C / T**3 + D / T**8 + E / T**9
+
+
+def eq104_dT(T, coefs):
+    A, B, C, D, E = _padded(coefs, 5)
+    return -B / T**2 - 3 * C / T**4 - 8 * D / T**9 - 9 * E / T**10
+
+
+# Equation 105 #################################################################
+def eq105(T, coefs):
+    """A / B**(1 + (1 - T/C)**D)"""
+    A, B, C, D = _padded(coefs, 4)
+    return A / B**(1 + (1 - T / C)**D)
+
+
+def eq105_dT(T, coefs):
+    A, B, C, D = _padded(coefs, 4)
+    return eq105(T, coefs) * np.log(B) * D * (1 - T / C)**(D - 1) / C
+
+
+# Equation 106 #################################################################
+def eq106(T, coefs, Tc):
+    """A*(1 - Tr)**(B + C*Tr + D*Tr**2 + E*Tr**3)"""
+    A, B, C, D, E = _padded(coefs, 5)
+    Tr = T / Tc
+    return A * (1 - Tr)**(B + C * Tr + D * Tr**2 + E * Tr**3)
+
+
+def eq106_dT(T, coefs, Tc):
+    A, B, C, D, E = _padded(coefs, 5)
+    Tr = T / Tc
+    power = B + C * Tr + D * Tr**2 + E * Tr**3
+    d_power = (C + 2 * D * Tr + 3 * E * Tr**2) / Tc
+    return eq106(T, coefs, Tc) * (d_power * np.log(1 - Tr) - power / (Tc - T))
+
+
+# Equation 107 #################################################################
+def eq107(T, coefs):
+    """A + B*(C/T/sinh(C/T))**2 + D*(E/T/cosh(E/T))**2"""
+    A, B, C, D, E = _padded(coefs, 5)
+    return A + B * (C/T / np.sinh(C/T))**2 + D * (E/T / np.cosh(E/T))**2
+
+
+def eq107_dT(T, coefs):
+    A, B, C, D, E = _padded(coefs, 5)
+    x, y = C / T, E / T
+    # d/dT of (x/sinh(x))**2 and (y/cosh(y))**2, with dx/dT = -x/T
+    d_sinh = 2 * x / np.sinh(x) * (x * np.cosh(x) - np.sinh(x)) / np.sinh(x)**2
+    d_cosh = 2 * y / np.cosh(y) * (y * np.sinh(y) - np.cosh(y)) / np.cosh(y)**2
+    return (B * d_sinh * x + D * d_cosh * y) / T
+
+
+def _log_sinh(x):
+    """ln(|sinh(x)|), without overflow for big x"""
+    x = np.abs(x)
+    return x + np.log1p(-np.exp(-2 * x)) - np.log(2)
+
+
+def _log_cosh(x):
+    """ln(cosh(x)), without overflow for big x"""
+    x = np.abs(x)
+    return x + np.log1p(np.exp(-2 * x)) - np.log(2)
+
+
+def _eq107_antiderivative(T, coefs):
+    A, B, C, D, E = _padded(coefs, 5)
+    return A * T + B * C / np.tanh(C / T) - D * E * np.tanh(E / T)
+
+
+def _eq107_antiderivative_over_T(T, coefs):
+    A, B, C, D, E = _padded(coefs, 5)
+    x, y = C / T, E / T
+    return (A * np.log(T) + B * (x / np.tanh(x) - _log_sinh(x)) -
+            D * (y * np.tanh(y) - _log_cosh(y)))
+
+
+def eq107_integral(T1, T2, coefs):
+    return _eq107_antiderivative(T2, coefs) - _eq107_antiderivative(T1, coefs)
+
+
+def eq107_integral_over_T(T1, T2, coefs):
+    return (_eq107_antiderivative_over_T(T2, coefs) -
+            _eq107_antiderivative_over_T(T1, coefs))
+
+
+# Equation 119 #################################################################
+_eq119_powers = (0, 1 / 3, 2 / 3, 5 / 3, 16 / 3, 43 / 3, 110 / 3)
+
+
+def eq119(T, coefs, Tc):
+    """A + B*t**(1/3) + C*t**(2/3) + D*t**(5/3) + E*t**(16/3) + ..."""
+    t = 1 - T / Tc
+    return sum(c * t**p for c, p in zip(_padded(coefs, 7), _eq119_powers))
+
+
+def eq119_dT(T, coefs, Tc):
+    t = 1 - T / Tc
+    return sum(-c * p * t**(p - 1) / Tc
+               for c, p in zip(_padded(coefs, 7), _eq119_powers) if p)
+
+
+# Equation 127 #################################################################
+def _planck_einstein(x):
+    """x**2*exp(x)/(exp(x) - 1)**2"""
+    return x**2 * np.exp(x) / np.expm1(x)**2
+
+
+def _planck_einstein_dx(x):
+    return _planck_einstein(x) * (2 / x + 1 - 2 * np.exp(x) / np.expm1(x))
+
+
+def eq127(T, coefs):
+    """A + B*(C/T)**2*exp(C/T)/(exp(C/T) - 1)**2 + D*(E/T)**2*... + ..."""
+    A, B, C, D, E, F, G = _padded(coefs, 7)
+    return (A + B * _planck_einstein(C / T) + D * _planck_einstein(E / T) +
+            F * _planck_einstein(G / T))
+
+
+def eq127_dT(T, coefs):
+    A, B, C, D, E, F, G = _padded(coefs, 7)
+    # dx/dT = -x/T
+    return -(B * _planck_einstein_dx(C / T) * C +
+             D * _planck_einstein_dx(E / T) * E +
+             F * _planck_einstein_dx(G / T) * G) / T**2
+
+
+def _eq127_antiderivative(T, coefs):
+    A, B, C, D, E, F, G = _padded(coefs, 7)
+    # d/dT of C/(exp(C/T) - 1) is B's term of eq127, etc.
+    return (A * T + B * C / np.expm1(C / T) + D * E / np.expm1(E / T) +
+            F * G / np.expm1(G / T))
+
+
+def _eq127_antiderivative_over_T(T, coefs):
+    A, B, C, D, E, F, G = _padded(coefs, 7)
+
+    def term(x):
+        # ln(|1 - exp(-x)|), since C, E or G may be negative
+        return x / np.expm1(x) - np.log(np.abs(np.expm1(-x)))
+
+    return (A * np.log(T) + B * term(C / T) + D * term(E / T) +
+            F * term(G / T))
+
+
+def eq127_integral(T1, T2, coefs):
+    return _eq127_antiderivative(T2, coefs) - _eq127_antiderivative(T1, coefs)
+
+
+def eq127_integral_over_T(T1, T2, coefs):
+    return (_eq127_antiderivative_over_T(T2, coefs) -
+            _eq127_antiderivative_over_T(T1, coefs))
@@ -0,0 +1,201 @@
+"""Effectiveness-NTU method for solving heat exchangers
+
+NTU = UA / Cmin
+Cr = Cmin / Cmax
+eff = q / qmax = q / (Cmin * (Thi - Tci))
+
+Arrangements:
+    counterflow
+    parallel
+    shell_and_tube      1 shell pass and 2, 4, ... tube passes (or `shells`
+                        shells in series, with NTU split evenly between them)
+    cross_unmixed       both fluids unmixed (approximate formula)
+    cross_Cmax_mixed    Cmax mixed, Cmin unmixed
+    cross_Cmin_mixed    Cmin mixed, Cmax unmixed
+
+The underscore functions take and return dimensionless numbers or numpy arrays,
+which broadcast together:
+
+    >>> _counterflow(np.array([0.5, 1, 2]), 0.5)
+    array([0.36226557, 0.5647334 , 0.77460033])
+    >>> _counterflow_NTU(0.5647334, 0.5)
+    0.999999994857194
+
+The public functions take heat capacity rates (m_dot * cp) and UA as units (or
+quantity arrays):
+
+    >>> effectiveness('counterflow', 500 * W / K, 500 * W / K, 1000 * W / K)
+    0.5647334016064162
+    >>> UA('counterflow', 0.5647334016064162, 500 * W / K, 1000 * W / K)
+    500.0000000000002 * W / K
+
+Every arrangement has an inverse, NTU(eff). Where there is a closed form it is
+used; for cross_unmixed it is a vectorized bisection. Effectivenesses that an
+arrangement can't reach give nan.
+"""
+
+import numpy as np
+from unties import *
+
+_Cr_tol = 1e-9  # Cr below this uses the Cr = 0 limit, etc.
+
+
+# Effectiveness ################################################################
+def _counterflow(NTU, Cr):
+    NTU, Cr = np.broadcast_arrays(np.asarray(NTU, dtype=float), Cr)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        x = np.exp(-NTU * (1 - Cr))
+        other = (1 - x) / (1 - Cr * x)
+    return np.where(np.abs(1 - Cr) < _Cr_tol, NTU / (1 + NTU), other)[()]
+
+def _parallel(NTU, Cr):
+    return ((1 - np.exp(-NTU * (1 + Cr))) / (1 + Cr))[()]
+
+def _one_shell(NTU, Cr):
+    s = (1 + Cr**2)**0.5
+    x = np.exp(-NTU * s)
+    return 2 / (1 + Cr + s * (1 + x) / (1 - x))
+
+def _shell_and_tube(NTU, Cr, shells=1):
+    NTU, Cr = np.broadcast_arrays(np.asarray(NTU, dtype=float), Cr)
+    e1 = _one_shell(NTU / shells, Cr)
+    if shells == 1:
+        return e1[()]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = ((1 - e1 * Cr) / (1 - e1))**shells
+        other = (x - 1) / (x - Cr)
+    one = shells * e1 / (1 + (shells - 1) * e1)
+    return np.where(np.abs(1 - Cr) < _Cr_tol, one, other)[()]
+
+def _cross_unmixed(NTU, Cr):
+    NTU, Cr = np.broadcast_arrays(np.asarray(NTU, dtype=float), Cr)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        other = 1 - np.exp(NTU**0.22 / Cr * np.expm1(-Cr * NTU**0.78))
+    return np.where(Cr < _Cr_tol, -np.expm1(-NTU), other)[()]
+
+def _cross_Cmax_mixed(NTU, Cr):
+    NTU, Cr = np.broadcast_arrays(np.asarray(NTU, dtype=float), Cr)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        other = -np.expm1(Cr * np.expm1(-NTU)) / Cr
+    return np.where(Cr < _Cr_tol, -np.expm1(-NTU), other)[()]
+
+def _cross_Cmin_mixed(NTU, Cr):
+    NTU, Cr = np.broadcast_arrays(np.asarray(NTU, dtype=float), Cr)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        other = -np.expm1(np.expm1(-Cr * NTU) / Cr)
+    return np.where(Cr < _Cr_tol, -np.expm1(-NTU), other)[()]
+
+
+# NTU from effectiveness #######################################################
+def _counterflow_NTU(eff, Cr):
+    eff, Cr = np.broadcast_arrays(np.asarray(eff, dtype=float), Cr)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        one = eff / (1 - eff)
+        other = np.log((eff - 1) / (eff * Cr - 1)) / (Cr - 1)
+    return np.where(np.abs(1 - Cr) < _Cr_tol, one, other)[()]
+
+def _parallel_NTU(eff, Cr):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (-np.log1p(-eff * (1 + Cr)) / (1 + Cr))[()]
+
+def _one_shell_NTU(e1, Cr):
+    s = (1 + Cr**2)**0.5
+    E = (2 / e1 - (1 + Cr)) / s
+    return -np.log((E - 1) / (E + 1)) / s
+
+def _shell_and_tube_NTU(eff, Cr, shells=1):
+    eff, Cr = np.broadcast_arrays(np.asarray(eff, dtype=float), Cr)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = ((eff * Cr - 1) / (eff - 1))**(1 / shells)
+        one = eff / (shells - (shells - 1) * eff)
+        e1 = np.where(np.abs(1 - Cr) < _Cr_tol, one, (x - 1) / (x - Cr))
+        return (shells * _one_shell_NTU(e1, Cr))[()]
+
+def _cross_unmixed_NTU(eff, Cr, NTU_max=1e4, iterations=64):
+    """Bisection on log(NTU), all elements at once"""
+    eff, Cr = np.broadcast_arrays(np.asarray(eff, dtype=float), Cr)
+    lo = np.full(eff.shape, np.log(1e-12))
+    hi = np.full(eff.shape, np.log(NTU_max))
+    reachable = (eff > 0) & (eff < _cross_unmixed(NTU_max, Cr))
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        below = _cross_unmixed(np.exp(mid), Cr) < eff
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    return np.where(reachable, np.exp((lo + hi) / 2), np.nan)[()]
+
+def _cross_Cmax_mixed_NTU(eff, Cr):
+    eff, Cr = np.broadcast_arrays(np.asarray(eff, dtype=float), Cr)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        other = -np.log1p(np.log1p(-eff * Cr) / Cr)
+    return np.where(Cr < _Cr_tol, -np.log1p(-eff), other)[()]
+
+def _cross_Cmin_mixed_NTU(eff, Cr):
+    eff, Cr = np.broadcast_arrays(np.asarray(eff, dtype=float), Cr)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        other = -np.log1p(Cr * np.log1p(-eff)) / Cr
+    return np.where(Cr < _Cr_tol, -np.log1p(-eff), other)[()]
+
+
+# Functions With Units #########################################################
+_arrangements = {
+    'counterflow': (_counterflow, _counterflow_NTU),
+    'parallel': (_parallel, _parallel_NTU),
+    'shell_and_tube': (_shell_and_tube, _shell_and_tube_NTU),
+    'cross_unmixed': (_cross_unmixed, _cross_unmixed_NTU),
+    'cross_Cmax_mixed': (_cross_Cmax_mixed, _cross_Cmax_mixed_NTU),
+    'cross_Cmin_mixed': (_cross_Cmin_mixed, _cross_Cmin_mixed_NTU),
+}
+
+
+def _W_per_K(quantity):
+    if hasattr(quantity, 'value'):
+        return magnitudes_of(quantity, W / K)
+    return np.asarray(quantity, dtype=float)
+
+
+def _rates(C1, C2):
+    """Cmin (W / K) and Cr"""
+    C1, C2 = _W_per_K(C1), _W_per_K(C2)
+    Cmin = np.minimum(C1, C2)
+    return Cmin, Cmin / np.maximum(C1, C2)
+
+
+def _arrangement(name, inverse=False):
+    if name not in _arrangements:
+        raise ValueError('arrangement must be one of ' +
+                         ', '.join(_arrangements))
+    return _arrangements[name][inverse]
+
+
+def effectiveness(arrangement, UA, C1, C2, **kwargs):
+    """Effectiveness of an exchanger with heat capacity rates C1 and C2
+
+    kwargs go to the arrangement's function (like `shells` for
+    shell_and_tube).
+    """
+    Cmin, Cr = _rates(C1, C2)
+    return _arrangement(arrangement)(_W_per_K(UA) / Cmin, Cr, **kwargs)
+
+
+def UA(arrangement, eff, C1, C2, **kwargs):
+    """UA needed to reach an effectiveness eff"""
+    Cmin, Cr = _rates(C1, C2)
+    NTU = _arrangement(arrangement, inverse=True)(eff, Cr, **kwargs)
+    _UA = NTU * Cmin
+    if hasattr(_UA, 'shape') and _UA.shape:
+        return units_array(_UA, W / K)
+    return float(_UA) * W / K
+
+
+def heat_rate(arrangement, UA, C1, C2, Thi, Tci, **kwargs):
+    """Heat transferred from the hot fluid (in at Thi) to the cold (in at Tci)
+
+    C1 and C2 can be in either order.
+    """
+    Cmin, Cr = _rates(C1, C2)
+    eff = _arrangement(arrangement)(_W_per_K(UA) / Cmin, Cr, **kwargs)
+    q = eff * Cmin * (magnitudes_of(Thi, K) - magnitudes_of(Tci, K))
+    if hasattr(q, 'shape') and q.shape:
+        return units_array(q, W)
+    return float(q) * W
@@ -3,9 +3,21 @@ s - shell side
 t - tube side
 i - in
 o - out
+
+Temperatures can be numbers, numpy arrays, or units (including quantity arrays)
+of temperature. Arrays broadcast together, and give an array of F values.
 """
 
-from numpy import log10
+import numpy as np
+from unties import K
+from unties.unit_helpers import magnitudes_of
+
+_R_tol = 1e-6  # |R - 1| below this uses the R = 1 limit
+
+
+def _kelvins(*temperatures):
+    return [magnitudes_of(T, K) if hasattr(T, 'value') else
+            np.asarray(T, dtype=float) for T in temperatures]
 
 def _Rf(Tsi, Tso, Tti, Tto):
     return (Tsi - Tso) / (Tto - Tti)
@@ -13,25 +25,46 @@ def _Rf(Tsi, Tso, Tti, Tto):
 def _Pf(Tsi, Tti, Tto):
     return (Tto - Tti) / (Tsi - Tti)
 
+def _RP(Tsi, Tso, Tti, Tto):
+    Tsi, Tso, Tti, Tto = _kelvins(Tsi, Tso, Tti, Tto)
+    return _Rf(Tsi, Tso, Tti, Tto), _Pf(Tsi, Tti, Tto)
+
+def _F1(Rf, Pf):
+    """F for 1 shell and 2 tubes, from R and P"""
+    near_one = np.abs(Rf - 1) < _R_tol
+    sqrt = (Rf**2 + 1)**0.5
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log = np.log10((2 / Pf - 1 - Rf + sqrt) / (2 / Pf - 1 - Rf - sqrt))
+        one = sqrt * Pf / (np.log(10) * (1 - Pf) * log)
+        other = sqrt / (Rf - 1) * np.log10((1 - Pf) / (1 - Pf * Rf)) / log
+    return np.where(near_one, one, other)[()]
+
 def F1s2t(Tsi, Tso, Tti, Tto):
     """F for 1 shell and 2 tubes"""
-    Rf = _Rf(Tsi, Tso, Tti, Tto)
-    Pf = _Pf(Tsi, Tti, Tto)
-    sqrt = (Rf**2 + 1)**0.5
-    log = log10((2 / Pf - 1 - Rf + sqrt) / (2 / Pf - 1 - Rf - sqrt))
-    if Rf == 1:
-        return sqrt * Pf / (2.3 * (1 - Pf) * log)
-    else:
-        return sqrt / (Rf - 1) * log10((1 - Pf) / (1 - Pf * Rf)) / log
+    return _F1(*_RP(Tsi, Tso, Tti, Tto))
 
 def F2s4t(Tsi, Tso, Tti, Tto):
     """F for 2 shells and 4 tubes"""
-    Rf = _Rf(Tsi, Tso, Tti, Tto)
-    Pf = _Pf(Tsi, Tti, Tto)
+    Rf, Pf = _RP(Tsi, Tso, Tti, Tto)
+    near_one = np.abs(Rf - 1) < _R_tol
     sqrt = (Rf**2 + 1)**0.5
-    first = 2 / Pf - 1 - Rf + 2 / Pf * ((1 - Pf) * (1 - Pf * Rf))**0.5
-    log = log10((first + sqrt) / (first - sqrt))
-    if Rf == 1:
-        return sqrt * Pf / (4.6 * (1 - Pf) * log)
-    else:
-        return sqrt * log10((1 - Pf) / (1 - Pf * Rf)) / (2 * (Rf - 1) * log)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        first = 2 / Pf - 1 - Rf + 2 / Pf * ((1 - Pf) * (1 - Pf * Rf))**0.5
+        log = np.log10((first + sqrt) / (first - sqrt))
+        one = sqrt * Pf / (2 * np.log(10) * (1 - Pf) * log)
+        other = (sqrt * np.log10((1 - Pf) / (1 - Pf * Rf)) /
+                 (2 * (Rf - 1) * log))
+    return np.where(near_one, one, other)[()]
+
+def FNs2Nt(N, Tsi, Tso, Tti, Tto):
+    """F for N shells and 2N (or any multiple of 2N) tubes
+
+    Uses the P of one shell, found from the P of all N shells, in the one
+    shell formula.
+    """
+    Rf, Pf = _RP(Tsi, Tso, Tti, Tto)
+    near_one = np.abs(Rf - 1) < _R_tol
+    with np.errstate(divide='ignore', invalid='ignore'):
+        S = ((1 - Pf * Rf) / (1 - Pf))**(1 / N)
+        P1 = np.where(near_one, Pf / (N - (N - 1) * Pf), (S - 1) / (S - Rf))
+    return _F1(Rf, P1)
@@ -0,0 +1,178 @@
+"""Ideal mixtures of the fluids in unties.properties
+
+
+## Intro
+
+To use, make a mixture from some fluid modules:
+
+    >>> from unties.properties import water, benzene
+    >>> from unties.properties.mixture import IdealMixture
+    >>> mix = IdealMixture(water, benzene)
+
+Compositions are mole fractions, one row per stream and one column per
+component (in the order the components were given). Rows are normalized, so
+mole numbers work too. Temperatures are one per stream:
+
+    >>> x = np.array([[0.2, 0.8],
+    ...               [0.5, 0.5]])
+    >>> T = units_array(np.array([300, 350]), K)
+    >>> mix.bubble_pressure(x, T)
+    [11715.00615332 66566.61156797] * Pa
+
+Every correlation of every component is evaluated once for all the streams, so
+there are no python loops over streams or temperatures.
+
+Or, to get unitless values, use an underline before the method name:
+
+    >>> mix._bubble_pressure(x, [300, 350])
+    array([11715.00615332, 66566.61156797])
+
+
+## Mixing Rules
+
+    MW                       mole fraction average
+    ideal_gas_heat_capacity  mole fraction average
+    liquid_density           ideal solution (mole fraction average of volumes)
+    bubble_pressure          Raoult's law
+    vapor_composition        Raoult's law
+    pseudo_critical          Kay's rule (mole fraction average of Tc and Pc)
+
+
+## Ranges
+
+The `ranged` argument is passed to the correlations of each component, so the
+range test fails if any temperature is out of range for any component.
+"""
+
+# Imports ######################################################################
+import numpy as np
+from unties import *
+
+
+class IdealMixture:
+    """Ideal mixture of fluid modules (water, benzene, air, etc).
+
+    The underscore methods take and return plain numbers (in the same units as
+    the fluid modules). The public methods take and return units.
+
+    Public methods: MW, pseudo_critical, ideal_gas_heat_capacity,
+    liquid_density, bubble_pressure, vapor_composition, properties
+    """
+    def __init__(self, *components):
+        self.components = components
+        self._MWs = np.array([c._MW for c in components])  # kg / mol
+        self._Tcs = np.array([c._Tc for c in components])  # K
+        self._Pcs = np.array([c._Pc for c in components])  # Pa
+
+    def _fractions(self, x):
+        x = np.asarray(x, dtype=float)
+        if x.shape[-1] != len(self.components):
+            raise ValueError('Composition needs one column per component')
+        return x / x.sum(axis=-1, keepdims=True)
+
+    def _each(self, name, _T, ranged):
+        """Evaluate correlation `name` of every component at every _T.
+
+        Returns an array with an extra last axis, one entry per component.
+        """
+        _T = np.asarray(_T, dtype=float)[..., np.newaxis]
+        return np.concatenate([
+            np.broadcast_to(getattr(c, name)(_T, ranged), _T.shape)
+            for c in self.components
+        ], axis=-1)
+
+    def _MW(self, x):
+        """kg / mol"""
+        return self._fractions(x) @ self._MWs
+
+    def _pseudo_critical(self, x):
+        """K, Pa"""
+        x = self._fractions(x)
+        return x @ self._Tcs, x @ self._Pcs
+
+    def _ideal_gas_heat_capacity(self, x, _T, ranged=True):
+        """J / (mol * K)"""
+        each = self._each('_ideal_gas_heat_capacity', _T, ranged)
+        return (self._fractions(x) * each).sum(axis=-1)
+
+    def _liquid_density(self, x, _T, ranged=True):
+        """mol / m**3"""
+        each = self._each('_liquid_density', _T, ranged)
+        return 1 / (self._fractions(x) / each).sum(axis=-1)
+
+    def _bubble_pressure(self, x, _T, ranged=True):
+        """Pa"""
+        each = self._each('_liquid_vapor_pressure', _T, ranged)
+        return (self._fractions(x) * each).sum(axis=-1)
+
+    def _vapor_composition(self, x, _T, ranged=True):
+        """(m/m)"""
+        partial = self._fractions(x) * self._each('_liquid_vapor_pressure',
+                                                  _T, ranged)
+        return partial / partial.sum(axis=-1, keepdims=True)
+
+    def _properties(self, x, _T, ranged=True):
+        """All the mixture properties at once, as a dict of plain numbers.
+
+        Each correlation is evaluated only once, even when it is used by
+        more than one property.
+        """
+        x = self._fractions(x)
+        partial = x * self._each('_liquid_vapor_pressure', _T, ranged)
+        bubble_pressure = partial.sum(axis=-1)
+        Tpc, Ppc = x @ self._Tcs, x @ self._Pcs
+        cps = self._each('_ideal_gas_heat_capacity', _T, ranged)
+        densities = self._each('_liquid_density', _T, ranged)
+        return {
+            'MW': x @ self._MWs,
+            'Tpc': Tpc,
+            'Ppc': Ppc,
+            'ideal_gas_heat_capacity': (x * cps).sum(axis=-1),
+            'liquid_density': 1 / (x / densities).sum(axis=-1),
+            'bubble_pressure': bubble_pressure,
+            'vapor_composition': partial / bubble_pressure[..., np.newaxis],
+        }
+
+    def MW(self, x):
+        """Molar mass of each stream"""
+        return units_array(self._MW(x), kg / mol)
+
+    def pseudo_critical(self, x):
+        """Pseudo-critical temperature and pressure of each stream"""
+        Tpc, Ppc = self._pseudo_critical(x)
+        return units_array(Tpc, K), units_array(Ppc, Pa)
+
+    def ideal_gas_heat_capacity(self, x, T, ranged=True):
+        """Ideal gas heat capacity of each stream"""
+        _T = magnitudes_of(T, K)
+        return units_array(self._ideal_gas_heat_capacity(x, _T, ranged),
+                           J / (mol * K))
+
+    def liquid_density(self, x, T, ranged=True):
+        """Liquid molar density of each stream"""
+        _T = magnitudes_of(T, K)
+        return units_array(self._liquid_density(x, _T, ranged), mol / m**3)
+
+    def bubble_pressure(self, x, T, ranged=True):
+        """Bubble point pressure of each stream"""
+        _T = magnitudes_of(T, K)
+        return units_array(self._bubble_pressure(x, _T, ranged), Pa)
+
+    def vapor_composition(self, x, T, ranged=True):
+        """Mole fractions of the first bubble of vapor of each stream"""
+        return self._vapor_composition(x, magnitudes_of(T, K), ranged)
+
+    def properties(self, x, T, ranged=True):
+        """All the mixture properties at once, as a dict of units"""
+        props = self._properties(x, magnitudes_of(T, K), ranged)
+        units = {
+            'MW': kg / mol,
+            'Tpc': K,
+            'Ppc': Pa,
+            'ideal_gas_heat_capacity': J / (mol * K),
+            'liquid_density': mol / m**3,
+            'bubble_pressure': Pa,
+        }
+        for key in units:
+            props[key] = units_array(props[key], units[key])
+        return props
@@ -0,0 +1,311 @@
+"""Steam and liquid water properties from IAPWS-IF97, regions 1, 2 and 4
+
+
+## Intro
+
+To use, do:
+
+    >>> from unties.properties import steam
+    >>> print(steam.enthalpy(300 * K, 3 * MPa))
+    115331.27302143915 * J / kg
+
+Or, to get unitless values, use an underline before the function name:
+
+    >>> steam._volume(300, 3e6)
+    0.001002151679686694
+
+Temperatures are in K, pressures in Pa, and arrays of temperatures and
+pressures broadcast together. Each (T, P) point uses the region it is in:
+
+    region 1    compressed liquid   273.15 K <= T <= 623.15 K, P >= Psat(T)
+    region 2    superheated vapor   P < Psat(T) up to 623.15 K, P below the
+                                    region 2-3 boundary up to 863.15 K, and
+                                    any P from there to 1073.15 K
+    region 4    saturation          sat_pressure(T) and sat_temp(P)
+
+Points in region 3 (near the critical point) give nan. Pressures must be
+between 0 and 100 MPa.
+
+To get all of the properties at once, which is faster than asking for each
+one:
+
+    >>> props = steam.properties(units_array(np.array([300., 700]), K),
+    ...                          0.0035 * MPa)
+    >>> props['volume']
+    [39.49138664 92.30158982] * m**3.0 / kg
+
+The saturated liquid and vapor at a temperature come from
+`saturated_properties(T)`.
+
+
+## Data Lists
+
+Available Functions of T and P:
+    _volume
+    _density
+    _enthalpy
+    _entropy
+    _heat_capacity
+    _properties (not as a function with units; see properties)
+
+Available Saturation Functions:
+    _sat_pressure
+    _sat_temp
+    _saturated_properties (not as a function with units; see
+                           saturated_properties)
+"""
+
+# Imports ######################################################################
+import numpy as np
+from unties import *
+from unties.utilities.utilities import OutOfRangeTest, function_strings
+from unties.properties.water import _Tc, _Pc, _MW
+
+
+# Constants ####################################################################
+_R = 461.526  # J / (kg * K), IF97's value of Rc / _MW
+
+# Region 1
+_I1 = np.array([0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3,
+                3, 4, 4, 4, 5, 8, 8, 21, 23, 29, 30, 31, 32])
+_J1 = np.array([-2, -1, 0, 1, 2, 3, 4, 5, -9, -7, -1, 0, 1, 3, -3, 0, 1, 3, 17,
+                -4, 0, 6, -5, -2, 10, -8, -11, -6, -29, -31, -38, -39, -40,
+                -41])
+_n1 = np.array([
+    0.14632971213167, -0.84548187169114, -0.37563603672040e1,
+    0.33855169168385e1, -0.95791963387872, 0.15772038513228,
+    -0.16616417199501e-1, 0.81214629983568e-3, 0.28319080123804e-3,
+    -0.60706301565874e-3, -0.18990068218419e-1, -0.32529748770505e-1,
+    -0.21841717175414e-1, -0.52838357969930e-4, -0.47184321073267e-3,
+    -0.30001780793026e-3, 0.47661393906987e-4, -0.44141845330846e-5,
+    -0.72694996297594e-15, -0.31679644845054e-4, -0.28270797985312e-5,
+    -0.85205128120103e-9, -0.22425281908000e-5, -0.65171222895601e-6,
+    -0.14341729937924e-12, -0.40516996860117e-6, -0.12734301741641e-8,
+    -0.17424871230634e-9, -0.68762131295531e-18, 0.14478307828521e-19,
+    0.26335781662795e-22, -0.11947622640071e-22, 0.18228094581404e-23,
+    -0.93537087292458e-25])
+_P1_star = 16.53e6  # Pa
+_T1_star = 1386  # K
+
+# Region 2, ideal gas part
+_J0 = np.array([0, 1, -5, -4, -3, -2, -1, 2, 3])
+_n0 = np.array([
+    -0.96927686500217e1, 0.10086655968018e2, -0.56087911283020e-2,
+    0.71452738081455e-1, -0.40710498223928, 0.14240819171444e1,
+    -0.43839511319450e1, -0.28408632460772, 0.21268463753307e-1])
+
+# Region 2, residual part
+_Ir = np.array([1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4, 5, 6, 6,
+                6, 7, 7, 7, 8, 8, 9, 10, 10, 10, 16, 16, 18, 20, 20, 20, 21,
+                22, 23, 24, 24, 24])
+_Jr = np.array([0, 1, 2, 3, 6, 1, 2, 4, 7, 36, 0, 1, 3, 6, 35, 1, 2, 3, 7, 3,
+                16, 35, 0, 11, 25, 8, 36, 13, 4, 10, 14, 29, 50, 57, 20, 35,
+                48, 21, 53, 39, 26, 40, 58])
+_nr = np.array([
+    -0.17731742473213e-2, -0.17834862292358e-1, -0.45996013696365e-1,
+    -0.57581259083432e-1, -0.50325278727930e-1, -0.33032641670203e-4,
+    -0.18948987516315e-3, -0.39392777243355e-2, -0.43797295650573e-1,
+    -0.26674547914087e-4, 0.20481737692309e-7, 0.43870667284435e-6,
+    -0.32277677238570e-4, -0.15033924542148e-2, -0.40668253562649e-1,
+    -0.78847309559367e-9, 0.12790717852285e-7, 0.48225372718507e-6,
+    0.22922076337661e-5, -0.16714766451061e-10, -0.21171472321355e-2,
+    -0.23895741934104e2, -0.59059564324270e-17, -0.12621808899101e-5,
+    -0.38946842435739e-1, 0.11256211360459e-10, -0.82311340897998e1,
+    0.19809712802088e-7, 0.10406965210174e-18, -0.10234747095929e-12,
+    -0.10018179379511e-8, -0.80882908646985e-10, 0.10693031879409,
+    -0.33662250574171, 0.89185845355421e-24, 0.30629316876232e-12,
+    -0.42002467698208e-5, -0.59056029685639e-25, 0.37826947613457e-5,
+    -0.12768608934681e-14, 0.73087610595061e-28, 0.55414715350778e-16,
+    -0.94369707241210e-6])
+_P2_star = 1e6  # Pa
+_T2_star = 540  # K
+
+# Region 4
+_n4 = (0.11670521452767e4, -0.72421316703206e6, -0.17073846940092e2,
+       0.12020824702470e5, -0.32325550322333e7, 0.14915108613530e2,
+       -0.48232657361591e4, 0.40511340542057e6, -0.23855557567849,
+       0.65017534844798e3)
+
+# Boundary between regions 2 and 3
+_n23 = 0.34805185628969e3, -0.11671859879975e1, 0.10192970039326e-2
+
+_T_min = 273.15  # K
+_T_13 = 623.15  # K, highest temperature of region 1
+_T_23 = 863.15  # K, region 3 is below the 2-3 boundary up to here
+_T_max = 1073.15  # K
+_P_max = 100e6  # Pa
+
+
+# Region 4 Without Units #######################################################
+def _sat_pressure(_T, ranged=True):
+    """Pa"""
+    OutOfRangeTest(_T, _T_min, _Tc, ranged)
+    n1, n2, n3, n4, n5, n6, n7, n8, n9, n10 = _n4
+    theta = _T + n9 / (_T - n10)
+    A = theta**2 + n1 * theta + n2
+    B = n3 * theta**2 + n4 * theta + n5
+    C = n6 * theta**2 + n7 * theta + n8
+    return (2 * C / (-B + (B**2 - 4 * A * C)**0.5))**4 * 1e6
+
+def _sat_temp(_P, ranged=True):
+    """K"""
+    OutOfRangeTest(_P, _sat_pressure(_T_min), _Pc, ranged)
+    n1, n2, n3, n4, n5, n6, n7, n8, n9, n10 = _n4
+    beta = (_P / 1e6)**0.25
+    E = beta**2 + n3 * beta + n6
+    F = n1 * beta**2 + n4 * beta + n7
+    G = n2 * beta**2 + n5 * beta + n8
+    D = 2 * G / (-F - (F**2 - 4 * E * G)**0.5)
+    return (n10 + D - ((n10 + D)**2 - 4 * (n9 + n10 * D))**0.5) / 2
+
+
+# Regions 1 and 2 Without Units ################################################
+def _B23_pressure(_T):
+    n1, n2, n3 = _n23
+    return (n1 + n2 * _T + n3 * _T**2) * 1e6
+
+def _region(_T, _P):
+    """1 or 2 for each point, or 0 in region 3"""
+    _T, _P = np.broadcast_arrays(np.asarray(_T, dtype=float),
+                                 np.asarray(_P, dtype=float))
+    with np.errstate(invalid='ignore'):
+        Ps = _sat_pressure(np.minimum(_T, _T_13), False)
+    liquid = (_T <= _T_13) & (_P >= Ps)
+    region_3 = (_T > _T_13) & (_T <= _T_23) & (_P > _B23_pressure(_T))
+    return np.where(liquid, 1, np.where(region_3, 0, 2))
+
+def _gamma_1(_T, _P):
+    """Region 1's dimensionless Gibbs energy and its derivatives"""
+    pi = 7.1 - _P[..., np.newaxis] / _P1_star
+    tau = _T1_star / _T[..., np.newaxis] - 1.222
+    pi_I = pi**_I1
+    tau_J = tau**_J1
+    g_p = (-_n1 * _I1 * pi_I / pi * tau_J).sum(axis=-1)
+    g_t = (_n1 * pi_I * _J1 * tau_J / tau).sum(axis=-1)
+    g_tt = (_n1 * pi_I * _J1 * (_J1 - 1) * tau_J / tau**2).sum(axis=-1)
+    g = (_n1 * pi_I * tau_J).sum(axis=-1)
+    return g, g_p, g_t, g_tt
+
+def _region_1(_T, _P):
+    """v, h, s and cp of region 1"""
+    g, g_p, g_t, g_tt = _gamma_1(_T, _P)
+    pi = _P / _P1_star
+    tau = _T1_star / _T
+    return (pi * g_p * _R * _T / _P, tau * g_t * _R * _T,
+            (tau * g_t - g) * _R, -tau**2 * g_tt * _R)
+
+def _region_2(_T, _P):
+    """v, h, s and cp of region 2"""
+    pi = _P / _P2_star
+    tau = _T2_star / _T
+    tau_0 = tau[..., np.newaxis]
+    g0 = np.log(pi) + (_n0 * tau_0**_J0).sum(axis=-1)
+    g0_t = (_n0 * _J0 * tau_0**(_J0 - 1)).sum(axis=-1)
+    g0_tt = (_n0 * _J0 * (_J0 - 1) * tau_0**(_J0 - 2)).sum(axis=-1)
+
+    pi_r = pi[..., np.newaxis]
+    tau_r = tau_0 - 0.5
+    pi_I = pi_r**_Ir
+    tau_J = tau_r**_Jr
+    gr = (_nr * pi_I * tau_J).sum(axis=-1)
+    gr_p = (_nr * _Ir * pi_I / pi_r * tau_J).sum(axis=-1)
+    gr_t = (_nr * pi_I * _Jr * tau_J / tau_r).sum(axis=-1)
+    gr_tt = (_nr * pi_I * _Jr * (_Jr - 1) * tau_J / tau_r**2).sum(axis=-1)
+
+    return (pi * (1 / pi + gr_p) * _R * _T / _P,
+            tau * (g0_t + gr_t) * _R * _T,
+            (tau * (g0_t + gr_t) - (g0 + gr)) * _R,
+            -tau**2 * (g0_tt + gr_tt) * _R)
+
+def _properties(_T, _P, ranged=True):
+    """A dict of v (m**3 / kg), h (J / kg), s (J / (kg * K)) and
+    cp (J / (kg * K)), with each point in its own region.
+
+    Each region's equations are only evaluated at the points in that region.
+    """
+    OutOfRangeTest(_T, _T_min, _T_max, ranged)
+    OutOfRangeTest(_P, 0, _P_max, ranged)
+    _T, _P = np.broadcast_arrays(np.asarray(_T, dtype=float),
+                                 np.asarray(_P, dtype=float))
+    region = _region(_T, _P)
+    props = np.full((4,) + _T.shape, np.nan)
+    for number, equations in [(1, _region_1), (2, _region_2)]:
+        here = region == number
+        if here.any():
+            props[:, here] = equations(_T[here], _P[here])
+    v, h, s, cp = props
+    return {'volume': v[()], 'enthalpy': h[()], 'entropy': s[()],
+            'heat_capacity': cp[()]}
+
+def _saturated_properties(_T, ranged=True):
+    """Dicts of the saturated 'liquid' and 'vapor' properties at _T"""
+    OutOfRangeTest(_T, _T_min, _T_13, ranged)
+    _T = np.asarray(_T, dtype=float)
+    Ps = _sat_pressure(_T, False)
+    names = 'volume', 'enthalpy', 'entropy', 'heat_capacity'
+    return {
+        'pressure': Ps[()],
+        'liquid': dict(zip(names, (p[()] for p in _region_1(_T, Ps)))),
+        'vapor': dict(zip(names, (p[()] for p in _region_2(_T, Ps)))),
+    }
+
+def _volume(_T, _P, ranged=True):
+    """m**3 / kg"""
+    return _properties(_T, _P, ranged)['volume']
+
+def _density(_T, _P, ranged=True):
+    """mol / m**3"""
+    return 1 / _volume(_T, _P, ranged) / _MW
+
+def _enthalpy(_T, _P, ranged=True):
+    """J / kg"""
+    return _properties(_T, _P, ranged)['enthalpy']
+
+def _entropy(_T, _P, ranged=True):
+    """J / (kg * K)"""
+    return _properties(_T, _P, ranged)['entropy']
+
+def _heat_capacity(_T, _P, ranged=True):
+    """J / (kg * K)"""
+    return _properties(_T, _P, ranged)['heat_capacity']
+
+
+# Programmatically create functions with units #################################
+functions = [
+    _sat_pressure,
+    _sat_temp,
+    _volume,
+    _density,
+    _enthalpy,
+    _entropy,
+    _heat_capacity,
+]
+
+exec(function_strings(functions))
+
+_property_units = {
+    'volume': m**3 / kg,
+    'enthalpy': J / kg,
+    'entropy': J / (kg * K),
+    'heat_capacity': J / (kg * K),
+}
+
+
+def _with_units(props):
+    return {name: units_array(value, _property_units[name])
+            for name, value in props.items()}
+
+
+def properties(T, P, ranged=True):
+    """All of the properties at once, as a dict of units"""
+    return _with_units(_properties(magnitudes_of(T, K), magnitudes_of(P, Pa),
+                                   ranged))
+
+
+def saturated_properties(T, ranged=True):
+    """Saturation pressure, and dicts of the saturated 'liquid' and 'vapor'
+    properties, as units"""
+    props = _saturated_properties(magnitudes_of(T, K), ranged)
+    return {'pressure': units_array(props['pressure'], Pa),
+            'liquid': _with_units(props['liquid']),
+            'vapor': _with_units(props['vapor'])}
@@ -1,46 +1,164 @@
-from scipy.optimize import fsolve
-from numpy import tan, pi
-from scipy.special import jv
+"""Eigenvalues of the transient conduction series solutions
 
+plane wall    x*tan(x) = Bi
+cylinder      x*J1(x)/J0(x) = Bi
+sphere        1 - x/tan(x) = Bi
+
+E<shape>(n, Bi) gives the nth eigenvalue for one Biot number.
+<shape>_eigenvalues(Bi, N) gives the first N eigenvalues for each Biot number
+in Bi, as an array of shape Bi.shape + (N,):
+
+    >>> sphere_eigenvalues([0.1, 1, 10], 3)
+    array([[0.54228089, 4.51566044, 7.73819566],
+           [1.57079633, 4.71238898, 7.85398163],
+           [2.83630039, 5.7172492 , 8.6587047 ]])
+
+Eigenvalues are cached per Biot number. For many different Biot numbers use an
+EigenvalueTable, which interpolates a precomputed table for its first guesses.
+"""
+
+import numpy as np
+from numpy import pi
+from scipy.special import j0, j1, jn_zeros
+
+_shapes = ('plane_wall', 'cylinder', 'sphere')
+_cache = {shape: {} for shape in _shapes}
+_cache_size = 10000
+
+
+# Root brackets ################################################################
+# Each eigenvalue lies between consecutive poles and zeros of its equation, so
+# eigenvalue n is bracketed by edges that lie above eigenvalue n - 1.
+def _brackets(shape, N):
+    n = np.arange(1, N + 1)
+    if shape == 'plane_wall':
+        return (n - 1) * pi, (n - 0.5) * pi
+    if shape == 'cylinder':
+        return np.append(0, jn_zeros(1, N)[:N - 1]), jn_zeros(0, N)
+    return (n - 1) * pi, n * pi
+
+
+# Equations without poles ######################################################
+def _h(shape, x, Bi):
+    if shape == 'plane_wall':
+        return x * np.sin(x) - Bi * np.cos(x)
+    if shape == 'cylinder':
+        return x * j1(x) - Bi * j0(x)
+    # Divided through by x, so x = 0 isn't a root
+    return (1 - Bi) * np.sinc(x / pi) - np.cos(x)
+
+
+def _dh(shape, x, Bi):
+    if shape == 'plane_wall':
+        return (1 + Bi) * np.sin(x) + x * np.cos(x)
+    if shape == 'cylinder':
+        return x * j0(x) + Bi * j1(x)
+    safe_x = np.where(x == 0, 1, x)
+    dsinc = (safe_x * np.cos(safe_x) - np.sin(safe_x)) / safe_x**2
+    return np.where(x == 0, 0, (1 - Bi) * dsinc) + np.sin(x)
+
+
+# Solver #######################################################################
+def _solve(shape, Bi, N, guess=None, tol=1e-13, maxiter=100):
+    """First N eigenvalues for each Bi in a 1D array, by bracketed Newton
+
+    Every (Bi, n) pair is solved at once. Newton steps that leave the bracket
+    are replaced by bisection.
+    """
+    Bi = np.asarray(Bi, dtype=float)[:, np.newaxis]
+    lo, hi = _brackets(shape, N)
+    lo = np.broadcast_to(lo, (len(Bi), N)).astype(float)
+    hi = np.broadcast_to(hi, (len(Bi), N)).astype(float)
+    lo_sign = np.sign(_h(shape, lo, Bi))
+    x = (lo + hi) / 2 if guess is None else np.clip(guess, lo, hi)
+
+    for _ in range(maxiter):
+        h = _h(shape, x, Bi)
+        same = np.sign(h) == lo_sign
+        lo = np.where(same, x, lo)
+        hi = np.where(same, hi, x)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            new_x = x - h / _dh(shape, x, Bi)
+        outside = ~((new_x >= lo) & (new_x <= hi))
+        new_x = np.where(outside, (lo + hi) / 2, new_x)
+        done = (np.abs(new_x - x) <= tol * np.maximum(x, 1)) | (h == 0)
+        x = np.where(h == 0, x, new_x)
+        if np.all(done):
+            break
+    return x
+
+
+def _eigenvalues(shape, Bi, N):
+    Bi = np.asarray(Bi, dtype=float)
+    flat = Bi.ravel()
+    cache = _cache[shape]
+    missing = [b for b in np.unique(flat) if len(cache.get(b, ())) < N]
+    if missing:
+        if len(cache) + len(missing) > _cache_size:
+            cache.clear()
+        for b, row in zip(missing, _solve(shape, missing, N)):
+            cache[b] = row
+    return np.array([cache[b][:N] for b in flat]).reshape(Bi.shape + (N,))
+
+
+# Batched eigenvalues ##########################################################
+def plane_wall_eigenvalues(Bi, N):
+    """First N roots of x*tan(x) = Bi for each Bi"""
+    return _eigenvalues('plane_wall', Bi, N)
+
+
+def cylinder_eigenvalues(Bi, N):
+    """First N roots of x*J1(x)/J0(x) = Bi for each Bi"""
+    return _eigenvalues('cylinder', Bi, N)
+
+
+def sphere_eigenvalues(Bi, N):
+    """First N roots of 1 - x/tan(x) = Bi for each Bi"""
+    return _eigenvalues('sphere', Bi, N)
+
+
+class EigenvalueTable:
+    """First N eigenvalues for any Biot numbers, from an interpolating table
+
+    The table is solved once on `points` Biot numbers spaced evenly in log(Bi)
+    between Bi_min and Bi_max. Calls interpolate the table for the first
+    guesses, and then polish them with the same bracketed Newton solver, so the
+    results are exact. Biot numbers outside the table just start from the
+    nearest end of it.
+
+        >>> table = EigenvalueTable('cylinder', 20)
+        >>> table(np.logspace(-2, 2, 10000)).shape
+        (10000, 20)
+    """
+    def __init__(self, shape, N, Bi_min=1e-3, Bi_max=1e3, points=121):
+        if shape not in _shapes:
+            raise ValueError('shape must be one of ' + ', '.join(_shapes))
+        self.shape = shape
+        self.N = N
+        self._log_Bi = np.linspace(np.log(Bi_min), np.log(Bi_max), points)
+        self._table = _solve(shape, np.exp(self._log_Bi), N)
+
+    def __call__(self, Bi):
+        Bi = np.asarray(Bi, dtype=float)
+        flat = Bi.ravel()
+        log_Bi = np.log(np.clip(flat, *np.exp(self._log_Bi[[0, -1]])))
+        i = np.clip(np.searchsorted(self._log_Bi, log_Bi) - 1, 0,
+                    len(self._log_Bi) - 2)
+        weight = ((log_Bi - self._log_Bi[i]) /
+                  (self._log_Bi[i + 1] - self._log_Bi[i]))[:, np.newaxis]
+        guess = (1 - weight) * self._table[i] + weight * self._table[i + 1]
+        roots = _solve(self.shape, flat, self.N, guess)
+        return roots.reshape(Bi.shape + (self.N,))
+
+
+# One eigenvalue ###############################################################
 def Eplane_wall(n, Bi):
-    def f(xg, small, big):
-        if xg < small:
-            return (small * tan(small) - Bi) * (small - xg)
-        elif xg > big:
-            return (big * tan(big) - Bi) * (xg - big)
-        return xg * tan(xg) - Bi
-    if n == 1:
-        small = 0
-        big = pi / 2
-        return fsolve(f, (small + big) / 2, args=(small, big))[0]
-    else:
-        small = (2 * n - 1) * pi / 2 - pi * 0.9999
-        big = (2 * n - 1) * pi / 2 * 0.9999
-        return fsolve(f, (small + big) / 2, args=(small, big))[0]
+    return float(plane_wall_eigenvalues(Bi, n)[n - 1])
+
 
 def Ecylinder(n, Bi):
-    def f(xg, small, big):
-        if xg < small:
-            return (small * jv(1, small) / jv(0, small) - Bi) * (small - xg)
-        elif xg > big:
-            return (big * jv(1, big) / jv(0, big) - Bi) * (xg - big)
-        return xg * jv(1, xg) / jv(0, xg) - Bi
-    if n == 1:
-        small = 0
-        big = 2.4
-        return fsolve(f, (small + big) / 2, args=(small, big))[0]
-    else:
-        small = 0.005 + (n - 1) * pi
-        big = 2.35 + (n - 1) * pi
-        return fsolve(f, (small + big) / 2, args=(small, big))[0]
+    return float(cylinder_eigenvalues(Bi, n)[n - 1])
+
 
 def Esphere(n, Bi):
-    def f(xg, small, big):
-        if xg < small:
-            return (1 - small / tan(small) - Bi) * (small - xg)
-        elif xg > big:
-            return (1 - big / tan(big) - Bi) * (xg - big)
-        return 1 - xg / tan(xg) - Bi
-    small = n * pi - 0.9999 * pi
-    big = n * pi * 0.9999
-    return fsolve(f, (small + big) / 2, args=(small, big))[0]
+    return float(sphere_eigenvalues(Bi, n)[n - 1])
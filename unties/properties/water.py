@@ -40,6 +40,20 @@ override this safety range.
 
 Check the docstring of each function to find the units of the returned value.
 
+Most temperature-dependant functions have a `_dT` companion that returns the
+exact derivative with respect to temperature (in units of the function's units
+per Kelvin):
+
+    >>> print(water.liquid_density_dT(300 * K))
+    -15.124603789464528 * mol / (K * m**3.0)
+
+The heat capacities also have exact integrals between two temperatures, of Cp
+(`_integral`, for enthalpy changes) and of Cp / T (`_integral_over_T`, for
+entropy changes). Either temperature can be an array:
+
+    >>> print(water.ideal_gas_heat_capacity_integral(300 * K, 400 * K))
+    3388.045729178667 * J / mol
+
 
 ## Data Lists
 
@@ -86,12 +100,30 @@ Available Temperature-Dependant Functions:
     _liquid_thermal_conductivity
     _vapor_thermal_conductivity
     _surface_tension
+
+Available Pressure-Dependant Functions:
+    _sublimation_temp
+    _sat_temp
+
+Available Heat Capacity Integrals (functions of T1 and T2):
+    _solid_heat_capacity_integral
+    _solid_heat_capacity_integral_over_T
+    _liquid_heat_capacity_integral
+    _liquid_heat_capacity_integral_over_T
+    _ideal_gas_heat_capacity_integral
+    _ideal_gas_heat_capacity_integral_over_T
 """
 
 # Imports ######################################################################
 from unties import *
-from math import exp, log, sinh, cosh
+from numpy import exp, log, sinh, cosh
+from scipy.interpolate import UnivariateSpline
 from unties.utilities.utilities import OutOfRangeTest, function_strings
+from unties.properties.dippr import eq101_inverse, eq101_table
+from unties.properties.dippr import (eq100_dT, eq101_dT, eq102_dT, eq104_dT,
+                                     eq106_dT, eq107_dT, eq119_dT)
+from unties.properties.dippr import (eq100_integral, eq100_integral_over_T,
+                                     eq107_integral, eq107_integral_over_T)
 
 
 # DIPPR's Constants Without Units ##############################################
@@ -163,22 +195,26 @@ dielectric_const = _dielectric_const * (m/m)
 
 
 # DIPPR's Functions Without Units ##############################################
+_solid_density_coefs = 5.3030E+01, -7.8409E-03
+
 def _solid_density(_T, ranged=True):
     """mol / m**3"""
     OutOfRangeTest(_T, 233.15, 273.15, ranged)
-    A, B = 5.3030E+01, -7.8409E-03
+    A, B = _solid_density_coefs
     return A + B * _T * 1000
 
+_liquid_density_coefs = (1.7874E+01,
+                         3.5618E+01,
+                         1.9655E+01,
+                        -9.1306E+00,
+                        -3.1367E+01,
+                        -8.1356E+02,
+                        -1.7421E+07)
+
 def _liquid_density(_T, ranged=True):
     """mol / m**3"""
     OutOfRangeTest(_T, 273.16, 647.096, ranged)
-    A, B, C, D, E, F, G = (1.7874E+01,
-                           3.5618E+01,
-                           1.9655E+01,
-                          -9.1306E+00,
-                          -3.1367E+01,
-                          -8.1356E+02,
-                          -1.7421E+07)
+    A, B, C, D, E, F, G = _liquid_density_coefs
     t = 1 - _T / _Tc
     first = A
     second = B * t**(1 / 3)
@@ -189,104 +225,260 @@ def _liquid_density(_T, ranged=True):
     seventh = G * t**(110 / 3)
     return (first + second + third + fourth + fifth + sixth + seventh) * 1000
 
+_solid_vapor_pressure_coefs = 2.8766E+01, -6.1092E+03
+
 def _solid_vapor_pressure(_T, ranged=True):
     """Pa"""
     OutOfRangeTest(_T, 149.3, 273.16, ranged)
-    A, B = 2.8766E+01, -6.1092E+03
+    A, B = _solid_vapor_pressure_coefs
     return exp(A + B / _T)
 
+_liquid_vapor_pressure_coefs = 7.3649E+01, -7.2582E+03, -7.3037E+00, 4.1653E-06, 2.0000E+00
+
 def _liquid_vapor_pressure(_T, ranged=True):
     """Pa"""
     OutOfRangeTest(_T, 273.16, 647.096, ranged)
-    A, B, C, D, E = 7.3649E+01, -7.2582E+03, -7.3037E+00, 4.1653E-06, 2.0000E+00
+    A, B, C, D, E = _liquid_vapor_pressure_coefs
     return exp(A + B / _T + C * log(_T) + D * _T**E)
 
+_heat_of_vaporization_coefs = 5.6600E+07, 6.1204E-01, -6.2570E-01, 3.9880E-01
+
 def _heat_of_vaporization(_T, ranged=True):
     """J / mol"""
     OutOfRangeTest(_T, 273.16, 647.096, ranged)
-    A, B, C, D = 5.6600E+07, 6.1204E-01, -6.2570E-01, 3.9880E-01
+    A, B, C, D = _heat_of_vaporization_coefs
     Tr = _T / _Tc
     return A * (1 - Tr)**(B + C * Tr + D * Tr**2) / 1000
 
+_solid_heat_capacity_coefs = -2.6249E+02, 1.4052E+02
+
 def _solid_heat_capacity(_T, ranged=True):
     """J / (mol * K)"""
     OutOfRangeTest(_T, 3.15, 273.15, ranged)
-    A, B = -2.6249E+02, 1.4052E+02
+    A, B = _solid_heat_capacity_coefs
     return (A + B * _T) / 1000
 
+_liquid_heat_capacity_coefs = 2.7637E+05, -2.0901E+03, 8.1250E+00, -1.4116E-02, 9.3701E-06
+
 def _liquid_heat_capacity(_T, ranged=True):
     """J / (mol * K)"""
     OutOfRangeTest(_T, 273.16, 533.15, ranged)
-    A, B, C, D, E = 2.7637E+05, -2.0901E+03, 8.1250E+00, -1.4116E-02, 9.3701E-06
+    A, B, C, D, E = _liquid_heat_capacity_coefs
     return (A + B * _T + C * _T**2 + D * _T**3 + E * _T**4) / 1000
 
+_ideal_gas_heat_capacity_coefs = 3.3363E+04, 2.6790E+04, 2.6105E+03, 8.8960E+03, 1.1690E+03
+
 def _ideal_gas_heat_capacity(_T, ranged=True):
     """J / (mol * K)"""
     OutOfRangeTest(_T, 100, 2273.15, ranged)
-    A, B, C, D, E = 3.3363E+04, 2.6790E+04, 2.6105E+03, 8.8960E+03, 1.1690E+03
+    A, B, C, D, E = _ideal_gas_heat_capacity_coefs
     return (A + B * (C/_T / sinh(C/_T))**2 + D * (E/_T / cosh(E/_T))**2) / 1000
 
+_second_virial_coef_coefs = 2.2220E-02, -2.6380E+1, -1.6750E+07, -3.8940E+19, 3.1330E+21
+
 def _second_virial_coef(_T, ranged=True):
     """m**3 / mol"""
     OutOfRangeTest(_T, 273.15, 2273.1, ranged)
-    A, B, C, D, E = 2.2220E-02, -2.6380E+1, -1.6750E+07, -3.8940E+19, 3.1330E+21
+    A, B, C, D, E = _second_virial_coef_coefs
     return (A + B / _T + C / _T**3 + D / _T**8 + E / _T**9) / 1000
 
+_liquid_viscocity_coefs = -5.2843E+01, 3.7036E+03, 5.8660E+00, -5.8790E-29, 10.0
+
 def _liquid_viscocity(_T, ranged=True):
     """Pa * s"""
     OutOfRangeTest(_T, 273.16, 646.15, ranged)
-    A, B, C, D, E = -5.2843E+01, 3.7036E+03, 5.8660E+00, -5.8790E-29, 10.0
+    A, B, C, D, E = _liquid_viscocity_coefs
     return exp(A + B / _T + C * log(_T) + D * _T**E)
 
+_vapor_viscocity_coefs = 1.7096E-08, 1.1146E+00
+
 def _vapor_viscocity(_T, ranged=True):
     """Pa * s"""
     OutOfRangeTest(_T, 273.16, 1073.15, ranged)
-    A, B = 1.7096E-08, 1.1146E+00
+    A, B = _vapor_viscocity_coefs
     return A * _T**B
 
+_liquid_thermal_conductivity_coefs = -4.3200E-01, 5.7255E-03, -8.0780E-06, 1.8610E-09
+
 def _liquid_thermal_conductivity(_T, ranged=True):
     """W / (m * K)"""
     OutOfRangeTest(_T, 273.16, 633.15, ranged)
-    A, B, C, D = -4.3200E-01, 5.7255E-03, -8.0780E-06, 1.8610E-09
+    A, B, C, D = _liquid_thermal_conductivity_coefs
     return A + B * _T + C * _T**2 + D * _T**3
 
+_vapor_thermal_conductivity_coefs = 6.2041E-06, 1.3973E+00
+
 def _vapor_thermal_conductivity(_T, ranged=True):
     """W / (m * K)"""
     OutOfRangeTest(_T, 273.16, 1073.15, ranged)
-    A, B = 6.2041E-06, 1.3973E+00
+    A, B = _vapor_thermal_conductivity_coefs
     return A * _T**B
 
+_surface_tension_coefs = 1.7766E-01, 2.5670E+00, -3.3377E+00, 1.9699E+00
+
 def _surface_tension(_T, ranged=True):
     """N / m"""
     OutOfRangeTest(_T, 273.16, 647.096, ranged)
-    A, B, C, D = 1.7766E-01, 2.5670E+00, -3.3377E+00, 1.9699E+00
+    A, B, C, D = _surface_tension_coefs
     Tr = _T / _Tc
     return A * (1 - Tr)**(B + C * Tr + D * Tr**2)
 
 
+# Derivatives Without Units ####################################################
+def _solid_density_dT(_T, ranged=True):
+    """mol / (m**3 * K)"""
+    OutOfRangeTest(_T, 233.15, 273.15, ranged)
+    A, B = _solid_density_coefs
+    return eq100_dT(_T, (A, B * 1000))
+
+def _liquid_density_dT(_T, ranged=True):
+    """mol / (m**3 * K)"""
+    OutOfRangeTest(_T, 273.16, 647.096, ranged)
+    return eq119_dT(_T, _liquid_density_coefs, _Tc) * 1000
+
+def _solid_vapor_pressure_dT(_T, ranged=True):
+    """Pa / K"""
+    OutOfRangeTest(_T, 149.3, 273.16, ranged)
+    return eq101_dT(_T, _solid_vapor_pressure_coefs)
+
+def _liquid_vapor_pressure_dT(_T, ranged=True):
+    """Pa / K"""
+    OutOfRangeTest(_T, 273.16, 647.096, ranged)
+    return eq101_dT(_T, _liquid_vapor_pressure_coefs)
+
+def _heat_of_vaporization_dT(_T, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T, 273.16, 647.096, ranged)
+    return eq106_dT(_T, _heat_of_vaporization_coefs, _Tc) / 1000
+
+def _solid_heat_capacity_dT(_T, ranged=True):
+    """J / (mol * K**2)"""
+    OutOfRangeTest(_T, 3.15, 273.15, ranged)
+    return eq100_dT(_T, _solid_heat_capacity_coefs) / 1000
+
+def _liquid_heat_capacity_dT(_T, ranged=True):
+    """J / (mol * K**2)"""
+    OutOfRangeTest(_T, 273.16, 533.15, ranged)
+    return eq100_dT(_T, _liquid_heat_capacity_coefs) / 1000
+
+def _ideal_gas_heat_capacity_dT(_T, ranged=True):
+    """J / (mol * K**2)"""
+    OutOfRangeTest(_T, 100, 2273.15, ranged)
+    return eq107_dT(_T, _ideal_gas_heat_capacity_coefs) / 1000
+
+def _second_virial_coef_dT(_T, ranged=True):
+    """m**3 / (mol * K)"""
+    OutOfRangeTest(_T, 273.15, 2273.1, ranged)
+    return eq104_dT(_T, _second_virial_coef_coefs) / 1000
+
+def _liquid_viscocity_dT(_T, ranged=True):
+    """Pa * s / K"""
+    OutOfRangeTest(_T, 273.16, 646.15, ranged)
+    return eq101_dT(_T, _liquid_viscocity_coefs)
+
+def _vapor_viscocity_dT(_T, ranged=True):
+    """Pa * s / K"""
+    OutOfRangeTest(_T, 273.16, 1073.15, ranged)
+    return eq102_dT(_T, _vapor_viscocity_coefs)
+
+def _liquid_thermal_conductivity_dT(_T, ranged=True):
+    """W / (m * K**2)"""
+    OutOfRangeTest(_T, 273.16, 633.15, ranged)
+    return eq100_dT(_T, _liquid_thermal_conductivity_coefs)
+
+def _vapor_thermal_conductivity_dT(_T, ranged=True):
+    """W / (m * K**2)"""
+    OutOfRangeTest(_T, 273.16, 1073.15, ranged)
+    return eq102_dT(_T, _vapor_thermal_conductivity_coefs)
+
+def _surface_tension_dT(_T, ranged=True):
+    """N / (m * K)"""
+    OutOfRangeTest(_T, 273.16, 647.096, ranged)
+    return eq106_dT(_T, _surface_tension_coefs, _Tc)
+
+
+# Heat Capacity Integrals Without Units ########################################
+def _solid_heat_capacity_integral(_T1, _T2, ranged=True):
+    """J / mol"""
+    OutOfRangeTest(_T1, 3.15, 273.15, ranged)
+    OutOfRangeTest(_T2, 3.15, 273.15, ranged)
+    return eq100_integral(_T1, _T2, _solid_heat_capacity_coefs) / 1000
+
+def _solid_heat_capacity_integral_over_T(_T1, _T2, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T1, 3.15, 273.15, ranged)
+    OutOfRangeTest(_T2, 3.15, 273.15, ranged)
+    return eq100_integral_over_T(_T1, _T2, _solid_heat_capacity_coefs) / 1000
+
+def _liquid_heat_capacity_integral(_T1, _T2, ranged=True):
+    """J / mol"""
+    OutOfRangeTest(_T1, 273.16, 533.15, ranged)
+    OutOfRangeTest(_T2, 273.16, 533.15, ranged)
+    return eq100_integral(_T1, _T2, _liquid_heat_capacity_coefs) / 1000
+
+def _liquid_heat_capacity_integral_over_T(_T1, _T2, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T1, 273.16, 533.15, ranged)
+    OutOfRangeTest(_T2, 273.16, 533.15, ranged)
+    return eq100_integral_over_T(_T1, _T2, _liquid_heat_capacity_coefs) / 1000
+
+def _ideal_gas_heat_capacity_integral(_T1, _T2, ranged=True):
+    """J / mol"""
+    OutOfRangeTest(_T1, 100, 2273.15, ranged)
+    OutOfRangeTest(_T2, 100, 2273.15, ranged)
+    return eq107_integral(_T1, _T2, _ideal_gas_heat_capacity_coefs) / 1000
+
+def _ideal_gas_heat_capacity_integral_over_T(_T1, _T2, ranged=True):
+    """J / (mol * K)"""
+    OutOfRangeTest(_T1, 100, 2273.15, ranged)
+    OutOfRangeTest(_T2, 100, 2273.15, ranged)
+    return eq107_integral_over_T(_T1, _T2, _ideal_gas_heat_capacity_coefs) / 1000
+
+
+# Inverse Functions Without Units ##############################################
+_sublimation_temp_range = _solid_vapor_pressure(149.3), _solid_vapor_pressure(273.16)
+_sublimation_temp_table = eq101_table(_solid_vapor_pressure_coefs, 149.3, 273.16)
+
+def _sublimation_temp(_P, ranged=True):
+    """K"""
+    OutOfRangeTest(_P, *_sublimation_temp_range, ranged)
+    return eq101_inverse(_P, _solid_vapor_pressure_coefs, 149.3, 273.16,
+                         _sublimation_temp_table)
+
+_sat_temp_range = _liquid_vapor_pressure(273.16), _liquid_vapor_pressure(647.096)
+_sat_temp_table = eq101_table(_liquid_vapor_pressure_coefs, 273.16, 647.096)
+
+def _sat_temp(_P, ranged=True):
+    """K"""
+    OutOfRangeTest(_P, *_sat_temp_range, ranged)
+    return eq101_inverse(_P, _liquid_vapor_pressure_coefs, 273.16, 647.096,
+                         _sat_temp_table)
+
+
 # Steam Functions Without Units ################################################
 _steam_viscosity = _vapor_viscocity
 
 _steam_thermal_conductivity = _vapor_thermal_conductivity
 
+_steam_vol_spline = UnivariateSpline([
+    273.15, 275,    280,    285,    290,    295,
+    300,    305,    310,    315,    320,    325,
+    330,    335,    340,    345,    350,    355,
+    360,    365,    370,    373.15, 375,    380,
+    385,    390,    400,    410,    420,    430
+], [
+    206.3,   181.7,   130.4,    99.4,    69.7,    51.94,
+     39.13,   29.74,   22.93,   17.82,   13.98,   11.06,
+      8.82,    7.09,    5.74,    4.683,   3.846,   3.180,
+      2.645,   2.212,   1.861,   1.679,   1.574,   1.337,
+      1.142,   0.980,   0.731,   0.553,   0.425,   0.331
+], s=0)
+
 def _steam_vol(_T, ranged=True):
     """m**3 / kg"""
+    # Saturated vapor only. For superheated steam, see unties.properties.steam
     OutOfRangeTest(_T, 273.15, 430, ranged)
-    Ts = [
-        273.15, 275,    280,    285,    290,    295,
-        300,    305,    310,    315,    320,    325,
-        330,    335,    340,    345,    350,    355,
-        360,    365,    370,    373.15, 375,    380,
-        385,    390,    400,    410,    420,    430
-    ]
-    Vsats = [
-        206.3,   181.7,   130.4,    99.4,    69.7,    51.94,
-         39.13,   29.74,   22.93,   17.82,   13.98,   11.06,
-          8.82,    7.09,    5.74,    4.683,   3.846,   3.180,
-          2.645,   2.212,   1.861,   1.679,   1.574,   1.337,
-          1.142,   0.980,   0.731,   0.553,   0.425,   0.331
-    ]
-    return float(UnivariateSpline(Ts, Vsats, s=0).__call__(_T))
+    return _steam_vol_spline(_T)[()]
 
 def _steam_density(_T, ranged=True):
     """mol / m**3"""
@@ -319,12 +511,34 @@ functions = [
     _liquid_thermal_conductivity,
     _vapor_thermal_conductivity,
     _surface_tension,
+    _sublimation_temp,
+    _sat_temp,
     _steam_viscosity,
     _steam_thermal_conductivity,
     _steam_vol,
     _steam_density,
     _kinematic_viscocity,
     _Pr,
+    _solid_density_dT,
+    _liquid_density_dT,
+    _solid_vapor_pressure_dT,
+    _liquid_vapor_pressure_dT,
+    _heat_of_vaporization_dT,
+    _solid_heat_capacity_dT,
+    _liquid_heat_capacity_dT,
+    _ideal_gas_heat_capacity_dT,
+    _second_virial_coef_dT,
+    _liquid_viscocity_dT,
+    _vapor_viscocity_dT,
+    _liquid_thermal_conductivity_dT,
+    _vapor_thermal_conductivity_dT,
+    _surface_tension_dT,
+    _solid_heat_capacity_integral,
+    _solid_heat_capacity_integral_over_T,
+    _liquid_heat_capacity_integral,
+    _liquid_heat_capacity_integral_over_T,
+    _ideal_gas_heat_capacity_integral,
+    _ideal_gas_heat_capacity_integral_over_T,
 ]
 
 exec(function_strings(functions))
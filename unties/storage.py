@@ -0,0 +1,338 @@
+"""Save quantity arrays to files, and load them back without reading them in
+
+    >>> save_units_array('pressures.npy', units_array(data, psi))
+    >>> pressures = load_units_array('pressures.npy')
+    >>> pressures[1000:2000](kPa)
+
+The magnitudes are saved as a plain .npy file (so numpy, or anything else that
+reads .npy, can still read them), next to a small JSON file with their units
+(`pressures.units.json`). Loading memory-maps the .npy file: nothing is read
+until it's used, and then only the parts that are used. Slicing a loaded array
+doesn't copy anything, and `lazy` (see unties.lazy) works through one a chunk
+at a time.
+
+For several columns at once (like a table of results), `save_table` puts them
+all in one file, with each column's units written once and its magnitudes as
+one contiguous block:
+
+    >>> save_table('run.unties', {'T': temperatures, 'P': pressures})
+    >>> load_table('run.unties')['P']
+    [101.325 ... 202.65] * kPa
+
+A table file is a short header, then the columns' data. The header is the
+magic bytes `UNTIES TABLE 1\n`, the JSON's length (8 bytes, little-endian),
+then JSON listing each column's name, units (see `_units_header`), dtype,
+shape and where its data starts. Each column's data is its magnitudes' raw bytes,
+starting at a multiple of 64 bytes from the start of the file.
+
+For text, `format_csv` and `format_json` write columns with each column's units
+written once (not once per value, like printing each units_group would), and
+`parse_csv` and `parse_json` read them back (without eval):
+
+    >>> print(format_csv({'T': units_array(np.array([300., 350.]), K),
+    >>>                   'q': units_array(np.array([1.5, 2.]), kW / m**2)}))
+    T [K],q [kW / m**2.0]
+    300.0,1.5
+    350.0,2.0
+
+Numbers are written so they read back exactly. Files that don't have exactly
+one number for each column in each row raise ValueError when read. See
+unties/tests/benchmark.py for how fast they are.
+"""
+
+import json
+
+
+def _units_path(filename):
+    base = filename[:-4] if filename.endswith('.npy') else filename
+    return base + '.units.json'
+
+
+def _units_header(quantity):
+    """The units part of a file, which is small JSON
+
+    The name of the units, plus their dimensions and size in SI units (normal),
+    so loading can tell if the name means something else by then.
+    """
+    if quantity.units and not quantity.full_name:  # Unchecked: no names
+        quantity = quantity.standardized()
+    return {'units': str(quantity.full_name),
+            'dimensions': dict(quantity.units),
+            'normal': quantity.normal}
+
+
+def _units_from_header(header):
+    """The (normalized) units_group from a header, checked against it"""
+    from math import isclose
+    import unties.utilities.errors as ue
+    from unties.units_group import UnitsGroup
+    from unties.unit_helpers import parse_units
+    units = parse_units(header['units']).normalized()
+    units.must_have_same_units_as(UnitsGroup(**header['dimensions']))
+    if not isclose(units.normal, header.get('normal', units.normal),
+                   rel_tol=1e-12):
+        raise ue.UnitStringError(header['units'], 'is a different size now')
+    return units
+
+
+def _magnitudes(quantity):
+    """The magnitudes to save, in the units _units_header gives"""
+    import numpy as np
+    if quantity.units and not quantity.full_name:
+        quantity = quantity.standardized()
+    return np.asarray(quantity.magnitude)
+
+
+def save_units_array(filename, quantity):
+    """Save a units_group with an array magnitude as .npy + .units.json
+
+    The magnitudes are saved as they are (same dtype, same units), in one
+    write. Returns the name of the .npy file.
+    """
+    import numpy as np
+    filename = str(filename)
+    if not filename.endswith('.npy'):
+        filename += '.npy'
+    np.save(filename, _magnitudes(quantity))
+    with open(_units_path(filename), 'w') as f:
+        json.dump(_units_header(quantity), f)
+    return filename
+
+
+def load_units_array(filename, mmap_mode='r'):
+    """Load what save_units_array saved, memory-mapped
+
+    `mmap_mode` goes to numpy.load: 'r' (the default) is read-only, 'r+'
+    lets changes (like `to_`) write through to the file, 'c' keeps changes
+    in memory only, and None reads the whole file in.
+
+    Raises UnitStringError if the saved units can't be read (like an unknown
+    custom unit), and IncompatibleUnitsError if their names now mean
+    different dimensions.
+    """
+    import numpy as np
+    from unties.unit_helpers import units_array
+    filename = str(filename)
+    if not filename.endswith('.npy'):
+        filename += '.npy'
+    with open(_units_path(filename)) as f:
+        units = _units_from_header(json.load(f))
+    magnitudes = np.load(filename, mmap_mode=mmap_mode)
+    return units_array(magnitudes, units, copy=False)
+
+
+_magic = b'UNTIES TABLE 1\n'
+_alignment = 64
+
+
+def save_table(filename, columns):
+    """Save a dict of columns (quantity arrays or plain arrays) to one file
+
+    Each column's units are written once, and its magnitudes (with their
+    dtype, in their units) are written in one block. See the module docstring
+    for the format.
+    """
+    import numpy as np
+    from unties.units_group import UnitsGroup
+    entries = []
+    blocks = []
+    offset = 0
+    for name, column in columns.items():
+        entry = {'name': name, 'units': None}
+        if isinstance(column, UnitsGroup):
+            entry['units'] = _units_header(column)
+            column = _magnitudes(column)
+        column = np.asarray(column)
+        if not column.flags.c_contiguous:
+            column = column.copy(order='C')
+        if column.dtype.hasobject:
+            raise TypeError('Column ' + repr(name) + ' has objects in it. ' +
+                            'Use units_array for arrays of units_groups.')
+        offset += -offset % _alignment
+        entry.update(dtype=column.dtype.str, shape=list(column.shape),
+                     offset=offset)
+        entries.append(entry)
+        blocks.append(column)
+        offset += column.nbytes
+
+    header = json.dumps({'columns': entries}).encode()
+    start = _data_start(len(header))
+    with open(str(filename), 'wb') as f:
+        f.write(_magic + len(header).to_bytes(8, 'little') + header)
+        for entry, block in zip(entries, blocks):
+            f.write(b'\0' * (start + entry['offset'] - f.tell()))
+            f.write(memoryview(block.reshape(-1)).cast('B'))
+
+
+def _data_start(header_length):
+    start = len(_magic) + 8 + header_length
+    return start + -start % _alignment
+
+
+def load_table(filename, mmap_mode='r'):
+    """Load a file from save_table, as a dict of columns
+
+    Columns with units come back as quantity arrays, and the rest as plain
+    arrays. With a mmap_mode (see load_units_array), the file is memory-mapped
+    and each column is a view of its part of the map. With mmap_mode=None, the
+    file is read in one go, and the columns are views of what was read. Either
+    way, no column is copied.
+    """
+    import os
+    import numpy as np
+    from unties.unit_helpers import units_array
+    filename = str(filename)
+    with open(filename, 'rb') as f:
+        if f.read(len(_magic)) != _magic:
+            raise ValueError(filename + " isn't an unties table")
+        length = int.from_bytes(f.read(8), 'little')
+        header = json.loads(f.read(length).decode())
+        if not mmap_mode:
+            f.seek(0)
+            data = np.empty(os.fstat(f.fileno()).st_size, dtype=np.uint8)
+            f.readinto(data)
+    if mmap_mode:
+        data = np.memmap(filename, dtype=np.uint8, mode=mmap_mode)
+    start = _data_start(length)
+
+    columns = {}
+    for entry in header['columns']:
+        dtype = np.dtype(entry['dtype'])
+        shape = tuple(entry['shape'])
+        first = start + entry['offset']
+        last = first + dtype.itemsize * int(np.prod(shape))
+        if last > first:
+            column = data[first:last].view(dtype).reshape(shape)
+        else:
+            column = np.empty(shape, dtype=dtype)
+        if not shape:  # Saved from a number
+            column = column[()]
+        if entry['units'] is not None:
+            column = units_array(column, _units_from_header(entry['units']),
+                                 copy=False)
+        columns[entry['name']] = column
+    return columns
+
+
+# Text #########################################################################
+def _units_string(quantity):
+    """The units of a quantity, as a string for parse_units"""
+    if quantity.units and not quantity.full_name:  # Unchecked: no names
+        quantity = quantity.standardized()
+    name = str(quantity.full_name)
+    return name[3:] if name.startswith(' * ') else name.strip()
+
+
+def _text_columns(columns):
+    """(name, units string or None, plain array) for each column"""
+    import numpy as np
+    from unties.units_group import UnitsGroup
+    for name, column in columns.items():
+        units = None
+        if isinstance(column, UnitsGroup):
+            units = _units_string(column)
+            column = _magnitudes(column)
+        yield name, units, np.asarray(column)
+
+
+def format_csv(columns):
+    """Return a dict of same-length columns as CSV text, units in the header
+
+    Each header is the column's name, then its units in brackets (like
+    `T [K]`), unless it's a plain array. Names can't have commas, brackets or
+    newlines in them. Raises ValueError for those names, and for columns that
+    aren't 1-D or aren't all the same length.
+    """
+    headers = []
+    values = []
+    length = None
+    for name, units, column in _text_columns(columns):
+        if any(c in name for c in ',[]\n'):
+            raise ValueError('Column names for CSV cannot contain commas, ' +
+                             'brackets or newlines: ' + repr(name))
+        if column.ndim != 1:
+            raise ValueError('Column ' + repr(name) + ' is ' +
+                             str(column.ndim) + '-D. CSV columns must be 1-D.')
+        if length is None:
+            length = len(column)
+        elif len(column) != length:
+            raise ValueError('Column ' + repr(name) + ' has ' +
+                             str(len(column)) + ' values, not ' + str(length))
+        headers.append(name if units is None else name + ' [' + units + ']')
+        values.append(map(repr, column.tolist()))
+    rows = map(','.join, zip(*values))
+    return '\n'.join([','.join(headers)] + list(rows)) + '\n'
+
+
+def parse_csv(text):
+    """Read text from format_csv back into a dict of columns
+
+    The numbers are all read as floats (in one go, by numpy). Columns with
+    units come back as quantity arrays, and the rest as plain arrays. Raises
+    ValueError for rows without one value for each column (including empty
+    values), and for values that aren't numbers.
+    """
+    import warnings
+    import numpy as np
+    from unties.unit_helpers import parse_units, units_array
+    header, _, body = text.partition('\n')
+    headers = header.rstrip('\r').split(',')
+    rows = body.splitlines()
+    while rows and not rows[-1].strip():  # Blank lines at the end
+        rows.pop()
+    for i, row in enumerate(rows):
+        if row.count(',') != len(headers) - 1:
+            raise ValueError('Row %d has %d values, not %d' %
+                             (i + 1, row.count(',') + 1, len(headers)))
+    with warnings.catch_warnings():  # numpy only warns about bad numbers
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            numbers = np.fromstring(' '.join(rows).replace(',', ' '), sep=' ')
+        except DeprecationWarning as warning:
+            raise ValueError(str(warning))
+    if numbers.size != len(rows) * len(headers):  # Some values were empty
+        for i, row in enumerate(rows):
+            values = row.split(',')
+            if not all(value.strip() for value in values):
+                raise ValueError('Row %d has an empty value' % (i + 1))
+            if any(len(value.split()) > 1 for value in values):
+                raise ValueError('Row %d has a value with spaces in it' %
+                                 (i + 1))
+    numbers = numbers.reshape(-1, len(headers))
+    columns = {}
+    for i, header in enumerate(headers):
+        column = numbers[:, i]
+        name, bracket, units = header.partition(' [')
+        if bracket:
+            column = units_array(column, parse_units(units[:-1]), copy=False)
+        columns[name] = column
+    return columns
+
+
+def format_json(columns):
+    """Return a dict of columns as JSON text, with each column's units once
+
+    Like `{"T": {"units": "K", "values": [300.0, 350.0]}}`. Plain arrays are
+    written as just their values.
+    """
+    data = {}
+    for name, units, column in _text_columns(columns):
+        values = column.tolist()
+        data[name] = values if units is None else {'units': units,
+                                                   'values': values}
+    return json.dumps(data)
+
+
+def parse_json(text):
+    """Read text from format_json back into a dict of columns"""
+    import numpy as np
+    from unties.unit_helpers import parse_units, units_array
+    columns = {}
+    for name, column in json.loads(text).items():
+        if isinstance(column, dict):
+            column = units_array(np.array(column['values']),
+                                 parse_units(column['units']), copy=False)
+        else:
+            column = np.array(column)
+        columns[name] = column
+    return columns
@@ -1,10 +1,20 @@
 from unittest import TestCase
 import math
+import os
+import tempfile
 import numpy as np
 from scipy.optimize import fsolve
 
 import unties as _
 import unties.utilities.errors as ue
+from unties.properties import water, benzene, air, transcendentals
+from unties.properties import conduction, f_values, effectiveness, steam
+from unties.properties.mixture import IdealMixture
+from unties.class_helps import Fluid, GridInterpolator, ReactionSet, dli
+from unties.class_helps import kc_t, kr
+
+# The tests check units, even when UNTIES_UNCHECKED turns checks off
+_.set_checks(True)
 
 
 def _deep_map(func, *args):
@@ -424,6 +434,15 @@ class TestUnties(TestCase):
         except:
             self.fail("unitless with np array failed unexpectedly!")
 
+    def test_unitless_passes_arrays_as_one_units_group(self):
+        seen = []
+        def spring_force(x):
+            seen.append(x)
+            return x * 2 * _.N / _.m
+        force = _.unitless(_.N, _.ft)(spring_force)(np.linspace(1, 2, 4))
+        self.assertTrue(hasattr(seen[0], 'units'))
+        self.assertTrue(np.allclose(force, np.linspace(1, 2, 4) * 0.6096))
+
     # Test unitified helper #
     ##########################
     def test_with_units_helper(self):
@@ -454,6 +473,17 @@ class TestUnties(TestCase):
         except:
             self.fail("unitified with np array failed unexpectedly!")
 
+    def test_unitified_checks_every_element_of_arrays(self):
+        area = _.unitified(_.m**2, _.ft)(lambda x: x**2 * 0.09290304)
+        sides = np.array([1 * _.ft, 2 * _.inch])
+        squares = area(sides)
+        self.assertTrue(np.allclose(squares.magnitude, [0.09290304,
+                                                        0.09290304 / 36]))
+        sides = np.array([1 * _.ft, 2 * _.s])
+        self.assertRaises(ue.IncompatibleUnitsError, area, sides)
+        self.assertRaises(ue.IncompatibleUnitsError, area,
+                          _.units_array(np.ones(3), _.kg))
+
     def test_unitified_can_handle_strange_args_and_returns(self):
         def func(length, time_and_energy):
             time, energy = time_and_energy
@@ -497,3 +527,1000 @@ class TestUnties(TestCase):
         a = 212 * _.Btu
         a._inplace_units_of(_.kJ)
         self.assertEqual(str(a), '223.67184075543997 * kJ')
+
+    # Test units arrays #
+    #####################
+    def test_units_array_converts_like_a_unit(self):
+        a = _.units_array(np.array([1.0, 2.0]), _.ft)
+        self.assertTrue(np.allclose(a(_.inch).magnitude, [12, 24]))
+        self.assert_display_with_units_of(a(_.inch), _.inch)
+
+    def test_magnitudes_of_numpy_array_of_units(self):
+        a = np.linspace(1, 2, 3) * _.ft
+        self.assertTrue(np.allclose(_.magnitudes_of(a, _.inch), [12, 18, 24]))
+
+    def test_magnitudes_of_requires_compatible_units(self):
+        self.assertRaises(ue.IncompatibleUnitsError,
+                          _.magnitudes_of, 3 * _.s, _.m)
+
+    # Test ideal mixtures #
+    #######################
+    def test_fluid_functions_take_arrays(self):
+        T = np.array([300.0, 350.0])
+        each = [water._liquid_density(t) for t in T]
+        self.assertTrue(np.allclose(water._liquid_density(T), each))
+        self.assertEqual(str(water.liquid_density(_.units_array(T, _.K))(
+            _.mol / _.m**3).full_name), ' * mol / m**3.0')
+
+    def test_fluid_functions_check_range_of_arrays(self):
+        self.assertRaises(ue.OutOfRangeError,
+                          water._liquid_density, np.array([300.0, 700.0]))
+
+    def test_mixture_bubble_pressure_follows_raoults_law(self):
+        mix = IdealMixture(water, benzene)
+        x = np.array([[0.2, 0.8], [1, 3]])
+        T = np.array([300.0, 350.0])
+        expected = [
+            0.2 * water._liquid_vapor_pressure(300) +
+            0.8 * benzene._liquid_vapor_pressure(300),
+            0.25 * water._liquid_vapor_pressure(350) +
+            0.75 * benzene._liquid_vapor_pressure(350),
+        ]
+        self.assertTrue(np.allclose(mix._bubble_pressure(x, T), expected))
+        props = mix.properties(x, _.units_array(T, _.K))
+        self.assertTrue(np.allclose(_.magnitudes_of(props['bubble_pressure'],
+                                                    _.Pa), expected))
+        self.assertTrue(np.allclose(props['vapor_composition'].sum(axis=1), 1))
+
+    def test_mixture_of_one_component_is_the_component(self):
+        mix = IdealMixture(water)
+        self.assertTrue(np.isclose(mix._liquid_density([[1]], 320),
+                                   water._liquid_density(320)))
+        self.assertEqual(mix.MW([1]), water.MW)
+
+    # Test Peng-Robinson fluid #
+    ############################
+    def test_fluid_volumes_satisfy_pr_equation(self):
+        methane = Fluid(425.12 * _.K, 3796 * _.kPa, 0.200164)
+        vols = methane.V_pr(_.deg_c(80), 1013 * _.kPa)
+        self.assertTrue(math.isclose(vols['vapor'].value,
+                                     0.002313122971234093, rel_tol=1e-12))
+        self.assertTrue(math.isclose(vols['liquid'].value,
+                                     0.00011402510635426871, rel_tol=1e-12))
+        for vol in vols.values():
+            P = methane.P_pr(vol, _.deg_c(80), _.kPa)
+            self.assertTrue(math.isclose(P.magnitude, 1013, rel_tol=1e-9))
+
+    def test_fluid_volumes_of_arrays(self):
+        methane = Fluid(425.12 * _.K, 3796 * _.kPa, 0.200164)
+        T = np.array([250.0, 350.0, 500.0])
+        P = np.array([1e5, 1e6, 5e6])
+        vols = methane.V_pr(_.units_array(T, _.K), _.units_array(P, _.Pa))
+        for i in range(len(T)):
+            each = methane._V_pr(T[i], P[i])
+            self.assertTrue(np.isclose(vols['vapor'].value[i], each['vapor']))
+            self.assertTrue(np.isclose(vols['liquid'].value[i],
+                                       each['liquid']))
+        # Supercritical: only one root
+        self.assertTrue(np.isclose(vols['vapor'].value[2],
+                                   vols['liquid'].value[2]))
+
+    def test_fluid_saturation_curve(self):
+        steam = Fluid(water.Tc, water.Pc, water._omega)
+        T = _.units_array(np.linspace(300, 700, 41), _.K)
+        curve = steam.saturation_curve(T, units=_.kPa)
+        Ts = curve['T'].value
+        self.assertTrue(Ts[-1] < water._Tc)
+        self.assertEqual(len(Ts), len(curve['P'].magnitude))
+        # Close to the DIPPR correlation (PR is not great for water when cold)
+        P = curve['P'].magnitude[Ts == 450][0]
+        self.assertTrue(math.isclose(P, water._liquid_vapor_pressure(450) /
+                                     1000, rel_tol=0.05))
+        # Equal fugacities of both phases
+        RT = _.Rc.value * Ts
+        Zv = curve['vapor'].value * curve['P'].value / RT
+        Zl = curve['liquid'].value * curve['P'].value / RT
+        ln_phi_v = steam._ln_phi(Zv, Ts, curve['P'].value)
+        ln_phi_l = steam._ln_phi(Zl, Ts, curve['P'].value)
+        self.assertTrue(np.allclose(ln_phi_v, ln_phi_l, atol=1e-9))
+
+    # Test inverse correlations #
+    #############################
+    def test_sat_temp_inverts_vapor_pressure(self):
+        for fluid in [water, benzene]:
+            T = np.linspace(300, 500, 50)
+            P = fluid._liquid_vapor_pressure(T)
+            self.assertTrue(np.allclose(fluid._sat_temp(P), T, rtol=1e-12))
+        T = np.linspace(60, 130, 50)
+        self.assertTrue(np.allclose(air._sat_temp(air._vapor_pressure(T)), T,
+                                    rtol=1e-12))
+
+    def test_sat_temp_with_units(self):
+        Tboil = benzene.sat_temp(1 * _.atm)
+        self.assertTrue(math.isclose(Tboil.value, benzene._Tboil, rel_tol=1e-3))
+        Ts = water.sat_temp(_.units_array(np.array([1.0, 2.0]), _.atm))
+        self.assertTrue(np.allclose(Ts.value, [373.168, 393.839], rtol=1e-5))
+
+    def test_sat_temp_checks_range(self):
+        self.assertRaises(ue.OutOfRangeError, water._sat_temp, 1e8)
+
+    # Test derivatives of correlations #
+    ####################################
+    def test_derivatives_match_finite_differences(self):
+        for fluid in [water, benzene, air]:
+            names = [n for n in dir(fluid)
+                     if n.startswith('_') and n.endswith('_dT')]
+            self.assertTrue(names)
+            for name in names:
+                func = getattr(fluid, name[:-3])
+                derivative = getattr(fluid, name)
+                tested = 0
+                for T in np.append(np.linspace(21, 1501, 75), [2, 59.15, 276]):
+                    try:
+                        exact = derivative(T)
+                    except ue.OutOfRangeError:
+                        continue
+                    h = T * 1e-6
+                    approx = (func(T + h, False) - func(T - h, False)) / (2 * h)
+                    self.assertTrue(math.isclose(exact, approx, rel_tol=1e-5,
+                                                 abs_tol=1e-9), name)
+                    tested += 1
+                self.assertTrue(tested, name)
+
+    def test_derivatives_are_vectorized(self):
+        T = np.linspace(300, 400, 5)
+        dP = water._liquid_vapor_pressure_dT(T)
+        self.assertEqual(dP.shape, (5,))
+        self.assertTrue(np.all(dP > 0))
+        dP = water.liquid_vapor_pressure_dT(_.units_array(T, _.K))
+        self.assertTrue(np.allclose(dP.value,
+                                    water._liquid_vapor_pressure_dT(T)))
+
+    def test_units_fsolve_with_derivative(self):
+        def vp_error(T):
+            return water.liquid_vapor_pressure(T) - 1 * _.atm
+        Tboil = _.units_fsolve(vp_error, 350 * _.K,
+                               water.liquid_vapor_pressure_dT)
+        self.assertTrue(math.isclose(Tboil.magnitude, 373.16783899,
+                                     rel_tol=1e-8))
+
+    def test_units_fsolve_returns_the_units_of_the_guess(self):
+        x = _.units_fsolve(lambda x: x * 3 * _.N / _.m - 2 * _.N, 4 * _.ft)
+        x.must_have_same_units_as(_.ft)
+        self.assertTrue(math.isclose(x.value, 2 / 3))
+
+    def test_units_fsolve_systems(self):
+        calls = []
+        def flash(x):
+            calls.append(x)
+            T, V, n = x
+            return [water.liquid_vapor_pressure(T) - 1 * _.atm,
+                    V * T - 30 * _.m**3 * _.K,
+                    n * _.Rc * T / V -
+                    _.units_array(np.array([2., 4]), _.kPa)]
+        def jac(x):
+            T, V, n = x
+            return [[water.liquid_vapor_pressure_dT(T), 0, 0],
+                    [V, T, 0],
+                    [n * _.Rc / V, -n * _.Rc * T / V**2,
+                     _.units_array(np.diag([1., 1]), _.Rc * T / V)]]
+        guess = [350 * _.K, 50 * _.l, _.units_array(np.full(2, 0.1), _.mol)]
+        for fprime in [None, jac]:
+            del calls[:]
+            T, V, n = _.units_fsolve(flash, guess, fprime)
+            self.assertTrue(math.isclose(T.value, 373.16783899))
+            V.must_have_same_units_as(_.l)
+            self.assertTrue(math.isclose(V.value, 30 / T.value))
+            self.assertTrue(np.allclose(n(_.mol).magnitude,
+                                        np.array([2e3, 4e3]) * V.value /
+                                        (_.Rc.value * T.value)))
+            # The trial call is fsolve's first call too
+            self.assertTrue(calls[0] is guess)
+            self.assertFalse(any(x[0].value == 350 and x[1](_.l) == 50 * _.l
+                                 and np.all(x[2].magnitude == 0.1)
+                                 for x in calls[1:]))
+
+    def test_units_fsolve_checks_jacobian_units(self):
+        self.assertRaises(ue.IncompatibleUnitsError, _.units_fsolve,
+                          lambda x: x - 1 * _.m, 2 * _.m, lambda x: 1 * _.s)
+
+    # Test heat capacity integrals #
+    ################################
+    def test_heat_capacity_integrals_match_quadrature(self):
+        from scipy.integrate import quad
+        ranges = {water: {'solid': (10, 270), 'liquid': (280, 530),
+                          'ideal_gas': (150, 2200)},
+                  benzene: {'solid': (50, 270), 'liquid': (280, 490),
+                            'ideal_gas': (30, 1400)},
+                  air: {'solid': (1.5, 3.5), 'liquid': (80, 110),
+                        'ideal_gas': (60, 1400)}}
+        for fluid, phases in ranges.items():
+            for phase, (T1, T2) in phases.items():
+                Cp = getattr(fluid, '_%s_heat_capacity' % phase)
+                dH = getattr(fluid, '_%s_heat_capacity_integral' % phase)
+                dS = getattr(fluid, '_%s_heat_capacity_integral_over_T' % phase)
+                self.assertTrue(math.isclose(dH(T1, T2), quad(Cp, T1, T2)[0],
+                                             rel_tol=1e-10))
+                self.assertTrue(math.isclose(
+                    dS(T1, T2), quad(lambda T: Cp(T) / T, T1, T2)[0],
+                    rel_tol=1e-10))
+
+    def test_heat_capacity_integrals_are_vectorized(self):
+        T1 = np.array([300.0, 350.0])
+        T2 = np.array([[400.0], [500.0]])
+        dH = water._ideal_gas_heat_capacity_integral(T1, T2)
+        self.assertEqual(dH.shape, (2, 2))
+        self.assertTrue(math.isclose(
+            dH[1, 0], water._ideal_gas_heat_capacity_integral(300, 500)))
+        dS = water.liquid_heat_capacity_integral_over_T(
+            _.units_array(T1, _.K), 400 * _.K)
+        dS.must_have_same_units_as(_.J / (_.mol * _.K))
+        self.assertTrue(np.allclose(
+            dS.value, water._liquid_heat_capacity_integral_over_T(T1, 400)))
+
+    # Test transcendental eigenvalues #
+    ###################################
+    def test_single_eigenvalues(self):
+        # Values from the usual textbook tables
+        self.assertTrue(math.isclose(transcendentals.Eplane_wall(1, 10),
+                                     1.4289, rel_tol=1e-4))
+        self.assertTrue(math.isclose(transcendentals.Ecylinder(1, 1),
+                                     1.2558, rel_tol=1e-4))
+        self.assertTrue(math.isclose(transcendentals.Esphere(1, 1),
+                                     math.pi / 2, rel_tol=1e-12))
+        self.assertTrue(math.isclose(transcendentals.Ecylinder(2, 100),
+                                     5.4652, rel_tol=1e-4))
+
+    def test_eigenvalue_matrices(self):
+        Bi = np.logspace(-3, 3, 50)
+        for shape in ['plane_wall', 'cylinder', 'sphere']:
+            roots = getattr(transcendentals, shape + '_eigenvalues')(Bi, 30)
+            self.assertEqual(roots.shape, (50, 30))
+            self.assertTrue(np.all(np.diff(roots, axis=1) > 0))
+            residual = transcendentals._h(shape, roots, Bi[:, np.newaxis])
+            self.assertTrue(np.allclose(residual, 0, atol=1e-9))
+            table = transcendentals.EigenvalueTable(shape, 30, points=21)
+            self.assertTrue(np.allclose(table(Bi), roots, rtol=1e-12))
+        self.assertEqual(transcendentals.sphere_eigenvalues(1, 4).shape, (4,))
+
+    # Test transient conduction #
+    #############################
+    def test_conduction_series_solve_heat_equation(self):
+        Bi, r, Fo, h = 3, 0.5, 0.3, 1e-4
+        for k, shape in enumerate(['plane_wall', 'cylinder', 'sphere']):
+            theta = getattr(conduction, '_%s_theta' % shape)
+
+            def th(r, Fo):
+                return theta(r, Fo, Bi, tol=1e-14)
+
+            dt = (th(r, Fo + h) - th(r, Fo - h)) / (2 * h)
+            d2r = (th(r + h, Fo) - 2 * th(r, Fo) + th(r - h, Fo)) / h**2
+            dr = (th(r + h, Fo) - th(r - h, Fo)) / (2 * h)
+            self.assertTrue(math.isclose(dt, d2r + k / r * dr, abs_tol=1e-6))
+            # Convection at the surface
+            dr = (th(1 + h, Fo) - th(1 - h, Fo)) / (2 * h)
+            self.assertTrue(math.isclose(-dr, Bi * th(1, Fo), abs_tol=1e-6))
+
+    def test_conduction_Q_ratio_is_average_of_theta(self):
+        r = np.linspace(0, 1, 2001)
+        for k, shape in enumerate(['plane_wall', 'cylinder', 'sphere']):
+            theta = getattr(conduction, '_%s_theta' % shape)(r, [0.1, 0.5], 2)
+            average = (k + 1) * np.trapezoid(theta * r[:, np.newaxis]**k, r,
+                                             axis=0)
+            Q = getattr(conduction, '_%s_Q_ratio' % shape)([0.1, 0.5], 2)
+            self.assertTrue(np.allclose(1 - average, Q, atol=1e-6))
+
+    def test_conduction_with_units(self):
+        x = _.units_array(np.linspace(0, 1, 3), _.cm)
+        t = _.units_array(np.array([1, 10, 100]), _.minute)
+        alpha = 1e-7 * _.m**2 / _.s
+        theta = conduction.plane_wall_theta(x, t, 10 * _.mm, alpha, 2)
+        self.assertEqual(theta.shape, (3, 3))
+        self.assertTrue(math.isclose(theta[0, 1], 0.587587853010055))
+        self.assertRaises(ue.IncompatibleUnitsError, conduction.sphere_theta,
+                          x, 1 * _.m, 1 * _.cm, alpha, 2)
+
+    # Test F values #
+    #################
+    def test_f_values_with_arrays(self):
+        Tso = np.array([350, 340, 380, 350])
+        Tto = np.array([330, 360, 340, 350])
+        F = f_values.F1s2t(400, Tso, 300, Tto)
+        self.assertEqual(F.shape, (4,))
+        self.assertTrue(math.isclose(F[0], f_values.F1s2t(400, 350, 300, 330)))
+        self.assertTrue(np.isnan(F[1]))  # Temperature cross
+        F = f_values.F1s2t(400 * _.K, _.units_array(Tso, _.K), 300 * _.K,
+                           _.units_array(Tto, _.K))
+        self.assertTrue(math.isclose(F[2], 0.9716541026362188))
+
+    def test_f_values_near_R_of_one(self):
+        Tto = np.array([350 - 1e-9, 350, 350 + 1e-9])
+        for F in [f_values.F1s2t(400, 350, 300, Tto),
+                  f_values.F2s4t(400, 350, 300, Tto)]:
+            self.assertTrue(np.all(np.isfinite(F)))
+            self.assertTrue(np.allclose(F, F[1], rtol=1e-12))
+
+    def test_f_values_continuous_across_R_tolerance(self):
+        tol = f_values._R_tol
+        R = 1 + np.array([-1.1, -0.9, 0.9, 1.1]) * tol  # Both sides of the edge
+        self.assertTrue(np.allclose(f_values._F1(R, 0.4),
+                                    f_values._F1(1 + 2 * tol, 0.4), rtol=1e-5))
+        Tso = 400 - 40 * R
+        F = f_values.F2s4t(400, Tso, 300, 340)
+        self.assertTrue(np.allclose(F, F[0], rtol=1e-5))
+
+    def test_f_values_N_shells(self):
+        args = 400, np.array([350, 380]), 300, np.array([330, 340])
+        self.assertTrue(np.allclose(f_values.FNs2Nt(1, *args),
+                                    f_values.F1s2t(*args)))
+        self.assertTrue(np.allclose(f_values.FNs2Nt(2, *args),
+                                    f_values.F2s4t(*args)))
+        F3 = f_values.FNs2Nt(3, *args)
+        self.assertTrue(np.all(F3 > f_values.F2s4t(*args)))
+
+    # Test effectiveness-NTU #
+    ##########################
+    def test_effectiveness_inverts(self):
+        NTU = np.logspace(-2, 1, 7)[:, np.newaxis]
+        Cr = np.array([0, 0.3, 1 - 1e-12, 1])
+        for name, (eff, NTU_of) in effectiveness._arrangements.items():
+            back = NTU_of(eff(NTU, Cr), Cr)
+            self.assertTrue(np.allclose(back, NTU, rtol=1e-8), name)
+        e = effectiveness._shell_and_tube(NTU, Cr, shells=3)
+        self.assertTrue(np.allclose(
+            effectiveness._shell_and_tube_NTU(e, Cr, shells=3), NTU))
+
+    def test_effectiveness_known_values(self):
+        # Cr = 0 is the same for every arrangement
+        for name, (eff, _NTU) in effectiveness._arrangements.items():
+            self.assertTrue(math.isclose(eff(2, 0), 1 - math.exp(-2)), name)
+        self.assertTrue(math.isclose(effectiveness._counterflow(1, 1), 0.5))
+        self.assertTrue(math.isclose(effectiveness._parallel(1e3, 1), 0.5))
+        self.assertTrue(np.isnan(effectiveness._parallel_NTU(0.9, 1)))
+
+    def test_effectiveness_with_units(self):
+        C_hot = 500 * _.W / _.K
+        C_cold = _.units_array(np.array([1, 2]), _.kW / _.K)
+        eff = effectiveness.effectiveness('counterflow', 0.5 * _.kW / _.K,
+                                          C_hot, C_cold)
+        self.assertTrue(math.isclose(eff[0], 0.5647334016064162))
+        UA = effectiveness.UA('counterflow', eff, C_hot, C_cold)
+        self.assertTrue(np.allclose(UA(_.W / _.K).magnitude, 500))
+        q = effectiveness.heat_rate('counterflow', 500 * _.W / _.K, C_hot,
+                                    1 * _.kW / _.K, 400 * _.K, 300 * _.K)
+        self.assertTrue(math.isclose(q.value, 500 * 100 * 0.5647334016064162))
+        self.assertRaises(ValueError, effectiveness.effectiveness, 'spiral',
+                          1, 1, 1)
+
+    # Test grid interpolation #
+    ###########################
+    def test_dli_does_not_change_its_arguments(self):
+        m11 = np.array([1.0, 10.0])
+        self.assertTrue(np.allclose(dli(1.5, 1.5, 1, 2, 1, 2, m11, 2, 3, 4),
+                                    [2.5, 4.75]))
+        self.assertTrue(np.array_equal(m11, [1.0, 10.0]))
+
+    def test_grid_interpolator_matches_dli(self):
+        x, y = np.array([0.0, 1, 3]), np.array([10.0, 20])
+        values = np.array([[1.0, 2], [3, 5], [7, 11]])
+        table = GridInterpolator((x, y), values)
+        xs, ys = np.array([0.5, 2, 3]), np.array([12.0, 15, 20])
+        expected = [dli(0.5, 12, 0, 1, 10, 20, 1, 3, 2, 5),
+                    dli(2, 15, 1, 3, 10, 20, 3, 7, 5, 11),
+                    dli(3, 20, 1, 3, 10, 20, 3, 7, 5, 11)]
+        self.assertTrue(np.allclose(table(xs, ys), expected))
+        self.assertRaises(ue.OutOfRangeError, table, 4, 15)
+        self.assertTrue(math.isclose(table(4, 15, ranged=False), 11.5))
+
+    def test_grid_interpolator_3d_with_units(self):
+        T = _.units_array(np.array([300.0, 400]), _.K)
+        P = _.units_array(np.array([1.0, 2, 4]), _.bar)
+        x = np.array([0.0, 1])
+        values = _.units_array(np.arange(12.0).reshape(2, 3, 2), _.kJ / _.kg)
+        table = GridInterpolator((T, P, x), values)
+        result = table(_.units_array(np.array([350.0, 400]), _.K),
+                       300 * _.kPa, 0.5)
+        self.assertTrue(np.allclose(result(_.J / _.kg).magnitude,
+                                    [6500, 9500]))
+        self.assertRaises(ue.IncompatibleUnitsError, table, 350 * _.K,
+                          3 * _.m, 0.5)
+
+    # Test IF97 steam #
+    ###################
+    def test_steam_matches_IF97_verification_values(self):
+        # (T, P): v, h, s, cp, from the IF97 release (in kJ)
+        values = {(300, 3e6): (0.100215168e-2, 115.331273, 0.392294792,
+                               4.17301218),
+                  (500, 3e6): (0.120241800e-2, 975.542239, 2.58041912,
+                               4.65580682),
+                  (300, 3500): (39.4913866, 2549.91145, 8.52238967,
+                                1.91300162),
+                  (700, 30e6): (0.542946619e-2, 2631.49474, 5.17540298,
+                                10.3505092)}
+        T = np.array([T for T, P in values])
+        P = np.array([P for T, P in values])
+        props = steam._properties(T, P)
+        expected = np.array(list(values.values()))
+        self.assertTrue(np.allclose(props['volume'], expected[:, 0],
+                                    rtol=1e-8))
+        for i, name in enumerate(['enthalpy', 'entropy', 'heat_capacity']):
+            self.assertTrue(np.allclose(props[name] / 1000,
+                                        expected[:, i + 1], rtol=1e-8))
+        Ps = steam._sat_pressure(np.array([300, 500, 600]))
+        self.assertTrue(np.allclose(
+            Ps, [0.353658941e4, 0.263889776e7, 0.123443146e8], rtol=1e-8))
+        self.assertTrue(np.allclose(steam._sat_temp(Ps), [300, 500, 600],
+                                    rtol=1e-8))
+
+    def test_steam_regions(self):
+        self.assertTrue(np.array_equal(
+            steam._region(np.array([300, 300, 650, 900]),
+                          np.array([1e6, 1e3, 1e6, 1e6])), [1, 2, 2, 2]))
+        self.assertTrue(np.isnan(steam._volume(650, 50e6)))  # Region 3
+        self.assertRaises(ue.OutOfRangeError, steam._volume, 1200, 1e5)
+        sat = steam._saturated_properties(373.15)
+        self.assertTrue(math.isclose(sat['pressure'], 101418, rel_tol=1e-4))
+        latent = sat['vapor']['enthalpy'] - sat['liquid']['enthalpy']
+        self.assertTrue(math.isclose(latent, 2256.4e3, rel_tol=1e-3))
+
+    def test_steam_with_units(self):
+        T = _.units_array(np.array([300.0, 700]), _.K)
+        h = steam.enthalpy(T, 0.0035 * _.MPa)
+        self.assertTrue(np.allclose(h(_.kJ / _.kg).magnitude,
+                                    [2549.91145, 3335.68375]))
+        props = steam.properties(T, 3.5 * _.kPa)
+        self.assertTrue(math.isclose(props['volume'].value[1], 92.3015898))
+        rho = steam.density(_.deg_c(25), 1 * _.atm)
+        self.assertTrue(math.isclose(rho.value, 997.05 / water._MW,
+                                     rel_tol=1e-4))
+        self.assertTrue(math.isclose(steam.sat_temp(1 * _.atm).value,
+                                     373.124, rel_tol=1e-5))
+
+    # Test ReactionSet #
+    ####################
+    def test_reaction_set_matches_kr_and_kc_t(self):
+        k_ref = [0.1 / _.s, 2 * _.m**3 / (_.mol * _.s), 5 / _.s]
+        T_ref = [300 * _.K, 350 * _.K, 400 * _.K]
+        Ea = [50 * _.kJ / _.mol, 80 * _.kJ / _.mol, 1e4 * _.cal / _.mol]
+        H = _.units_array(np.array([-20., 10, 0]), _.kJ / _.mol)
+        Kc = [3, 0.5 * _.m**3 / _.mol, 1]
+        rxns = ReactionSet(k_ref, T_ref, Ea, H, Kc)
+        T = _.units_array(np.linspace(300, 500, 5), _.K)
+        k, Kcs = rxns.k(T), rxns.Kc(T)
+        self.assertEqual(len(rxns), 3)
+        for i in range(3):
+            for j, t in enumerate(np.linspace(300, 500, 5) * _.K):
+                one = kr(t, k_ref[i], T_ref[i], Ea[i])
+                self.assertTrue(math.isclose(k[i].value[j], one.value))
+                one = kc_t(t, Kc[i], T_ref[i], H.magnitude[i] * _.kJ / _.mol)
+                value = getattr(Kcs[i], 'value', Kcs[i])[j]
+                self.assertTrue(math.isclose(value, getattr(one, 'value', one)))
+        self.assertTrue(k[1].units == (_.m**3 / (_.mol * _.s)).units)
+        matrix = rxns._k(np.linspace(300, 500, 5))
+        self.assertEqual(matrix.shape, (3, 5))
+        self.assertTrue(np.allclose(matrix[1], k[1].magnitude))
+
+    def test_reaction_set_checks_units_once(self):
+        self.assertRaises(ue.IncompatibleUnitsError, ReactionSet,
+                          [1 / _.s], [300 * _.kJ], [1 * _.kJ / _.mol])
+        self.assertRaises(ValueError, ReactionSet, [1 / _.s], [300 * _.K],
+                          [1 * _.kJ / _.mol], Kc_ref=[1])
+        rxns = ReactionSet([1 / _.s], [300 * _.K], [1 * _.kJ / _.mol])
+        self.assertRaises(ValueError, rxns.Kc, 300 * _.K)
+        self.assertRaises(ue.IncompatibleUnitsError, rxns.k, 300 * _.m)
+
+    # Test units_solve_ivp #
+    ########################
+    def test_units_solve_ivp_with_a_list_of_states(self):
+        def batch(t, y):
+            C, T = y
+            k = 0.1 / _.minute * np.exp(-4000 * _.K *
+                                        (1 / T - 1 / (300 * _.K)))
+            return [-k * C, 2 * _.K / _.minute]
+        sol = _.units_solve_ivp(batch, (0 * _.s, 10 * _.minute),
+                                [2 * _.mol / _.l, 300 * _.K], rtol=1e-10,
+                                atol=1e-12, t_eval=_.units_array(
+                                    np.array([0., 5, 10]), _.minute))
+        self.assertTrue(np.allclose(sol.t(_.minute).magnitude, [0, 5, 10]))
+        self.assertTrue(np.allclose(sol.y[1](_.K).magnitude,
+                                    [300, 310, 320]))
+        from scipy.integrate import quad
+        k = lambda t: 0.1 * np.exp(-4000 * (1 / (300 + 2 * t) - 1 / 300))
+        C = 2 * np.exp(-quad(k, 0, 10)[0])
+        self.assertTrue(math.isclose(sol.y[0].magnitude[-1], C,
+                                     rel_tol=1e-8))
+        sol.y[0].must_have_same_units_as(_.mol / _.l)
+
+    def test_units_solve_ivp_with_an_array_state(self):
+        # Cooling of many lumps at once
+        h_A_over_mc = _.units_array(np.array([1., 2, 4]), 1 / _.hr)
+        def cooling(t, T):
+            return -h_A_over_mc * (T - 293.15 * _.K)
+        T0 = _.units_array(np.full(3, 373.15), _.K)
+        sol = _.units_solve_ivp(cooling, (0 * _.hr, 1 * _.hr), T0,
+                                rtol=1e-10, atol=1e-10)
+        self.assertEqual(sol.y.magnitude.shape[0], 3)
+        final = sol.y.magnitude[:, -1]
+        self.assertTrue(np.allclose(final, 293.15 + 80 * np.exp([-1, -2, -4])))
+
+    def test_units_solve_ivp_checks_units_once(self):
+        calls = []
+        def wrong(t, y):
+            calls.append(t)
+            return [y[0] * _.K / _.m]
+        self.assertRaises(ue.IncompatibleUnitsError, _.units_solve_ivp,
+                          wrong, (0 * _.s, 1 * _.s), [1 * _.m])
+        self.assertEqual(len(calls), 1)
+        self.assertRaises(ValueError, _.units_solve_ivp,
+                          lambda t, y: [1 * _.m / _.s], (0 * _.s, 1 * _.s),
+                          [1 * _.m, 1 * _.kg])
+        self.assertRaises(ue.IncompatibleUnitsError, _.units_solve_ivp,
+                          lambda t, y: [-1.0], (0 * _.s, 1 * _.s), [1 * _.m])
+
+    def test_units_solve_ivp_compiles_fun(self):
+        calls = []
+        def batch(t, y):
+            calls.append(_.checks_on())
+            C, T = y
+            k = 0.1 / _.minute * np.exp(-4000 * _.K *
+                                        (1 / T - 1 / (300 * _.K)))
+            return [-k * C, 2 * _.K / _.minute]
+        sol = _.units_solve_ivp(batch, (0 * _.s, 10 * _.minute),
+                                [2 * _.mol / _.l, 300 * _.K], t_eval=(
+                                    _.units_array(np.array([0., 5, 10]),
+                                                  _.minute)))
+        self.assertGreater(sol.nfev, 10)
+        self.assertEqual(calls, [True, False])  # Checked, then traced
+
+        def branchy(t, y):  # Can't be compiled, so runs without checks
+            calls.append(_.checks_on())
+            return [-y[0] / _.s if y[0] > 0 * _.m else 0 * _.m / _.s]
+        del calls[:]
+        sol = _.units_solve_ivp(branchy, (0 * _.s, 1 * _.s), [1 * _.m])
+        self.assertTrue(calls[0])
+        self.assertFalse(any(calls[1:]))
+        self.assertTrue(math.isclose(sol.y[0].magnitude[-1], math.exp(-1),
+                                     rel_tol=1e-2))
+
+    # Test units_roots #
+    ####################
+    def test_units_roots_springs(self):
+        k = _.units_array(np.linspace(1, 10, 1000), _.N / _.m)
+        F = _.units_array(np.linspace(2, 3, 1000), _.N)
+        exact = np.linspace(2, 3, 1000) / np.linspace(1, 10, 1000)
+        for kwargs in [{'bracket': (0 * _.m, 10 * _.m)},
+                       {'bracket': (0 * _.m, 10 * _.m),
+                        'fprime': lambda x: k},
+                       {'guess': 1 * _.ft},
+                       {'guess': 1 * _.ft, 'fprime': lambda x: k}]:
+            x, converged = _.units_roots(lambda x: k * x - F, **kwargs)
+            self.assertTrue(converged.all())
+            self.assertTrue(np.allclose(x.value, exact, rtol=1e-11))
+
+    def test_units_roots_vapor_pressure(self):
+        P = _.units_array(np.linspace(0.5, 10, 20), _.atm)
+        def error(T):
+            return water.liquid_vapor_pressure(T, ranged=False) - P
+        def slope(T):
+            return water.liquid_vapor_pressure_dT(T, ranged=False)
+        T1, c1 = _.units_roots(error, (280 * _.K, 640 * _.K))
+        T2, c2 = _.units_roots(error, (280 * _.K, 640 * _.K), fprime=slope)
+        T2.must_have_same_units_as(_.K)
+        self.assertTrue(c1.all() and c2.all())
+        self.assertTrue(np.allclose(T1.magnitude, T2.magnitude, rtol=1e-12))
+        self.assertTrue(np.allclose(water._liquid_vapor_pressure(T1.magnitude),
+                                    P.value, rtol=1e-10))
+        Tboil = _.units_fsolve(lambda T: water.liquid_vapor_pressure(T) -
+                               1 * _.atm, 350 * _.K)
+        self.assertTrue(math.isclose(T2.magnitude[1], Tboil.value,
+                                     rel_tol=1e-8))
+
+    def test_units_roots_reports_failures(self):
+        lo = _.units_array(np.array([0., 3, 0]), _.m)
+        x, converged = _.units_roots(lambda x: x**2 - 4 * _.m**2,
+                                     (lo, 5 * _.m))
+        self.assertEqual(list(converged), [True, False, True])
+        self.assertTrue(np.allclose(x.magnitude[[0, 2]], 2))
+        x, converged = _.units_roots(lambda x: x - 1 * _.m, guess=0 * _.m,
+                                     maxiter=0)
+        self.assertFalse(converged.any())
+        self.assertRaises(ue.IncompatibleUnitsError, _.units_roots,
+                          lambda x: x - 1 * _.m, (0 * _.m, 2 * _.m),
+                          fprime=lambda x: 1 * _.s)
+        self.assertRaises(ValueError, _.units_roots, lambda x: x)
+
+    # Test traced #
+    ###############
+    def test_traced_matches_the_function(self):
+        def rate(T, C):
+            k = 0.1 / _.minute * np.exp(-4000 * _.K *
+                                        (1 / T - 1 / (300 * _.K)))
+            return -k * C, T.magnitude
+        fast = _.traced(rate)
+        for T in [310 * _.K, 320 * _.K]:
+            (r1, m1), (r2, m2) = rate(T, 2 * _.mol / _.l), fast(T, 2 * _.mol /
+                                                                _.l)
+            r1.must_have_same_units_as(r2)
+            self.assertEqual(r1.full_name, r2.full_name)
+            self.assertTrue(math.isclose(r1.magnitude, r2.magnitude,
+                                         rel_tol=1e-12))
+            self.assertEqual(m1, m2)
+        # Arrays go through the same compiled version
+        r, T = fast(_.units_array(np.array([310., 320]), _.K),
+                    2 * _.mol / _.l)
+        self.assertTrue(np.allclose(r.magnitude, [
+            rate(t * _.K, 2 * _.mol / _.l)[0].magnitude for t in T]))
+        self.assertEqual(len(fast.compiled_source), 1)
+        fast(560 * _.R, 2 * _.mol / _.l)
+        self.assertEqual(len(fast.compiled_source), 2)
+
+    def test_traced_conversions_are_folded_in(self):
+        @_.traced
+        def spring_energy(x, k):
+            return (k * x**2 / 2)(_.mJ)
+        energy = spring_energy(3 * _.mm, 2 * _.N / _.m)
+        self.assertTrue(math.isclose(energy.magnitude, 0.009))
+        self.assertEqual(energy.full_name, _.mJ.full_name)
+        energy = spring_energy(_.units_array(np.array([1., 2]), _.inch),
+                               2 * _.N / _.m)
+        self.assertTrue(np.allclose(energy.magnitude, [0.64516, 2.58064]))
+        self.assertNotIn('mJ', spring_energy.compiled_source[0])
+
+    def test_traced_falls_back(self):
+        @_.traced
+        def distance(x):
+            if x > 0 * _.m:
+                return x
+            return -x
+        self.assertEqual(distance(-2 * _.m), 2 * _.m)
+        self.assertEqual(distance(3 * _.m), 3 * _.m)
+        self.assertEqual(distance.compiled_source, [])
+
+        @_.traced
+        def doubles(x):
+            return {'a': x * 2, 'b': np.array([x, x])}
+        self.assertEqual(doubles(1 * _.m)['a'], 2 * _.m)
+        self.assertEqual(doubles(5 * _.m)['a'], 10 * _.m)
+        self.assertEqual(doubles(5 * _.m)['b'][0], 5 * _.m)
+        self.assertEqual(doubles.compiled_source, [])
+
+        @_.traced
+        def wrong(x):
+            return x + 1 * _.s
+        self.assertRaises(ue.IncompatibleUnitsError, wrong, 1 * _.m)
+        self.assertRaises(ue.IncompatibleUnitsError, wrong, 1 * _.m)
+        self.assertEqual(wrong(1 * _.s), 2 * _.s)
+
+    def test_traced_raises_real_errors_without_rerunning(self):
+        calls = []
+
+        @_.traced
+        def broken(x):
+            calls.append(x)
+            return x.no_such_method()
+        self.assertRaises(AttributeError, broken, 1 * _.m)
+        self.assertEqual(len(calls), 1)  # Only the tracing run
+
+    def test_traced_keeps_a_limited_number_of_versions(self):
+        @_.traced
+        def double(x):
+            return 2 * x
+        units = [_.m, _.ft, _.inch, _.s, _.kg, _.K, _.mol, _.A]
+        for unit in units * 2:  # 40 sets of units, each twice
+            for power in range(1, 6):
+                self.assertEqual(double(3 * unit**power), 6 * unit**power)
+        self.assertEqual(len(double.compiled_source),
+                         _.tracing._max_versions)
+
+    # Test unchecked mode #
+    #######################
+    def test_unchecked_skips_checks(self):
+        with _.unchecked():
+            self.assertFalse(_.checks_on())
+            (1 * _.m + 1 * _.s).must_have_same_units_as(_.m)
+            self.assertTrue(_.m < 2 * _.s)
+            steam._volume(2000, 1e5)  # Extrapolated
+            _.magnitudes_of(1 * _.kg, _.m)
+        self.assertTrue(_.checks_on())
+        self.assertRaises(ue.IncompatibleUnitsError, lambda: 1 * _.m + _.s)
+        try:
+            with _.unchecked():
+                raise KeyError
+        except KeyError:
+            pass
+        self.assertTrue(_.checks_on())
+
+    def test_unchecked_keeps_values_right(self):
+        def model():
+            length = 3 * _.ft
+            return [length * 2 * _.m, (5 * _.lbf / length)(_.N / _.m),
+                    length(_.inch), (length**2)(_.acre), 1 * _.atm + 2 * _.psi,
+                    water.liquid_density(350 * _.K)]
+        checked = model()
+        with _.unchecked():
+            fast = model()
+            self.assertEqual(str(1 * _.ft), '0.3048 * m')
+        for a, b in zip(checked, fast):
+            a.must_have_same_units_as(b)
+            self.assertTrue(math.isclose(a.value, b.value, rel_tol=1e-14))
+        for a, b in zip(checked[1:4], fast[1:4]):  # Converted
+            self.assertTrue(math.isclose(a.magnitude, b.magnitude,
+                                         rel_tol=1e-14))
+        self.assertEqual(str(1 * _.ft), '1.0 * ft')
+
+    def test_unchecked_values_in_checked_mode(self):
+        with _.unchecked():
+            length = 3 * _.ft
+            pressure = 2 * _.kPa
+        self.assertEqual(str(length), '0.9144000000000001 * m')
+        self.assertEqual(length + 1 * _.m, 1.9144 * _.m)
+        self.assertEqual(str((length + 1 * _.m).full_name), ' * m')
+        self.assertEqual(str((length * _.s).full_name), ' * m * s')
+        self.assertEqual(length * _.s, 0.9144 * _.m * _.s)
+        self.assertEqual(pressure / length, 2000 / 0.9144 * _.Pa / _.m)
+        self.assertEqual(str(length.normalized()), '1.0 * m')
+        self.assertEqual(length(_.inch), 36 * _.inch)
+        self.assertRaises(ue.IncompatibleUnitsError, lambda: length + _.s)
+
+    # Test lazy arrays #
+    ####################
+    def test_lazy_matches_eager(self):
+        x = np.linspace(1, 2, 50001)
+        length = _.lazy(_.units_array(x, _.ft))
+        area = length * 2 * _.m + 3 * _.m**2
+        self.assertTrue(str(area).startswith('Lazy['))
+        self.assertTrue(np.allclose(_.magnitudes_of(area, _.m**2),
+                                    x * 0.3048 * 2 + 3))
+        self.assertTrue(np.allclose(_.magnitudes_of(area(_.ft**2), _.ft**2),
+                                    (x * 0.3048 * 2 + 3) / 0.3048**2))
+        ratio = length / (1 * _.inch)
+        self.assertTrue(np.allclose(np.exp(-ratio).magnitude,
+                                    np.exp(-x * 12)))
+        self.assertTrue(np.allclose((np.sqrt(area) * 2).magnitude,
+                                    np.sqrt(x * 0.3048 * 2 + 3) * 2))
+        self.assertEqual(area.quantity, 'area')
+        result = area.evaluate()
+        self.assertIs(area.evaluate(), result)  # Only computed once
+        self.assertEqual(str(area), str(result))
+
+    def test_lazy_checks_units_before_evaluating(self):
+        T = _.lazy(_.units_array(np.linspace(300, 400, 10), _.K))
+        self.assertRaises(ue.IncompatibleUnitsError, lambda: T + 1 * _.m)
+        self.assertRaises(TypeError, lambda: np.exp(T))
+        q = 2 * _.kg / _.s * (4.18 * _.kJ / (_.kg * _.K)) * (T - 300 * _.K)
+        q.must_have_same_units_as(_.W)
+        self.assertIsNone(q._result)
+        self.assertTrue(np.allclose(q(_.kW).magnitude,
+                                    8.36 * np.linspace(0, 100, 10)))
+        self.assertTrue(_.lazy(3 * _.ft) * 2 < 2 * _.m)
+
+    def test_lazy_powers_of_quantities_with_units(self):
+        x = np.array([1., 2., 3.])
+        for units in [_.m, _.ft]:
+            length = _.units_array(x, units)
+            for power, number in [(2, 2), (0.5, 0.5), (3 * _.m / _.m, 3)]:
+                result = _.lazy(length)**power
+                self.assertTrue(np.allclose(
+                    _.magnitudes_of(result, _.m**number),
+                    _.magnitudes_of(length, _.m)**number))
+        ratio = _.lazy(_.units_array(x, _.m / _.m))
+        self.assertTrue(np.allclose((2**ratio).magnitude, 2**x))
+        self.assertRaises(TypeError, lambda: _.lazy(length)**ratio)
+        self.assertRaises(TypeError, lambda: ratio**(1 * _.m))
+        self.assertRaises(TypeError, lambda: 2**_.lazy(length))
+
+    def test_lazy_conversions_are_views(self):
+        x = np.linspace(1, 2, 11)
+        pressures = _.units_array(x, _.psi)
+        x = pressures.magnitude
+        view = _.lazy(pressures)(_.Pa)(_.kPa)
+        self.assertIs(view._leaves[view._expression], x)
+        self.assertTrue(np.allclose(view.magnitude, pressures(_.kPa).magnitude))
+        same = view(_.psi).evaluate()  # Scales back to 1: no copy
+        self.assertTrue(np.shares_memory(same.magnitude, x))
+        self.assertRaises(ValueError, same.to_, _.kPa)
+        self.assertTrue(np.allclose(pressures.magnitude, np.linspace(1, 2, 11)))
+        total = view * 2 + 1 * _.atm
+        self.assertTrue(np.allclose(total(_.Pa).magnitude,
+                                    x * 6894.75729317 * 2 + 101325))
+        self.assertTrue(np.allclose((-view).magnitude, -view.magnitude))
+
+    # Test dtypes and in-place conversion #
+    #######################################
+    def test_float32_stays_float32(self):
+        x = np.linspace(1, 2, 5, dtype=np.float32)
+        p = _.units_array(x, _.psi)
+        for result in [p(_.kPa), p + 1 * _.kPa, p * 2, p / (2 * _.m), p**2,
+                       -p, abs(p), _.lazy(p)(_.kPa) * 2 + 1 * _.atm]:
+            self.assertEqual(result.magnitude.dtype, np.float32)
+        self.assertEqual(_.magnitudes_of(p, _.Pa).dtype, np.float32)
+
+    def test_to_converts_in_place(self):
+        x = np.linspace(1, 2, 5, dtype=np.float32)
+        p = _.units_array(x, _.psi, copy=False)
+        self.assertIs(p.to_(_.kPa), p)
+        self.assertIs(p.magnitude, x)
+        self.assertEqual(x.dtype, np.float32)
+        self.assertTrue(np.allclose(x, np.linspace(1, 2, 5) * 6.89475729))
+        self.assertEqual(str(p.full_name), ' * kPa')
+        self.assertTrue(np.allclose(p(_.psi).magnitude, np.linspace(1, 2, 5)))
+        length = 3 * _.ft
+        length.to_(_.inch)
+        self.assertEqual(length, 36 * _.inch)
+        self.assertEqual(length.magnitude, (3 * _.ft)(_.inch).magnitude)
+        self.assertEqual(str(_.ft.full_name), ' * ft')  # Units left alone
+
+    def test_to_leaves_the_arrays_of_slices_alone(self):
+        p = _.units_array(np.array([1., 2, 3, 4]), _.psi)
+        self.assertRaises(ValueError, p[0:2].to_, _.kPa)
+        self.assertTrue(np.array_equal(p.magnitude, [1, 2, 3, 4]))
+        self.assertTrue(np.allclose(p[0:2](_.kPa).magnitude,
+                                    [6.89475729, 13.78951459]))
+        self.assertTrue(np.allclose(p[[0, 1]].to_(_.kPa).magnitude,
+                                    [6.89475729, 13.78951459]))  # A copy
+        self.assertEqual(p[1].to_(_.kPa), 2 * _.psi)
+        self.assertTrue(np.array_equal(p.magnitude, [1, 2, 3, 4]))
+
+    # Test parse_units #
+    ####################
+    def test_parse_units_reads_printed_units(self):
+        for units in [_.kg * _.m**2 / _.s**2, _.psi / _.minute, 1 / _.s,
+                      _.ft * _.yd, _.W / (_.m**2 * _.K), _.m**0.5, _.m / _.m]:
+            parsed = _.parse_units(str(units.full_name))
+            self.assertEqual(parsed, units.normalized())
+            self.assertEqual(str(parsed), str(units.normalized()))
+        self.assertEqual(_.parse_units('1000 * m**(-2)'), 1000 / _.m**2)
+        self.assertEqual(str(_.parse_units('ft * yd').full_name),
+                         ' * ft * yd')
+
+    def test_parse_units_rejects_bad_strings(self):
+        for string in ['foo', 'm *', '(m', 'm ** x', 'm)', 'm m', 'print',
+                       '__import__']:
+            self.assertRaises(ue.UnitStringError, _.parse_units, string)
+
+    # Test saved units arrays #
+    ###########################
+    def test_save_and_load_units_array(self):
+        data = np.linspace(0, 1, 101, dtype=np.float32)
+        pressures = _.units_array(data, _.psi / _.minute)
+        with tempfile.TemporaryDirectory() as folder:
+            filename = _.save_units_array(os.path.join(folder, 'p'),
+                                          pressures)
+            self.assertTrue(filename.endswith('p.npy'))
+            self.assertTrue(os.path.exists(os.path.join(folder,
+                                                        'p.units.json')))
+            self.assertTrue(np.array_equal(np.load(filename), data))
+
+            loaded = _.load_units_array(filename)
+            self.assertIsInstance(loaded.magnitude, np.memmap)
+            self.assertEqual(loaded.magnitude.dtype, np.float32)
+            self.assertEqual(str(loaded.full_name), ' * psi / minute')
+            part = loaded[10:20]
+            self.assertTrue(np.shares_memory(part.magnitude,
+                                             loaded.magnitude))
+            self.assertTrue(np.allclose(part(_.Pa / _.s).magnitude,
+                                        pressures(_.Pa / _.s).magnitude[10:20]))
+            del loaded, part  # Let go of the file before it's deleted
+
+    def test_load_units_array_checks_dimensions(self):
+        with tempfile.TemporaryDirectory() as folder:
+            filename = _.save_units_array(os.path.join(folder, 'x.npy'),
+                                          _.units_array(np.ones(3), _.m))
+            with open(os.path.join(folder, 'x.units.json'), 'w') as f:
+                f.write('{"units": " * m", "dimensions": {"s": 1.0}}')
+            self.assertRaises(ue.IncompatibleUnitsError,
+                              _.load_units_array, filename)
+
+    # Test tables #
+    ###############
+    def test_save_and_load_table(self):
+        columns = {
+            'T': _.units_array(np.linspace(300, 400, 1001), _.K),
+            'P': _.units_array(np.linspace(1, 2, 1001, dtype=np.float32),
+                               _.atm)(_.kPa),
+            'id': np.arange(1001),
+            'grid': _.units_array(np.ones((3, 4)), _.W / _.m**2),
+            'every other': _.units_array(np.arange(10.)[::2], _.s),
+            'none': _.units_array(np.empty(0), _.m),
+            'length': 3 * _.ft,
+        }
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, 'run.unties')
+            _.save_table(filename, columns)
+            for mode in ['r', None]:
+                loaded = _.load_table(filename, mode)
+                self.assertEqual(list(loaded), list(columns))
+                for name, column in columns.items():
+                    if name == 'id':
+                        self.assertTrue(np.array_equal(loaded[name], column))
+                        continue
+                    self.assertEqual(str(loaded[name].full_name),
+                                     str(column.full_name))
+                    self.assertEqual(np.asarray(loaded[name].magnitude).dtype,
+                                     np.asarray(column.magnitude).dtype)
+                    self.assertTrue(np.array_equal(loaded[name].magnitude,
+                                                   column.magnitude))
+            self.assertIsInstance(loaded['T'].magnitude.base, np.ndarray)
+            del loaded
+
+    def test_load_table_checks_what_it_reads(self):
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, 'x.unties')
+            with open(filename, 'wb') as f:
+                f.write(b'not a table')
+            self.assertRaises(ValueError, _.load_table, filename)
+            self.assertRaises(TypeError, _.save_table, filename,
+                              {'x': np.linspace(1, 2, 3) * _.m})
+
+    # Test text columns #
+    #####################
+    def text_columns(self):
+        return {'T': _.units_array(np.array([300, 350.1, np.nan]), _.K),
+                'rate': _.units_array(np.array([1 / 3, 2, 3]), 1 / _.s),
+                'q': _.units_array(np.array([1.5, 2, 0]), _.kW / _.m**2),
+                'ratio': _.units_array(np.array([.1, .2, .3]), _.m / _.m),
+                'id': np.array([1, 2, 3])}
+
+    def assert_same_columns(self, columns, other):
+        self.assertEqual(list(columns), list(other))
+        for name, column in columns.items():
+            if hasattr(column, 'units'):
+                self.assertEqual(str(other[name].full_name),
+                                 str(column.full_name))
+                column, other_column = column.magnitude, other[name].magnitude
+            else:
+                other_column = other[name]
+            self.assertTrue(np.array_equal(column, other_column,
+                                           equal_nan=True))
+
+    def test_csv_round_trip(self):
+        columns = self.text_columns()
+        text = _.format_csv(columns)
+        self.assertEqual(text.split('\n')[0],
+                         'T [K],rate [/ s],q [kW / m**2.0],ratio [],id')
+        self.assert_same_columns(columns, _.parse_csv(text))
+        self.assert_same_columns(columns, _.parse_csv(
+            text.replace('\n', '\r\n').rstrip()))
+        self.assertRaises(ValueError, _.format_csv, {'a,b': np.ones(2)})
+
+    def test_csv_rejects_bad_columns_and_rows(self):
+        self.assertRaises(ValueError, _.format_csv,
+                          {'a': np.ones(2), 'b': np.ones(3)})
+        self.assertRaises(ValueError, _.format_csv, {'a': np.ones((2, 2))})
+        for text in ['a,b\n1,x\n', 'a,b\n1,,2\n3,4\n', 'a,b\n1,2,3\n4\n',
+                     'a,b\n1,\n3,4\n', 'a,b\n1,2\n\n3,4\n', 'a\n1\n\n2\n',
+                     'a,b\n1,2 3\n']:
+            self.assertRaises(ValueError, _.parse_csv, text)
+        parsed = _.parse_csv('a [m],b\n1,2\n3,4\n\n')
+        self.assertTrue(np.array_equal(parsed['a'].magnitude, [1, 3]))
+        self.assertTrue(np.array_equal(parsed['b'], [2, 4]))
+
+    def test_json_round_trip(self):
+        columns = self.text_columns()
+        text = _.format_json(columns)
+        self.assertEqual(text.count('kW'), 1)
+        self.assert_same_columns(columns, _.parse_json(text))
+
+    def test_parse_units_is_cached(self):
+        self.assertIsNot(_.parse_units('kPa'), _.parse_units('kPa'))
+        hits = _.unit_helpers._parse_units.cache_info().hits
+        _.parse_units('kPa').magnitude = 5  # Doesn't change the cached one
+        self.assertEqual(_.parse_units('kPa').magnitude, 1)
+        self.assertEqual(_.unit_helpers._parse_units.cache_info().hits,
+                         hits + 2)
+
+    def test_parse_units_sees_redefined_units(self):
+        _.inch.conversion('hnd', 'hand', 4)
+        self.assertEqual(_.parse_units('hnd'), 4 * _.inch)
+        columns = {'height': _.units_array(np.array([15.]),
+                                           _.parse_units('hnd'))}
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, 'horses.unties')
+            _.save_table(filename, columns)
+            _.inch.conversion('hnd', 'hand', 5)
+            self.assertEqual(_.parse_units('hnd'), 5 * _.inch)
+            self.assertRaises(ue.UnitStringError, _.load_table, filename)
+            _.inch.conversion('hnd', 'hand', 4)
+            height = _.load_table(filename)['height']
+            self.assertEqual(str(height.full_name), ' * hnd')
+            self.assertEqual(height.magnitude[0], 15)
@@ -0,0 +1,411 @@
+"""Compile functions written with units into fast functions of plain numbers
+
+The units of a model usually don't change between calls, only the numbers do.
+`traced` runs a function once with tracers: stand-ins for the arguments that
+do the real units_group math (so every units check in the function still
+happens) and also record it. The record is compiled into a function of plain
+numbers (or numpy arrays), with every conversion factor folded into its
+constants, and later calls with arguments in the same units just run that.
+
+    >>> @traced
+    >>> def spring_energy(x, k):
+    >>>     return (k * x**2 / 2)(mJ)
+    >>>
+    >>> spring_energy(3 * mm, 2 * N / m)
+    0.009000000000000001 * mJ
+    >>> spring_energy(units_array(np.array([1., 2]), inch), 2 * N / m)
+    [0.64516 2.58064] * mJ
+
+Arguments in new units (inch instead of mm above) are traced again, and the
+most recently used compiled versions are kept (up to `_max_versions`). A
+function can't be compiled if what it does depends on the numbers in its
+arguments (like `if x > 0 * m:`), or if it uses something a tracer can't stand
+in for (like `math.exp` or indexing). Those functions just run normally, like
+`traced` wasn't there, except that the first call with new units runs the
+function twice (once to try tracing it), so side effects happen twice then.
+Any other error while tracing (like an IncompatibleUnitsError) is a real error
+in the function, and is raised. See `compiled_source` for what a traced
+function was compiled to.
+
+Everything the function reads besides its arguments (like other units_groups
+or arrays) is frozen into the compiled version when it's traced.
+"""
+
+from unties.units_group import UnitsGroup
+
+
+class _Untraceable(Exception):
+    """The function did something the tracers can't record"""
+
+
+_max_versions = 32  # Compiled versions kept for each traced function
+
+
+class _Trace:
+    """The lines of the compiled function, and the constants they use"""
+    def __init__(self):
+        self.lines = []
+        self.constants = {}
+        self._count = 0
+
+    def name(self, prefix='v'):
+        self._count += 1
+        return prefix + str(self._count)
+
+    def constant(self, value):
+        name = self.name('c')
+        self.constants[name] = value
+        return name
+
+    def record(self, expression, sample):
+        name = self.name()
+        self.lines.append(name + ' = ' + expression)
+        return _tracer(self, name, sample)
+
+
+def _tracer(trace, name, sample):
+    if isinstance(sample, UnitsGroup):
+        return _UnitsTracer(trace, name, sample)
+    return _PlainTracer(trace, name, sample)
+
+
+# The numbers each kind of value is compiled to: units_groups become their
+# values (in SI units), and plain numbers stay themselves.
+def _number(value):
+    return value.value if isinstance(value, UnitsGroup) else value
+
+
+_binary = {
+    'add': ('{} + {}', lambda a, b: a + b),
+    'subtract': ('{} - {}', lambda a, b: a - b),
+    'multiply': ('{} * {}', lambda a, b: a * b),
+    'true_divide': ('{} / {}', lambda a, b: a / b),
+    'divide': ('{} / {}', lambda a, b: a / b),
+    'power': ('{} ** {}', lambda a, b: a ** b),
+}
+
+_unary = {
+    'negative': ('-{}', lambda a: -a),
+    'positive': ('{}', lambda a: a),
+    'absolute': ('abs({})', abs),
+    'sqrt': ('np.sqrt({})', lambda a: a**0.5),
+    'square': ('{} ** 2', lambda a: a**2),
+}
+
+# Only dimensionless units_groups can go through these
+_dimensionless = ['exp', 'expm1', 'log', 'log10', 'log1p', 'sin', 'cos', 'tan',
+                  'arcsin', 'arccos', 'arctan', 'sinh', 'cosh', 'tanh']
+
+
+class _Traced:
+    """What both kinds of tracer do"""
+    _is_tracer = True
+
+    def __init__(self, trace, name, sample):
+        self._trace = trace
+        self._name = name
+        self._sample = sample
+
+    def _operand(self, other):
+        if isinstance(other, _Traced):
+            if other._trace is not self._trace:
+                raise _Untraceable('Tracers from different traces')
+            return other._name, other._sample
+        return self._trace.constant(_number(other)), other
+
+    def _binary(self, op, other, reflected=False):
+        expression, function = _binary[op]
+        name, sample = self._operand(other)
+        names = (name, self._name) if reflected else (self._name, name)
+        samples = (sample, self._sample) if reflected else (self._sample,
+                                                            sample)
+        if any(isinstance(s, UnitsGroup) for s in samples):
+            # So numpy arrays don't become arrays of units_groups
+            samples = [s if isinstance(s, UnitsGroup) else
+                       UnitsGroup()._inplace_mul(s) for s in samples]
+        return self._trace.record(expression.format(*names),
+                                  function(*samples))
+
+    def _unary(self, op):
+        if op in _unary:
+            expression, function = _unary[op]
+            sample = function(self._sample)
+        elif op in _dimensionless:
+            import numpy as np
+            if isinstance(self._sample, UnitsGroup):
+                if self._sample.units:
+                    float(self._sample)  # Raises the usual TypeError
+                sample = getattr(np, op)(self._sample.value)
+            else:
+                sample = getattr(np, op)(self._sample)
+            expression = 'np.' + op + '({})'
+        else:
+            raise _Untraceable('numpy.' + op)
+        return self._trace.record(expression.format(self._name), sample)
+
+    def __add__(self, other):
+        return self._binary('add', other)
+
+    def __radd__(self, other):
+        return self._binary('add', other, True)
+
+    def __sub__(self, other):
+        return self._binary('subtract', other)
+
+    def __rsub__(self, other):
+        return self._binary('subtract', other, True)
+
+    def __mul__(self, other):
+        return self._binary('multiply', other)
+
+    def __rmul__(self, other):
+        return self._binary('multiply', other, True)
+
+    def __truediv__(self, other):
+        return self._binary('true_divide', other)
+
+    def __rtruediv__(self, other):
+        return self._binary('true_divide', other, True)
+
+    def __pow__(self, other):
+        return self._binary('power', other)
+
+    def __rpow__(self, other):
+        return self._binary('power', other, True)
+
+    def __neg__(self):
+        return self._unary('negative')
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return self._unary('absolute')
+
+    def exp(self):
+        return self._unary('exp')
+
+    def log(self):
+        return self._unary('log')
+
+    def log10(self):
+        return self._unary('log10')
+
+    def sin(self):
+        return self._unary('sin')
+
+    def cos(self):
+        return self._unary('cos')
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != '__call__' or kwargs:
+            raise _Untraceable('numpy.' + ufunc.__name__)
+        if len(inputs) == 1:
+            return self._unary(ufunc.__name__)
+        if ufunc.__name__ not in _binary:
+            raise _Untraceable('numpy.' + ufunc.__name__)
+        reflected = inputs[0] is not self
+        return self._binary(ufunc.__name__, inputs[0 if reflected else 1],
+                            reflected)
+
+    def _depends_on_numbers(self, *args, **kwargs):
+        raise _Untraceable('The function depends on the numbers it gets')
+
+    __bool__ = __float__ = __int__ = __index__ = _depends_on_numbers
+    __lt__ = __le__ = __gt__ = __ge__ = _depends_on_numbers
+    __len__ = __iter__ = __getitem__ = __array__ = _depends_on_numbers
+
+    def __eq__(self, other):
+        self._depends_on_numbers()
+
+    __ne__ = __eq__
+    __hash__ = None
+
+    def __str__(self):
+        return 'Tracer of ' + str(self._sample)
+    __repr__ = __str__
+
+
+class _PlainTracer(_Traced):
+    """Stands in for a plain number or array"""
+
+
+class _UnitsTracer(_Traced, UnitsGroup):
+    """Stands in for a units_group
+
+    Being a UnitsGroup means its reflected operators (like __radd__) go first,
+    and that checks like `hasattr(x, 'units')` treat it as one.
+    """
+    @property
+    def units(self):
+        return self._sample.units
+
+    @property
+    def full_name(self):
+        return self._sample.full_name
+
+    @property
+    def normal(self):
+        return self._sample.normal
+
+    @property
+    def value(self):
+        return _PlainTracer(self._trace, self._name, self._sample.value)
+
+    @property
+    def magnitude(self):
+        return self._trace.record(
+            self._name + ' * ' + self._trace.constant(self._sample.normal),
+            self._sample.magnitude)
+
+    def copy(self):
+        return self
+
+    def normalized(self):
+        return self._sample.normalized()
+
+    def standardized(self):
+        return _UnitsTracer(self._trace, self._name,
+                            self._sample.standardized())
+
+    def units_of(self, units_group):
+        return _UnitsTracer(self._trace, self._name,
+                            self._sample.units_of(units_group))
+
+    __call__ = units_of
+
+
+# Compiling ####################################################################
+def _signature(arg):
+    """What a compiled version assumes about an argument, or None"""
+    if isinstance(arg, UnitsGroup):
+        return (dict(arg.units), dict(arg.full_name), arg.normal)
+    if isinstance(arg, (int, float)) and not isinstance(arg, bool):
+        return ()
+    if type(arg).__module__ == 'numpy' and arg.dtype.kind in 'iuf':
+        return ()
+    return None
+
+
+def _matches(signature, args):
+    for expected, arg in zip(signature, args):
+        if expected:
+            if not (isinstance(arg, UnitsGroup) and
+                    arg.units == expected[0] and
+                    arg.full_name == expected[1] and
+                    arg.normal == expected[2]):
+                return False
+        elif _signature(arg) != ():
+            return False
+    return True
+
+
+def _flat(result):
+    if isinstance(result, (list, tuple)):
+        return [leaf for r in result for leaf in _flat(r)]
+    return [result]
+
+
+def _outputs(trace, result):
+    """Source for a list of the returned values, in _flat order"""
+    names = []
+    for leaf in _flat(result):
+        if isinstance(leaf, _Traced):
+            names.append(leaf._name)
+        elif isinstance(getattr(leaf, 'magnitude', None), _Traced):
+            raise _Untraceable('A tracer got into a units_group')
+        elif leaf is None or _signature(leaf) is not None:
+            names.append(trace.constant(leaf))
+        else:  # Like a dict, which could be hiding tracers
+            raise _Untraceable('Returned a ' + type(leaf).__name__)
+    return '[' + ', '.join(names) + ']'
+
+
+def _rebuild(result, numbers):
+    """The returned structure, from the numbers the compiled version made"""
+    leaves = iter(numbers)
+
+    def rebuild(result):
+        if isinstance(result, (list, tuple)):
+            return type(result)(rebuild(r) for r in result)
+        number = next(leaves)
+        if isinstance(result, _UnitsTracer):
+            sample = result._sample
+            units = sample.normalized()
+            units.magnitude = number * sample.normal
+            return units
+        return number
+    return rebuild(result)
+
+
+def _compile(func, args):
+    """Trace func with args, and return the compiled version and its source
+
+    Raises _Untraceable (or whatever else the tracing hit) if it can't be
+    compiled.
+    """
+    import numpy as np
+    trace = _Trace()
+    names = ['a' + str(i) for i in range(len(args))]
+    tracers = [_tracer(trace, name, arg) for name, arg in zip(names, args)]
+    result = func(*tracers)
+    returned = _outputs(trace, result)
+    source = ('def compiled(' + ', '.join(names) + '):\n' +
+              ''.join('    ' + line + '\n' for line in trace.lines) +
+              '    return ' + returned + '\n')
+    namespace = dict(trace.constants, np=np)
+    exec(source, namespace)
+    compiled = namespace['compiled']
+
+    # Check the compiled version gets what the tracing got
+    numbers = compiled(*[_number(arg) for arg in args])
+    for leaf, number in zip(_flat(result), numbers):
+        sample = _number(getattr(leaf, '_sample', leaf))
+        if isinstance(leaf, _Traced) and not np.allclose(
+                number, sample, rtol=1e-9, atol=0, equal_nan=True):
+            raise _Untraceable("The compiled version doesn't match")
+    return compiled, source, result
+
+
+def traced(func):
+    """Compile func into plain number math for each set of argument units
+
+    Takes positional arguments that are units_groups (with numbers or arrays as
+    magnitudes) or plain numbers or arrays. Calls with keyword arguments, or
+    other kinds of arguments, just call func. So do functions that return
+    anything but those (or None), or lists or tuples of them. See the module
+    docstring.
+    """
+    import functools
+    versions = []  # (signature, compiled, result) for each set of units
+
+    @functools.wraps(func)
+    def new_function(*args, **kwargs):
+        if kwargs:
+            return func(*args, **kwargs)
+        for i, (signature, compiled, result) in enumerate(versions):
+            if len(signature) == len(args) and _matches(signature, args):
+                versions.append(versions.pop(i))  # Most recently used last
+                if compiled is None:
+                    return func(*args)
+                numbers = compiled(*[_number(arg) for arg in args])
+                return _rebuild(result, numbers)
+
+        signature = [_signature(arg) for arg in args]
+        if None in signature:
+            return func(*args)
+        if len(versions) >= _max_versions:
+            del versions[0]
+        try:
+            compiled, source, result = _compile(func, args)
+        except _Untraceable:
+            versions.append((signature, None, None))
+            return func(*args)
+        versions.append((signature, compiled, result))
+        new_function.compiled_source.append(source)
+        del new_function.compiled_source[:-_max_versions]
+        numbers = compiled(*[_number(arg) for arg in args])
+        return _rebuild(result, numbers)
+
+    new_function.compiled_source = []
+    return new_function
@@ -1,22 +1,102 @@
 """Define some helper methods for dealing with units.
 """
+from functools import lru_cache as _lru_cache
 
 
-def _deep_map(func, *args):
-    """Like map, but recursively enters iterables
+def set_checks(on=True):
+    """Turn units checking on or off, everywhere
+
+    With checks off (for production runs of code that's been tested with them
+    on), units_groups only keep track of their magnitudes and dimensions:
+
+    * must_have_same_units_as doesn't raise, so adding, comparing, unitified,
+      magnitudes_of, etc. don't check units.
+    * OutOfRangeTest doesn't test, so properties outside their ranges are just
+      extrapolated.
+    * Unit names (full_name) aren't kept, so units_groups print as their values
+      in base units, like `0.3048 * m` instead of `1.0 * ft`. Magnitudes, values
+      and conversions (like `x(ft).magnitude`) are all still right.
+
+    Setting the environment variable UNTIES_UNCHECKED (to anything) before
+    unties is imported turns checks off from the start. To turn them off for
+    just a block of code, use `unchecked`. See unties/tests/benchmark.py for
+    how much faster it is.
+    """
+    from unties.units_group import UnitsGroup
+    UnitsGroup._checked = bool(on)
+
+
+def checks_on():
+    """Return whether units are being checked (see set_checks)"""
+    from unties.units_group import UnitsGroup
+    return UnitsGroup._checked
+
+
+def unchecked():
+    """A context manager that turns checks off inside it (see set_checks)
+
+        >>> with unchecked():
+        >>>     total = 1 * m + 1 * s  # Doesn't raise!
+    """
+    from contextlib import contextmanager
+
+    @contextmanager
+    def context():
+        was_on = checks_on()
+        set_checks(False)
+        try:
+            yield
+        finally:
+            set_checks(was_on)
+    return context()
+
+
+def _converter(units, leaf):
+    """Compile a function that converts values shaped like `units`
+
+    `units` is a units_group, or a tuple or list of (tuples or lists of)
+    units_groups, and `leaf(units)` makes the function for one value. The
+    structure is walked here, once, so calls don't have to find the leaves
+    again. Sequences are converted into lists.
 
     Ex:
 
-        >>> _deep_map(lambda a, b: a + b,
-                      (1, 2, (3, (4,), 5)),
-                      (10, 20, (30, (40,), 50)))
-        [11, 22, [33, [44], 55]]
+        >>> convert = _converter((m, (s, J)), lambda u: lambda x: x * 10)
+        >>> convert((1, (2, 3)))
+        [10, [20, 30]]
 
     """
-    try:
-        return [_deep_map(func, *z) for z in zip(*args)]
-    except TypeError:
-        return func(*args)
+    if isinstance(units, (tuple, list)):
+        converters = [_converter(u, leaf) for u in units]
+        return lambda values: [c(v) for c, v in zip(converters, values)]
+    return leaf(units)
+
+
+def _times(units):
+    """Leaf that gives a number (or array of numbers) units"""
+    def leaf(magnitude):
+        return units.copy()._inplace_mul(magnitude)
+    return leaf
+
+
+def _magnitudes_in(units, check):
+    """Leaf that gives the magnitude(s) of a units_group in `units`"""
+    units = units.normalized()
+    scale = units.value
+
+    def leaf(quantity):
+        if getattr(quantity, 'dtype', None) == object:
+            # A numpy array of units_groups
+            import numpy as np
+            if check:
+                for q in quantity.flat:
+                    q.must_have_same_units_as(units)
+            values = np.array([q.value for q in quantity.flat])
+            return values.reshape(quantity.shape) / scale
+        if check:
+            quantity.must_have_same_units_as(units)
+        return quantity.value / scale
+    return leaf
 
 
 def unitless(ret_units, arg_units):
@@ -33,25 +113,18 @@ def unitless(ret_units, arg_units):
         >>> unitless_spring_force(3, 2)
         0.0013488536585984146
 
+    Numpy arrays of numbers are given to the function as one units_group with
+    the array as its magnitude (see units_array). The conversions are worked
+    out once, when the function is wrapped.
     """
     if not isinstance(arg_units, tuple):
         arg_units = (arg_units,)
+    with_units = _converter(arg_units, _times)
+    magnitudes = _converter(ret_units, lambda u: _magnitudes_in(u, False))
 
     def wrap_function(func):
         def new_function(*unitless_args):
-            def get_magnitudes(o, n):
-                if type(o).__module__ == 'numpy':
-                    # Initialize new numpy array without importing numpy
-                    new_o = o.__class__(len(o))
-                    for i in range(len(o)):
-                        new_o[i] = o[i](n).magnitude
-                    return new_o
-                else:
-                    return o(n).magnitude
-
-            new_args = _deep_map(lambda u, n: u * n, arg_units, unitless_args)
-            returned = func(*new_args)
-            return _deep_map(get_magnitudes, returned, ret_units)
+            return magnitudes(func(*with_units(unitless_args)))
         return new_function
     return wrap_function
 
@@ -70,38 +143,110 @@ def unitified(ret_units, arg_units):
         >>> unitified_emc(ug)
         89.87551787368174 * MJ
 
+    The arguments can be units_groups (with numbers or arrays as magnitudes) or
+    numpy arrays of units_groups, and their units are checked on every call.
+    Returned arrays get their units as one units_group. The conversions are
+    worked out once, when the function is wrapped.
     """
     if not isinstance(arg_units, tuple):
         arg_units = (arg_units,)
+    magnitudes = _converter(arg_units, lambda u: _magnitudes_in(u, True))
+    with_units = _converter(ret_units, _times)
 
     def wrap_function(func):
         def new_function(*unitified_args):
-            def same_unit_test(u, a):
-                if type(a).__module__ == 'numpy':
-                    [aa.must_have_same_units_as(u) for aa in a]
-                else:
-                    a.must_have_same_units_as(u)
-
-            _deep_map(same_unit_test, arg_units, unitified_args)
-
-            def get_magnitudes(o, n):
-                if type(o).__module__ == 'numpy':
-                    # Initialize new numpy array without importing numpy
-                    new_o = o.__class__(len(o))
-                    for i in range(len(o)):
-                        new_o[i] = o[i](n).magnitude
-                    return new_o
-                else:
-                    return o(n).magnitude
-
-            unitless_args = _deep_map(get_magnitudes, unitified_args, arg_units)
-            return _deep_map(lambda r, u: r * u,
-                             func(*unitless_args), ret_units)
+            return with_units(func(*magnitudes(unitified_args)))
         return new_function
     return wrap_function
 
 
-def units_fsolve(func, guess):
+def _plan(quantities):
+    """How to turn quantities into one flat array of floats, and back
+
+    `quantities` is a units_group (with a number or an array as its magnitude)
+    or a list of them. Returns a list of (units, shape) pairs, one per
+    quantity, and whether `quantities` was a list.
+    """
+    import numpy as np
+    listed = not hasattr(quantities, 'units')
+    if not listed:
+        quantities = [quantities]
+    return [(q.normalized(), np.shape(q.magnitude)) for q in quantities], listed
+
+
+def _flatten(quantities, plan, check=False):
+    """Magnitudes of quantities (in the units of the plan) as one flat array"""
+    import numpy as np
+    blocks, listed = plan
+    if not listed:
+        quantities = [quantities]
+    if len(quantities) != len(blocks):
+        raise ValueError('Expected %d quantities, got %d'
+                         % (len(blocks), len(quantities)))
+    flat = []
+    for q, (units, shape) in zip(quantities, blocks):
+        if check:
+            q.must_have_same_units_as(units)
+        flat.append(np.ravel(q.value / units.value))
+    return np.concatenate(flat)
+
+
+def _unflatten(floats, plan):
+    """Quantities from a flat array of magnitudes in the units of the plan"""
+    import numpy as np
+    blocks, listed = plan
+    quantities = []
+    i = 0
+    for units, shape in blocks:
+        size = int(np.prod(shape))
+        magnitude = floats[i:i + size].reshape(shape) if shape else \
+            float(floats[i])
+        quantities.append(units_array(magnitude, units))
+        i += size
+    return quantities if listed else quantities[0]
+
+
+def _jacobian_scales(res_plan, arg_plan):
+    """Factors from SI values of each Jacobian block to plan magnitudes"""
+    import numpy as np
+    res_units = np.concatenate([np.full(int(np.prod(shape)), units.value)
+                                for units, shape in res_plan[0]])
+    arg_units = np.concatenate([np.full(int(np.prod(shape)), units.value)
+                                for units, shape in arg_plan[0]])
+    return arg_units / res_units[:, np.newaxis]
+
+
+def _flatten_jacobian(jac, res_plan, arg_plan, check=False):
+    """SI values of a Jacobian as one 2D array
+
+    `jac` is one units_group (for one residual and one variable, either of
+    which can be an array), or a list of rows of them for lists. Plain numbers
+    (like 0) are taken to be in the right units already.
+    """
+    import numpy as np
+    res_blocks, res_listed = res_plan
+    arg_blocks, arg_listed = arg_plan
+    if not res_listed:
+        jac = [jac]
+    if not arg_listed:
+        jac = [[row] for row in jac]
+    rows = []
+    for row, (res_units, res_shape) in zip(jac, res_blocks):
+        blocks = []
+        for block, (arg_units, arg_shape) in zip(row, arg_blocks):
+            if hasattr(block, 'units'):
+                if check:
+                    block.must_have_same_units_as(res_units / arg_units)
+                block = block.value
+            shape = (int(np.prod(res_shape)), int(np.prod(arg_shape)))
+            blocks.append(np.broadcast_to(np.asarray(block, dtype=float),
+                                          shape) if np.ndim(block) == 0 else
+                          np.reshape(block, shape))
+        rows.append(blocks)
+    return np.block(rows)
+
+
+def units_fsolve(func, guess, fprime=None, **kwargs):
     """A wrapper method so fsolve can deal with units
 
     Ex: For a spring with k = 3 N / m, find the distance where the spring
@@ -111,10 +256,450 @@ def units_fsolve(func, guess):
         >>>     return x * 3 * N / m - 2 * N
         >>>
         >>> units_fsolve(solve_F, 4 * m)
-        0.6666666666666666 * N
+        0.6666666666666666 * m
+
+    For a system of equations, give a list of guesses, which can all have
+    different units. `func` gets a list of the same units, and returns a list
+    of residuals (which can have their own units). Any of them can also be a
+    units_group with an array as its magnitude (see units_array).
+
+        >>> def flash(x):
+        >>>     T, V = x
+        >>>     return [water.liquid_vapor_pressure(T) - 1 * atm,
+        >>>             V * T - 30 * m**3 * K]
+        >>>
+        >>> units_fsolve(flash, [350 * K, 1 * l])
+        [373.16783898899... * K, 80.39... * l]
+
+    The units are worked out once, from one call of `func` with the guess
+    (which fsolve reuses as its calls at the guess). Then fsolve only sees floats: each
+    variable divided by the size of its guess, which keeps variables of very
+    different sizes well conditioned.
+
+    If the derivative of `func` is known, pass it as `fprime`. It should
+    return units of func's units divided by guess's units, like the `_dT`
+    functions in unties.properties:
+
+        >>> def vp_error(T):
+        >>>     return water.liquid_vapor_pressure(T) - 1 * atm
+        >>>
+        >>> units_fsolve(vp_error, 350 * K, water.liquid_vapor_pressure_dT)
+
+    For systems, fprime returns a list of rows, where row i, column j is the
+    derivative of residual i with respect to variable j.
+
+    Other keyword arguments (like xtol or maxfev) go to fsolve.
     """
     from scipy.optimize import fsolve
-    ret_units = func(guess).normalized()
-    arg_units = guess.normalized()
-    unitless_func = unitless(ret_units, arg_units)(func)
-    return fsolve(unitless_func, guess.value)[0] * ret_units
+    import numpy as np
+    arg_plan = _plan(guess)
+    x0 = _flatten(guess, arg_plan)
+    x_scale = np.where(x0 == 0, 1, np.abs(x0))
+    z0 = x0 / x_scale
+    trial = func(guess)
+    res_plan = _plan(trial)
+    trial = _flatten(trial, res_plan)
+    if len(trial) != len(x0):
+        raise ValueError('func returned %d residuals for %d variables'
+                         % (len(trial), len(x0)))
+
+    def float_func(z):
+        if np.array_equal(z, z0):  # fsolve starts with (two) calls at z0
+            return trial
+        return _flatten(func(_unflatten(z * x_scale, arg_plan)), res_plan)
+
+    jacobian = None
+    if fprime is not None:
+        scales = _jacobian_scales(res_plan, arg_plan) * x_scale
+        checked = [False]
+
+        def jacobian(z):
+            jac = fprime(_unflatten(z * x_scale, arg_plan))
+            jac = _flatten_jacobian(jac, res_plan, arg_plan, not checked[0])
+            checked[0] = True
+            return jac * scales
+
+    z = fsolve(float_func, z0, fprime=jacobian, **kwargs)
+    return _unflatten(z * x_scale, arg_plan)
+
+
+def _lockstep_roots(f, x, lo=None, hi=None, fprime=None, xtol=2e-12,
+                    rtol=8.9e-16, maxiter=100):
+    """Roots of many independent scalar equations at once, on float arrays
+
+    `f` (and `fprime`) take and return arrays the shape of `x`. With a bracket
+    [lo, hi] each step is Newton's method (with fprime) or Illinois false
+    position (without), falling back to bisection when the step leaves the
+    bracket or the bracket isn't shrinking fast enough. Without a bracket it's
+    plain Newton or secant steps from `x`. Returns the roots and which of them
+    converged.
+    """
+    import numpy as np
+    bracketed = lo is not None
+    fx = f(x)
+    bad = np.zeros(x.shape, dtype=bool)
+    if bracketed:
+        flo, fhi = f(lo), f(hi)
+        bad = (np.sign(flo) * np.sign(fhi)) > 0
+        width = np.abs(hi - lo)
+        old_width = width
+        side = np.zeros(x.shape, dtype=int)
+    elif fprime is None:
+        x_prev = x * (1 + 1e-4) + np.where(x >= 0, 1e-4, -1e-4)
+        f_prev = f(x_prev)
+    done = (fx == 0) | bad
+
+    for _ in range(maxiter):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if fprime is not None:
+                c = x - fx / fprime(x)
+            elif bracketed:
+                c = hi - fhi * (hi - lo) / (fhi - flo)
+            else:
+                c = x - fx * (x - x_prev) / (fx - f_prev)
+        if bracketed:
+            low, high = np.minimum(lo, hi), np.maximum(lo, hi)
+            bisect = ~((c > low) & (c < high)) | (width > old_width / 2)
+            c = np.where(bisect, (lo + hi) / 2, c)
+        c = np.where(done, x, c)
+        fc = f(c)
+        tol = xtol + rtol * np.abs(c)
+        if bracketed:
+            left = np.sign(fc) == np.sign(flo)
+            # Illinois: halve the end that stayed put twice in a row
+            fhi = np.where(left & (side == -1), fhi / 2, fhi)
+            flo = np.where(~left & (side == 1), flo / 2, flo)
+            lo, flo = np.where(left, c, lo), np.where(left, fc, flo)
+            hi, fhi = np.where(left, hi, c), np.where(left, fhi, fc)
+            side = np.where(left, -1, 1)
+            old_width, width = width, np.abs(hi - lo)
+            newly = (fc == 0) | (width <= tol)
+            if fprime is not None:
+                newly |= ~bisect & (np.abs(c - x) <= tol)
+        else:
+            newly = (fc == 0) | (np.abs(c - x) <= tol)
+            x_prev, f_prev = x, fx
+        x, fx = np.where(done, x, c), np.where(done, fx, fc)
+        done = done | newly
+        if np.all(done):
+            break
+    return x, done & ~bad
+
+
+def units_roots(func, bracket=None, guess=None, fprime=None, xtol=2e-12,
+                rtol=8.9e-16, maxiter=100):
+    """Solve the same scalar equation for many sets of parameters at once
+
+    Like units_fsolve, but `func` takes a units_group with an array as its
+    magnitude (see units_array), one element per problem, and returns the
+    residuals the same way. All problems are solved together, in lockstep, so
+    `func` is called once per iteration instead of once per problem per
+    iteration.
+
+    Give either a `bracket` (a pair of quantity arrays, or numbers with units,
+    that broadcast together) with a sign change between them, or a `guess`. With
+    a bracket the solver is a hybrid of Newton's method (if fprime is given) or
+    false position (if not) and bisection, and always converges. With only a
+    guess it takes plain Newton or secant steps.
+
+    Ex: The stretch of 10,000 springs, each with its own k and force
+
+        >>> k = units_array(np.linspace(1, 10, 10000), N / m)
+        >>> F = units_array(np.linspace(2, 3, 10000), N)
+        >>> x, converged = units_roots(lambda x: k * x - F, (0 * m, 10 * m))
+        >>> x
+        [2.         1.99830136 1.99660577 ... 0.30003401 0.300017   0.3       ] * m
+        >>> converged.all()
+        True
+
+    The units of func (and fprime, which should return func's units divided by
+    x's units) are checked on their first calls only. xtol is in the units of
+    the bracket or guess. Returns the roots, in those units, and a boolean
+    array of which problems converged (those without a sign change in their
+    bracket never do).
+    """
+    import numpy as np
+    if bracket is not None:
+        x_units = bracket[0].normalized()
+        lo, hi = np.broadcast_arrays(*[np.asarray(magnitudes_of(b, x_units),
+                                                  dtype=float)
+                                       for b in bracket])
+        x = (lo + hi) / 2
+        if guess is not None:
+            x = np.clip(magnitudes_of(guess, x_units), np.minimum(lo, hi),
+                        np.maximum(lo, hi))
+    elif guess is not None:
+        x_units = guess.normalized()
+        x = np.array(magnitudes_of(guess, x_units), dtype=float)
+        lo = hi = None
+    else:
+        raise ValueError('units_roots needs a bracket or a guess')
+
+    trial = func(units_array(x, x_units))
+    f_units = trial.normalized() if hasattr(trial, 'units') else None
+    f_scale = f_units.value if f_units else 1
+    # The parameters in func can set the number of problems too
+    shape = np.broadcast_shapes(x.shape, np.shape(getattr(trial, 'value',
+                                                          trial)))
+    x = np.broadcast_to(x, shape).copy()
+    if lo is not None:
+        lo, hi = np.broadcast_to(lo, shape), np.broadcast_to(hi, shape)
+
+    def f(z):
+        residual = func(units_array(z, x_units))
+        return np.broadcast_to(getattr(residual, 'value', residual) / f_scale,
+                               z.shape)
+
+    float_fprime = None
+    if fprime is not None:
+        d_units = f_units / x_units if f_units else 1 / x_units
+        checked = []
+
+        def float_fprime(z):
+            slope = fprime(units_array(z, x_units))
+            if not checked:
+                slope.must_have_same_units_as(d_units)
+                checked.append(True)
+            return slope.value / d_units.value
+
+    x, converged = _lockstep_roots(f, x, lo, hi, float_fprime, xtol, rtol,
+                                   maxiter)
+    return units_array(x, x_units), converged
+
+
+def units_array(magnitudes, units, copy=True):
+    """Return a single units_group whose magnitude is an array
+
+    Multiplying a unit by a numpy array gives a numpy array of units_groups
+    (one object per element). For big arrays it's much faster to keep one
+    units_group and let the magnitude be the array.
+
+    The array's dtype is kept, so float32 data stays float32 (see the README
+    for what that costs in precision). With copy=False the units_group uses
+    `magnitudes` itself, so in-place conversions (see UnitsGroup.to_) change
+    it.
+
+    Ex:
+
+        >>> units_array(np.linspace(1, 2, 3), kPa)
+        [1.  1.5 2. ] * kPa
+        >>> units_array(np.linspace(1, 2, 3), kPa)(psi)
+        [0.14503774 0.21755661 0.29007548] * psi
+
+    """
+    if copy:
+        return units.normalized()._inplace_mul(magnitudes)
+    first = units.normalized()
+    first.magnitude = magnitudes
+    return first
+
+
+def magnitudes_of(quantity, units):
+    """Return the magnitude(s) of a quantity expressed in `units`
+
+    Takes a units_group (with a number or an array as its magnitude) or a numpy
+    array of units_groups, and returns a number or a numpy array of numbers.
+
+    Ex:
+
+        >>> magnitudes_of(np.linspace(1, 2, 3) * ft, inch)
+        array([12., 18., 24.])
+
+    """
+    scale = units.normalized().value
+    if type(quantity).__module__ == 'numpy':
+        import numpy as np
+        magnitudes = np.empty(quantity.shape)
+        for i, q in enumerate(quantity.flat):
+            q.must_have_same_units_as(units)
+            magnitudes.flat[i] = q.value / scale
+        return magnitudes
+    quantity.must_have_same_units_as(units)
+    return quantity.value / scale
+
+
+def parse_units(string):
+    """Return the units_group a string of units (like `str(x.full_name)`) means
+
+    Reads names of units (any unit or constant unties knows, including custom
+    units), numbers, `*`, `/`, `**` and parentheses, without using eval. A
+    leading `*` or `/` (like in ` / s`) is allowed, so the units part of a
+    printed units_group can be read back. The names are kept as they're written
+    (`ft * yd` stays `ft * yd`, rather than becoming `yd**2`).
+
+    Ex:
+
+        >>> parse_units('kg * m**2.0 / s**2.0')
+        1.0 * kg * m**2.0 / s**2.0
+        >>> parse_units(str((3 * psi / minute).full_name))
+        1.0 * psi / minute
+
+    Raises UnitStringError for strings it can't read. What each string means is
+    cached, so reading the same one again (like the units of every row of a
+    file) just copies it. Defining a unit (with base, derived, conversion or
+    constant) starts the cache over, so redefined units are read right.
+    """
+    from unties.units_group import UnitsGroup
+    return _parse_units(string, UnitsGroup._checked,
+                        UnitsGroup._defined).copy()
+
+
+@_lru_cache(maxsize=1024)
+def _parse_units(string, checked, defined):
+    """See parse_units. `checked` and `defined` are just for the cache key:
+    unchecked units_groups have no names, and units can be redefined."""
+    import re
+    import unties.utilities.errors as ue
+    from unties.units_group import UnitsGroup
+    tokens = re.findall(r'\*\*|[*/()]|-?[0-9.]+(?:[eE][-+]?[0-9]+)?|\w+|\S',
+                        string)
+    tokens.append('')  # The end
+    position = [0]
+
+    def take(expected=None):
+        token = tokens[position[0]]
+        if expected is not None and token != expected:
+            raise ue.UnitStringError(string, 'expected ' + (expected or
+                                     'the end') + ' but got ' +
+                                     (token or 'the end'))
+        position[0] += 1
+        return token
+
+    def number(token):
+        try:
+            return float(token)
+        except ValueError:
+            raise ue.UnitStringError(string, 'expected a number but got ' +
+                                     (token or 'the end'))
+
+    def power():
+        token = take()
+        if token == '(':
+            units_group = product()
+            take(')')
+        elif token and token[0] in '-.0123456789':
+            units_group = UnitsGroup()
+            units_group.magnitude = number(token)
+        elif isinstance(UnitsGroup._locals.get(token), UnitsGroup):
+            units_group = UnitsGroup._locals[token].copy()
+        else:
+            raise ue.UnitStringError(string, 'unknown unit ' +
+                                     (token or 'at the end'))
+        if tokens[position[0]] == '**':
+            take()
+            if tokens[position[0]] == '(':
+                take()
+                exponent = number(take())
+                take(')')
+            else:
+                exponent = number(take())
+            units_group = units_group**exponent
+        return units_group
+
+    def product():
+        units_group = UnitsGroup()
+        if tokens[position[0]] not in ('*', '/'):  # Like str(x.full_name)
+            units_group._inplace_join(power())
+        while tokens[position[0]] in ('*', '/'):
+            if take() == '*':
+                units_group._inplace_join(power())
+            else:
+                units_group._inplace_join(power()**-1)
+        return units_group
+
+    if not string.strip():
+        return UnitsGroup()
+    units_group = product()
+    take('')
+    return units_group
+
+
+def units_solve_ivp(fun, t_span, y0, **kwargs):
+    """A wrapper method so scipy's solve_ivp can deal with units
+
+    `t_span` is a pair of times, and `y0` is either a list of initial values
+    (each with its own units), or one units_group with an array as its
+    magnitude (see units_array). `fun(t, y)` gets `y` the same way, and returns
+    the derivatives the same way.
+
+    `fun` is called once with the initial values, and the units of what it
+    returns are checked against the units of y / t. After that the units aren't
+    checked again: solve_ivp integrates plain floats (in the units of t_span
+    and y0), and `fun` is compiled into plain float math (see
+    unties.tracing.traced) for it. If `fun` can't be compiled, it's called at
+    each step with checks off (see unchecked) instead.
+
+    Ex: A first order reaction in a batch reactor, heated at a constant rate
+
+        >>> def batch(t, y):
+        >>>     C, T = y
+        >>>     k = 0.1 / minute * np.exp(-4000 * K * (1 / T - 1 / (300 * K)))
+        >>>     return [-k * C, 2 * K / minute]
+        >>>
+        >>> sol = units_solve_ivp(batch, (0 * s, 10 * minute),
+        >>>                       [2 * mol / l, 300 * K])
+        >>> sol.y[0][-1]
+        0.414... * mol / l
+
+    Other keyword arguments go to solve_ivp. t_eval, first_step and max_step
+    can have units of time. The result's `t` and `y` have units (`y` in the
+    same form as y0); anything else (like `sol` from dense_output) is in the
+    units of t_span and y0.
+    """
+    from scipy.integrate import solve_ivp
+    import numpy as np
+    t_units = t_span[0].normalized()
+    t_bounds = [magnitudes_of(t, t_units) for t in t_span]
+
+    single = hasattr(y0, 'units')
+    if single:
+        y_units = [y0.normalized()]
+        y_start = np.ravel(np.asarray(y0.magnitude, dtype=float))
+    else:
+        y_units = [y.normalized() for y in y0]
+        y_start = np.array([y.magnitude for y in y0], dtype=float)
+
+    # The one dimension-checked call
+    rates = fun(t_span[0], y0)
+    if single:
+        rates = [rates]
+    elif len(rates) != len(y_units):
+        raise ValueError('fun returned %d derivatives for %d state variables'
+                         % (len(rates), len(y_units)))
+    from unties.units_group import UnitsGroup
+    import unties.utilities.errors as ue
+    for rate, y in zip(rates, y_units):
+        if not isinstance(rate, UnitsGroup):
+            raise ue.IncompatibleUnitsError(units_array(rate, UnitsGroup()),
+                                            y / t_units)
+        rate.must_have_same_units_as(y / t_units)
+    scales = [y.value / t_units.value for y in y_units]
+
+    # traced takes each state variable as its own argument, not a list
+    from unties.tracing import traced
+    compiled = traced(fun if single else lambda t, *y: fun(t, list(y)))
+
+    if single:
+        def float_fun(t, y):
+            with unchecked():
+                rate = compiled(t * t_units, units_array(y, y_units[0]))
+            return rate.value / scales[0]
+    else:
+        def float_fun(t, y):
+            rows = y.tolist() if y.ndim == 1 else y  # Python floats for math
+            with unchecked():
+                rates = compiled(t * t_units, *[units_array(yi, u) for yi, u
+                                                in zip(rows, y_units)])
+            return np.array([r.value / s for r, s in zip(rates, scales)])
+
+    for key in ('t_eval', 'first_step', 'max_step'):
+        if hasattr(kwargs.get(key), 'units'):
+            kwargs[key] = magnitudes_of(kwargs[key], t_units)
+
+    result = solve_ivp(float_fun, t_bounds, y_start, **kwargs)
+    result.t = units_array(result.t, t_units)
+    if single:
+        result.y = units_array(result.y, y_units[0])
+    else:
+        result.y = [units_array(y, u) for y, u in zip(result.y, y_units)]
+    return result
@@ -1,5 +1,6 @@
 """Define all units and constants
 """
+from os import environ as _environ
 from unties.units_group import UnitsGroup
 
 UnitsGroup._locals = globals()
@@ -325,3 +326,9 @@ def deg_f(num):
     Accepts a number representing the temperature in Fahrenheit.
     """
     return (num + 459.67) * R
+
+
+# The units all have their names now, so checks can be turned off (see
+# unties.unit_helpers.set_checks)
+if _environ.get('UNTIES_UNCHECKED'):
+    UnitsGroup._checked = False
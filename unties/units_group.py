@@ -18,6 +18,8 @@ class UnitsGroup:
     """
     _quantities = _Quantities()  # Store unit quantities (length, time, etc.)
     _prefixes = {}  # Store all unit prefixes
+    _checked = True  # Check units and keep unit names (see set_checks)
+    _defined = 0  # Counts units defined, so caches of names can tell
 
     @classmethod
     def add_prefixes(cls, prefix_dict):
@@ -97,6 +99,7 @@ class UnitsGroup:
         """
         self.description = description
         self._locals[name] = self
+        UnitsGroup._defined += 1
         return self
 
     def add_quantity(self, quantity):
@@ -114,6 +117,7 @@ class UnitsGroup:
 
     def _save_unit(self, name):
         self._locals[name] = self
+        UnitsGroup._defined += 1
 
     def _prefixer(self):
         """Add prefixes to a unit.
@@ -151,11 +155,14 @@ class UnitsGroup:
         return num * self**-1
 
     def _inplace_mul(self, sec):
+        if getattr(sec, '_is_tracer', False):  # See unties.tracing
+            return sec * self
         if not isinstance(sec, UnitsGroup):  # Probably a Number or numpy array
             self.magnitude *= sec
             return self
 
-        if self.units and sec.units and set(self.units) == set(sec.units):
+        if (self._checked and self.units and sec.units and
+                set(self.units) == set(sec.units)):
             unit = list(self.units)[0]
             exp = self.units[unit] / sec.units[unit]
             valid_exp = sec.magnitude != 0 or exp >= 0
@@ -178,13 +185,16 @@ class UnitsGroup:
         return self.copy()._inplace_mul(sec)
 
     def __pow__(self, num):
+        if getattr(num, '_is_tracer', False):
+            return NotImplemented
         if isinstance(num, UnitsGroup) and num.is_scalar():
             num = num.value
         first = self.copy()
         for unit in list(first.units):
             first.units[unit] *= num
-        for name in list(first.full_name):
-            first.full_name[name] *= num
+        if self._checked:
+            for name in list(first.full_name):
+                first.full_name[name] *= num
         first.magnitude **= num
         first.normal **= num
         return first
@@ -196,6 +206,8 @@ class UnitsGroup:
             raise TypeError('Exponent must be unitless')
 
     def __add__(self, units_group):
+        if getattr(units_group, '_is_tracer', False):
+            return NotImplemented
         if not isinstance(units_group, UnitsGroup):
             units_group = UnitsGroup() * units_group
         self.must_have_same_units_as(units_group)
@@ -241,12 +253,28 @@ class UnitsGroup:
     def __le__(self, units_group):
         return self.compare(units_group, lambda s, o: s <= o)
 
+    def __getitem__(self, key):
+        """Index or slice an array magnitude, keeping the units.
+
+        Slices are views of the same array (see numpy's indexing rules), so
+        they don't copy anything. They're read-only, so converting one in place
+        (see to_) can't change the numbers of the array it came from.
+        """
+        part = self.magnitude[key]
+        if getattr(part, 'base', None) is not None:  # A view
+            part = part.view()
+            part.flags.writeable = False
+        return self._copy(part)
+
     def __abs__(self):
         first = self.copy()
         first.magnitude = abs(first.magnitude)
         return first
 
     def __str__(self):
+        if not self._checked or (self.units and not self.full_name):
+            # Without names (made with checks off), show base units
+            return str(self.value) + str(self.units)
         s = str(self.magnitude)
         if self.full_name:
             s += str(self.full_name)
@@ -303,13 +331,22 @@ class UnitsGroup:
     def copy(self):
         """Return a copy of self.
         """
-        first = UnitsGroup(**self.units)
-        first.set_full_name(self.full_name)
         try:
-            first.magnitude = self.magnitude.copy()
+            return self._copy(self.magnitude.copy())
         except:
-            first.magnitude = self.magnitude
+            return self._copy(self.magnitude)
+
+    def _copy(self, magnitude):
+        first = UnitsGroup.__new__(UnitsGroup)
+        first.description = ''
+        first._manual_quantity = ''
+        first.units = self.units.copy()
+        first.full_name = self.full_name.copy() if self._checked else Counter()
+        first.magnitude = magnitude
         first.normal = self.normal
+        if self._checked and self.units and not self.full_name:
+            # Made with checks off, so there are no names: use base units
+            first._inplace_standardized()
         return first
 
     def compare(self, other, comparator):
@@ -322,12 +359,15 @@ class UnitsGroup:
         return comparator(self.value, other.value)
 
     def _inplace_join(self, units_group):
+        if self._checked and units_group.units and not units_group.full_name:
+            units_group = units_group.standardized()  # Made with checks off
         self.magnitude *= units_group.magnitude
         self.normal *= units_group.normal
         for unit in list(units_group.units):
             self.units[unit] += units_group.units[unit]
-        for name in list(units_group.full_name):
-            self.full_name[name] += units_group.full_name[name]
+        if self._checked:
+            for name in list(units_group.full_name):
+                self.full_name[name] += units_group.full_name[name]
         return self
 
     def join(self, units_group):
@@ -389,7 +429,8 @@ class UnitsGroup:
             >>> (32 * minute).normalized()
             1.0 * minute
         """
-        return self.copy()._inplace_normalized()
+        # Without copying magnitude, which may be big
+        return self._copy(1.0)._inplace_normalized()
 
     def is_scalar(self):
         """Return True if self is a simple scalar (like m/m).
@@ -404,7 +445,7 @@ class UnitsGroup:
     def must_have_same_units_as(self, units_group):
         """Checks that two units_groups have the same units
         """
-        if not self.units == units_group.units:
+        if self._checked and not self.units == units_group.units:
             raise ue.IncompatibleUnitsError(self, units_group)
 
     def _inplace_units_of(self, units_group):
@@ -425,8 +466,40 @@ class UnitsGroup:
 
         See the README for examples.
         """
+        if hasattr(self.magnitude, 'shape'):  # Scale arrays only once
+            first = self.normalized()._inplace_units_of(units_group)
+            first.magnitude = self.magnitude * first.magnitude
+            return first
         return self.copy()._inplace_units_of(units_group)
 
+    def to_(self, units_group):
+        """Convert self to another unit in-place, and return self.
+
+        An array magnitude is scaled in place, so no new array is made and it
+        keeps its dtype (a float32 array stays float32). Integer arrays can't
+        be scaled in place, and neither can read-only arrays (like slices, see
+        __getitem__), which raise ValueError.
+
+        Example:
+            >>> p = units_array(np.array([1, 2], dtype=np.float32), psi)
+            >>> p.to_(kPa)
+            [ 6.8947573 13.789515 ] * kPa
+        """
+        self.description = ''
+        if not hasattr(self.magnitude, 'shape'):
+            self._manual_quantity = ''
+            return self._inplace_units_of(units_group)
+        if self.magnitude.ndim and not self.magnitude.flags.writeable:
+            raise ValueError("Can't convert a read-only array (like a slice) " +
+                             'in place. Use x(units) for a converted copy.')
+        converted = self.normalized()._inplace_units_of(units_group)
+        self.magnitude *= converted.magnitude
+        self.units = converted.units
+        self.full_name = converted.full_name
+        self.normal = converted.normal
+        self._manual_quantity = ''
+        return self
+
     def __call__(self, units_group):
         """Shorthand for the UnitsGroup#units_of() method.
         """
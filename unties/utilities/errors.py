@@ -25,3 +25,14 @@ class OutOfRangeError(Error):
     def __str__(self):
         arg, mi, ma = str(self.arg), str(self.mi), str(self.ma)
         return arg + ' is out of range: [' + mi + ', ' + ma + ']'
+
+
+class UnitStringError(Error):
+    """Exception raised when a string can't be read as units
+    """
+    def __init__(self, string, problem):
+        self.string = string
+        self.problem = problem
+
+    def __str__(self):
+        return repr(self.string) + ': ' + self.problem
@@ -1,8 +1,11 @@
 import unties.utilities.errors as ue
+from unties.units_group import UnitsGroup
 
 
 class OutOfRangeTest:
     """Test if a value is outside a given range. If it is, raise an exception.
+
+    Skipped when checks are off (see unties.unit_helpers.set_checks).
     """
 
     def __init__(self, arg, mi, ma, throw_error=True):
@@ -10,10 +13,11 @@ class OutOfRangeTest:
         self.__mi = mi
         self.__ma = ma
         self.__throw_error = throw_error
-        self.__test()
+        if UnitsGroup._checked:
+            self.__test()
 
     def __test(self):
-        if self.__arg < self.__mi or self.__arg > self.__ma:
+        if _any(self.__arg < self.__mi) or _any(self.__arg > self.__ma):
             error = ue.OutOfRangeError(self.__arg, self.__mi, self.__ma)
             if self.__throw_error:
                 raise error
@@ -21,10 +25,31 @@ class OutOfRangeTest:
                 print(error)
 
 
+def _any(test):
+    """Like `any`, but works for single bools and numpy arrays of any shape.
+    """
+    return test.any() if hasattr(test, 'any') else bool(test)
+
+
 def function_strings(functions):
+    """Source for unit-friendly versions of unitless property functions.
+
+    Each function takes plain numbers (named like `_T`, or `_T1, _T2`) and a
+    `ranged` flag, and its docstring is its return units. The unit version
+    has the same name and arguments without the leading underscores.
+    """
     string = ''
     for func in functions:
         fname, name, units = func.__name__, func.__name__[1:], func.__doc__
-        string += 'def ' + name + '(T, ranged=True):\n'
-        string += '    return ' + fname + '(T.value, ranged) * ' + units + '\n'
+        code = func.__code__
+        _args = code.co_varnames[:code.co_argcount - 1]
+        args = [a[1:] for a in _args]
+        call = fname + '(' + ', '.join(_args) + ', ranged)'
+        string += 'def ' + name + '(' + ', '.join(args) + ', ranged=True):\n'
+        for _a, a in zip(_args, args):
+            string += '    ' + _a + ' = ' + a + '.value\n'
+        string += '    if ' + ' or '.join('hasattr(' + _a + ', "shape")'
+                                        for _a in _args) + ':\n'
+        string += '        return units_array(' + call + ', ' + units + ')\n'
+        string += '    return ' + call + ' * ' + units + '\n'
     return string